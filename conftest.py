@@ -0,0 +1,59 @@
+"""
+pytest共通設定
+テスト実行中はキャッシュ・クォータ記録のSQLiteファイルとログファイルを一時ディレクトリに作成し、
+data/・logs/ 配下の実ファイルに書き込まない
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils import config as src_config
+from utils import config as utils_config
+
+
+# テスト用の一時ディレクトリ
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='amazon_ec_tool_test_')
+
+# 一時ディレクトリに差し替える amazon 配下のSQLite設定
+_AMAZON_DB_SECTIONS = ('cache', 'negative_cache', 'accounting')
+
+
+def _redirect_paths(config: dict):
+    """
+    設定のファイルパスを一時ディレクトリに差し替え
+    
+    Args:
+        config: ConfigManager.config
+    """
+    amazon_configs = [config.get('amazon') or {}]
+    amazon_configs.extend((config.get('amazon') or {}).get('marketplaces', {}).values())
+    for amazon_config in amazon_configs:
+        for section in _AMAZON_DB_SECTIONS:
+            section_config = (amazon_config or {}).get(section) or {}
+            if section_config.get('db_path'):
+                section_config['db_path'] = os.path.join(TEST_DATA_DIR, os.path.basename(section_config['db_path']))
+        
+        # 一時ディレクトリの削除後に終了時の書き込みが残らないよう、リクエスト記録は毎回書き込む
+        accounting_config = (amazon_config or {}).get('accounting')
+        if accounting_config:
+            accounting_config['flush_interval'] = 0
+    
+    logging_config = config.get('logging') or {}
+    if logging_config.get('file'):
+        logging_config['file'] = os.path.join(TEST_DATA_DIR, os.path.basename(logging_config['file']))
+
+
+# テストモジュールの読み込み（ロガー・クライアントの生成）より前に差し替える
+# （src.utils.config と utils.config は別のインスタンスとして読み込まれる）
+for _config_manager in (src_config.config_manager, utils_config.config_manager):
+    _redirect_paths(_config_manager.config)
+
+
+def pytest_unconfigure(config):
+    """一時ディレクトリを削除"""
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
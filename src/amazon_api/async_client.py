@@ -0,0 +1,424 @@
+"""
+Amazon Product Advertising API 非同期クライアント
+asyncioで複数リクエストを並行実行する機能を提供
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import aiohttp
+from yarl import URL
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from src.amazon_api.client import BaseAmazonAPIClient
+from src.amazon_api.exceptions import APIRequestError
+from src.amazon_api.pagination import SEARCH_MAX_PAGES, AsyncSearchItemsIterator
+from src.amazon_api.negative_cache import NegativeCache
+from src.amazon_api.quota import RequestAccounting
+from src.amazon_api.rate_limiter import TokenBucketRateLimiter
+from src.amazon_api.response_cache import ResponseCache
+from src.amazon_api.retry import CircuitBreaker, parse_retry_after
+from src.utils.config import config_manager
+
+
+class AsyncAmazonAPIClient(BaseAmazonAPIClient):
+    """Amazon Product Advertising API 非同期クライアント"""
+    
+    RETRYABLE_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 max_concurrent_requests: Optional[int] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 marketplace_config: Optional[Dict] = None,
+                 request_accounting: Optional[RequestAccounting] = None,
+                 negative_cache: Optional[NegativeCache] = None):
+        """
+        初期化
+        
+        Args:
+            rate_limiter: 共有するレートリミッター（Noneの場合は設定から作成）
+            max_concurrent_requests: 同時実行数の上限（Noneの場合は設定から取得）
+            response_cache: 共有するレスポンスキャッシュ（Noneの場合は設定から作成）
+            circuit_breaker: 共有するサーキットブレーカー（Noneの場合は設定から作成）
+            marketplace_config: amazon 直下の設定を上書きするマーケットプレイス別設定
+            request_accounting: 共有するリクエスト記録（Noneの場合は設定から作成）
+            negative_cache: 共有するネガティブキャッシュ（Noneの場合は設定から作成）
+        """
+        super().__init__(
+            rate_limiter, response_cache, circuit_breaker, marketplace_config, request_accounting, negative_cache
+        )
+        
+        if max_concurrent_requests is None:
+            max_concurrent_requests = config_manager.get('data_processing.max_concurrent_requests', 5)
+        self.max_concurrent_requests = max(int(max_concurrent_requests), 1)
+        
+        # イベントループ上で初回使用時に作成（作成したループでのみ使用可能）
+        self.http_session = None
+        self._semaphore = None
+        self._loop = None
+        
+        # SQLiteを使うキャッシュ・記録・レート制限の読み書きはイベントループ外で実行
+        self._blocking_storage = any(
+            getattr(store, 'blocking', False)
+            for store in (self.rate_limiter, self.response_cache, self.request_accounting, self.negative_cache)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        実行中のイベントループにクライアントを紐付け
+        
+        HTTPセッション・セマフォは作成したイベントループでのみ使用できるため、
+        前回のループが終了している場合（asyncio.run の再実行など）は作り直す
+        
+        Returns:
+            実行中のイベントループ
+        
+        Raises:
+            RuntimeError: 別のイベントループで使用中の場合
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None and not self._loop.is_closed():
+                raise RuntimeError(
+                    "別のイベントループで使用中のクライアントです"
+                    "（イベントループごとにクライアントを作成するか、close() してから使用してください）"
+                )
+            self._loop = loop
+            self.http_session = None
+            self._semaphore = None
+        return loop
+    
+    async def _run_storage(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        キャッシュ・記録・レート制限の処理を実行
+        
+        SQLiteを使う場合はロック待ち・ディスクI/Oで他のコルーチンを止めないよう
+        スレッドプールで実行する（ジョブ別の記録のため呼び出し元のコンテキストを引き継ぐ）
+        """
+        if not self._blocking_storage:
+            return func(*args, **kwargs)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(context.run, func, *args, **kwargs)
+        )
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """コネクションプール付きの非同期HTTPセッションを取得"""
+        if self.http_session is None or self.http_session.closed:
+            http_config = self.config.get('http', {}) or {}
+            connect_timeout, read_timeout = self._get_timeout()
+            
+            connector = aiohttp.TCPConnector(
+                limit=int(http_config.get('pool_maxsize', 10)),
+                keepalive_timeout=float(http_config.get('keepalive_timeout', 30))
+            )
+            self.http_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            )
+            self.logger.info(f"非同期HTTPセッションを作成しました: 同時実行数={self.max_concurrent_requests}")
+        return self.http_session
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """同時実行数を制限するセマフォを取得"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._semaphore
+    
+    async def _send_request(self, operation: str, params: Dict) -> Tuple[int, str, Dict]:
+        """
+        署名済みリクエストを同時実行数の上限内で送信
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            ステータスコード・レスポンス本文・レスポンスヘッダー
+        """
+        url = self._build_url(operation)
+        
+        async with self._get_semaphore():
+            # トークンを取得できるまでイベントループを止めずに待機
+            await self.rate_limiter.acquire_async(timeout=self._get_max_wait())
+            
+            # 署名に用いたクエリをそのまま送信し、再エンコードを避ける
+            signed_url, headers = self._sign_request('GET', url, params=params)
+            
+            async with self._get_http_session().get(URL(signed_url, encoded=True), headers=headers) as response:
+                return response.status, await response.text(), dict(response.headers)
+    
+    async def _request_json(self, operation: str, params: Dict) -> Dict:
+        """
+        キャッシュを確認し、未登録の場合のみAPIを呼び出してJSONを取得
+        
+        stale-while-revalidate が有効な場合、スロットリング中またはAPI呼び出しの一時的な失敗時は
+        期限切れのキャッシュを Stale 付きで返し、再取得をバックグラウンドに回す
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            レスポンスJSON
+        
+        Raises:
+            APIRequestError: リトライ後も200以外のステータスが返された場合
+            CircuitOpenError: サーキットブレーカーの停止時間が待機上限を超える場合
+        """
+        # 再取得もこのイベントループ上で実行
+        self._bind_loop()
+        cached = await self._run_storage(self._get_cached_response, operation, params)
+        if cached is not None:
+            return cached
+        
+        if not self._is_stale_while_revalidate_enabled():
+            return await self._fetch_json(operation, params)
+        
+        if await self._run_storage(self._is_throttled):
+            stale = await self._run_storage(self._get_stale_response, operation, params)
+            if stale is not None:
+                self._schedule_revalidation(operation, params)
+                return stale
+        
+        try:
+            return await self._fetch_json(operation, params)
+        except Exception as e:
+            if not self._is_transient_error(e):
+                raise
+            stale = await self._run_storage(self._get_stale_response, operation, params)
+            if stale is None:
+                raise
+            self._schedule_revalidation(operation, params)
+            return stale
+    
+    def _revalidate(self, operation: str, params: Dict) -> Dict:
+        """バックグラウンドスレッドからイベントループ上でAPIを呼び出し、キャッシュを更新"""
+        future = asyncio.run_coroutine_threadsafe(self._fetch_json(operation, params), self._loop)
+        try:
+            return future.result(timeout=float(self.swr_config.get('fetch_timeout', 120)))
+        except Exception:
+            future.cancel()
+            raise
+    
+    async def _fetch_json(self, operation: str, params: Dict) -> Dict:
+        """
+        APIを呼び出してJSONを取得し、キャッシュに登録（一時的なエラーはリトライ）
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            レスポンスJSON
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            
+            # API障害中は全タスクが再開まで待機
+            wait_time = self.circuit_breaker.check(self._get_max_wait())
+            if wait_time > 0:
+                self.logger.warning(f"サーキットブレーカー待機: {wait_time:.1f}秒")
+                await asyncio.sleep(wait_time)
+            
+            try:
+                status, body, headers = await self._send_request(operation, params)
+                await self._run_storage(self._record_request, operation, status)
+                if status != 200:
+                    raise APIRequestError(status, body, parse_retry_after(headers.get('Retry-After')))
+                result = json.loads(body)
+            except Exception as e:
+                delay = self._get_retry_delay(operation, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            
+            self.circuit_breaker.record_success()
+            await self._run_storage(self._store_cached_response, operation, params, result)
+            return result
+    
+    async def close(self):
+        """再取得スレッドを停止し、HTTPセッションを閉じてプール済みコネクションを解放"""
+        await asyncio.get_running_loop().run_in_executor(None, self._close_revalidator)
+        await self._run_storage(self._flush_request_accounting)
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+            self.logger.debug("非同期HTTPセッションを閉じました")
+        # 以降は別のイベントループからも使用できる
+        self.http_session = None
+        self._semaphore = None
+        self._loop = None
+    
+    async def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                           resources: Optional[Union[str, List[str]]] = None, item_page: int = 1) -> Dict:
+        """
+        商品検索を実行
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+            item_page: 取得するページ番号（1〜10）
+        
+        Returns:
+            検索結果
+        """
+        try:
+            self.logger.info(f"商品検索を実行: {keywords}")
+            
+            params = self._build_search_params(keywords, search_index, item_count, resources, item_page)
+            result = await self._request_json('searchitems', params)
+            
+            self.logger.info(f"検索成功: {len(result.get('SearchResult', {}).get('Items', []))}件")
+            return result
+        
+        except APIRequestError as e:
+            self.logger.error(f"検索エラー: {e.status_code} - {e.body}")
+            return {}
+        except Exception as e:
+            self.logger.error(f"商品検索エラー: {e}")
+            return {}
+    
+    def iter_search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                          max_pages: int = SEARCH_MAX_PAGES,
+                          resources: Optional[Union[str, List[str]]] = None) -> AsyncSearchItemsIterator:
+        """
+        商品検索結果をItemPage単位で遅延取得
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 1ページあたりの取得件数
+            max_pages: 取得する最大ページ数（上限10）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            商品を1件ずつ返す非同期イテレーター（total_result_count で総件数を参照可能）
+        """
+        return AsyncSearchItemsIterator(
+            lambda page: self.search_items(keywords, search_index, item_count, resources, item_page=page),
+            max_pages=max_pages,
+            item_count=item_count
+        )
+    
+    async def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        商品詳細情報を取得
+        
+        ASINリストを10件単位に分割し、同時実行数の上限内で並行取得して
+        1つのItemsResultに統合する。一時的なエラーのASINのみを
+        後続のバッチにまとめて再取得する
+        
+        Args:
+            asins: ASINリスト（件数制限なし）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            商品詳細情報（ASIN単位のエラーは Errors に格納し、Retryable で再取得の可否を示す。
+            ネガティブキャッシュで除外したASINは SuppressedItemIds に格納）
+        """
+        try:
+            to_fetch, suppressed = await self._run_storage(self._partition_negative_cached, asins)
+            collector = self._create_item_collector(to_fetch)
+            self.logger.info(f"商品詳細取得: {len(to_fetch)}件")
+            
+            while not collector.done:
+                chunks = collector.next_round()
+                chunk_results = await asyncio.gather(*(self._get_items_chunk(chunk, resources) for chunk in chunks))
+                for chunk, chunk_result in zip(chunks, chunk_results):
+                    collector.add_result(chunk, chunk_result)
+            
+            result = collector.build_result()
+            await self._run_storage(self._record_item_outcomes, collector)
+            if suppressed:
+                result['SuppressedItemIds'] = suppressed
+            
+            self.logger.info(
+                f"商品詳細取得成功: {result['ItemsResult']['TotalResultCount']}件 (エラー: {len(result.get('Errors', []))}件)"
+            )
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"商品詳細取得エラー: {e}")
+            return {}
+    
+    async def iter_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> AsyncIterator[Dict]:
+        """
+        商品詳細情報をチャンク単位で取得（後続チャンクは並行取得）
+        
+        Args:
+            asins: ASINリスト（件数制限なし）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Yields:
+            チャンクごとのGetItemsレスポンス（チャンク順）
+        """
+        tasks = [asyncio.ensure_future(self._get_items_chunk(chunk, resources)) for chunk in self._chunk_asins(asins)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # 途中で打ち切られた場合は未完了のリクエストを取り消す
+            for task in tasks:
+                task.cancel()
+    
+    async def _get_items_chunk(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        1リクエスト分のASINで商品詳細情報を取得
+        
+        Args:
+            asins: ASINリスト（最大10件）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            GetItemsレスポンス（失敗時は Errors のみ）
+        """
+        try:
+            params = self._build_get_items_params(asins, resources)
+            return await self._request_json('getitems', params)
+        
+        except APIRequestError as e:
+            self.logger.error(f"商品詳細取得エラー: {e.status_code} - {e.body}")
+            return {'Errors': [{'Code': f"HTTP{e.status_code}", 'Message': e.body}]}
+        except Exception as e:
+            self.logger.error(f"商品詳細取得エラー: {e}")
+            return {'Errors': [{'Code': type(e).__name__, 'Message': str(e)}]}
+    
+    async def get_similar_items(self, asin: str, item_count: int = 10,
+                                resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        類似商品を取得
+        
+        Args:
+            asin: 商品ASIN
+            item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            類似商品情報
+        """
+        try:
+            self.logger.info(f"類似商品取得: {asin}")
+            
+            params = self._build_similar_items_params(asin, item_count, resources)
+            result = await self._request_json('getsimilaritems', params)
+            
+            self.logger.info(f"類似商品取得成功: {len(result.get('SimilarItemsResult', {}).get('Items', []))}件")
+            return result
+        
+        except APIRequestError as e:
+            self.logger.error(f"類似商品取得エラー: {e.status_code} - {e.body}")
+            return {}
+        except Exception as e:
+            self.logger.error(f"類似商品取得エラー: {e}")
+            return {}
@@ -4,33 +4,140 @@ Amazon Product Advertising API クライアント
 """
 
 import os
+import threading
 import time
 import requests
-import boto3
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any, Tuple, Union
+from src.amazon_api.exceptions import APIRequestError
+from src.amazon_api.item_errors import ItemBatchCollector, is_complete_result
+from src.amazon_api.negative_cache import NegativeCache
+from src.amazon_api.pagination import SEARCH_MAX_PAGES, SearchItemsIterator
+from src.amazon_api.quota import QuotaPlanner, RequestAccounting
+from src.amazon_api.rate_limiter import TokenBucketRateLimiter
+from src.amazon_api.resources import get_job_profile, resolve_resources
+from src.amazon_api.response_cache import ResponseCache
+from src.amazon_api.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+from src.amazon_api.revalidation import BackgroundRevalidator
+from src.amazon_api.signer import SigV4Signer
 from src.utils.config import config_manager
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    import boto3
 
-class AmazonAPIClient:
-    """Amazon Product Advertising API クライアント"""
+
+class BaseAmazonAPIClient:
+    """
+    Amazon Product Advertising API クライアントの共通基盤
+    
+    認証・署名・レート制限・リクエストパラメータ生成を提供し、
+    HTTP送信は同期/非同期の各サブクラスが実装する
+    """
+    
+    # GetItemsで1リクエストに指定できるASINの上限
+    GET_ITEMS_MAX_IDS = 10
+    
+    # PA-APIのエンドポイントとマーケットプレイス（設定で未指定の場合）
+    DEFAULT_BASE_URL = "https://webservices.amazon.co.jp/paapi5"
+    DEFAULT_MARKETPLACE = "www.amazon.co.jp"
     
-    def __init__(self):
-        """初期化"""
+    # リトライ対象とする通信例外（サブクラスでHTTPライブラリに合わせて指定）
+    RETRYABLE_EXCEPTIONS = (OSError,)
+    
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 marketplace_config: Optional[Dict] = None,
+                 request_accounting: Optional[RequestAccounting] = None,
+                 negative_cache: Optional[NegativeCache] = None):
+        """
+        初期化
+        
+        Args:
+            rate_limiter: 共有するレートリミッター（Noneの場合は設定から作成）
+            response_cache: 共有するレスポンスキャッシュ（Noneの場合は設定から作成）
+            circuit_breaker: 共有するサーキットブレーカー（Noneの場合は設定から作成）
+            marketplace_config: amazon 直下の設定を上書きするマーケットプレイス別設定
+            request_accounting: 共有するリクエスト記録（Noneの場合は設定から作成）
+            negative_cache: 共有するネガティブキャッシュ（Noneの場合は設定から作成）
+        """
         self.logger = get_logger("amazon_api")
-        self.config = config_manager.get_amazon_config()
+        self.config = self._merge_marketplace_config(config_manager.get_amazon_config(), marketplace_config)
+        self.marketplace = self.config.get('marketplace') or self.DEFAULT_MARKETPLACE
+        self._invalid_items: Dict[str, Dict] = {}
+        self._invalid_items_lock = threading.Lock()
         self.session = self._create_session()
-        self.base_url = "https://webservices.amazon.co.jp/paapi5"
+        self.signer = self._create_signer()
+        self.rate_limiter = rate_limiter or self._create_rate_limiter()
+        self.response_cache = response_cache or self._create_response_cache()
+        self.request_accounting = request_accounting or RequestAccounting.from_config(self.config.get('accounting', {}))
+        self.negative_cache = negative_cache or NegativeCache.from_config(self.config.get('negative_cache', {}))
+        self.retry_policy = RetryPolicy.from_config(
+            config_manager.get_data_processing_config(),
+            self.config.get('retry', {}),
+            retryable_exceptions=self.RETRYABLE_EXCEPTIONS
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.from_config(
+            (self.config.get('retry', {}) or {}).get('circuit_breaker', {})
+        )
+        # スタブサーバー等に向ける場合は amazon.base_url で上書き
+        self.base_url = (self.config.get('base_url') or self._get_default_base_url()).rstrip('/')
+        # スロットリング中は古いキャッシュで応答し、再取得はバックグラウンドで実行
+        self.swr_config = self.config.get('stale_while_revalidate', {}) or {}
+        self.revalidator: Optional[BackgroundRevalidator] = None
+        self._revalidator_lock = threading.Lock()
+    
+    @staticmethod
+    def _merge_marketplace_config(amazon_config: Dict, marketplace_config: Optional[Dict]) -> Dict:
+        """
+        amazon 直下の設定にマーケットプレイス別設定を重ねる
+        
+        rate_limit・http などの入れ子の設定は項目単位で上書きする
         
-    def _create_session(self) -> boto3.Session:
+        Args:
+            amazon_config: amazon 直下の設定
+            marketplace_config: マーケットプレイス別設定
+        
+        Returns:
+            統合した設定
+        """
+        if not marketplace_config:
+            return amazon_config
+        
+        merged = {name: value for name, value in amazon_config.items() if name != 'marketplaces'}
+        for name, value in marketplace_config.items():
+            if isinstance(value, dict) and isinstance(merged.get(name), dict):
+                merged[name] = {**merged[name], **value}
+            else:
+                merged[name] = value
+        
+        # ホストのみ指定された場合は共通のbase_urlを引き継がない
+        if 'host' in marketplace_config and 'base_url' not in marketplace_config:
+            merged['base_url'] = None
+        
+        # 状態を共有するレートリミッターはマーケットプレイスごとに別バケットとする
+        rate_limit_config = dict(merged.get('rate_limit') or {})
+        if 'name' not in (marketplace_config.get('rate_limit') or {}):
+            rate_limit_config['name'] = f"paapi:{merged.get('marketplace')}"
+        merged['rate_limit'] = rate_limit_config
+        return merged
+    
+    def _get_default_base_url(self) -> str:
+        """設定のホストからPA-APIのエンドポイントを生成"""
+        host = self.config.get('host')
+        return f"https://{host}/paapi5" if host else self.DEFAULT_BASE_URL
+    
+    def _create_session(self) -> "boto3.Session":
         """AWSセッションを作成"""
         try:
+            # boto3は読み込みが重いため、クライアント生成時まで遅延
+            import boto3
+            
             session = boto3.Session(
                 aws_access_key_id=self.config.get('access_key_id'),
                 aws_secret_access_key=self.config.get('secret_access_key'),
-                region_name=self.config.get('region', 'us-east-1')
+                region_name=self.config.get('region', 'us-west-2')
             )
             self.logger.info("AWSセッションを作成しました")
             return session
@@ -38,7 +145,228 @@ class AmazonAPIClient:
             self.logger.error(f"AWSセッション作成エラー: {e}")
             raise
     
-    def _sign_request(self, method: str, url: str, params: Dict = None, data: Dict = None) -> Dict:
+    def _create_rate_limiter(self) -> TokenBucketRateLimiter:
+        """設定からTPS/TPD制限のトークンバケットを作成"""
+        rate_limit_config = self.config.get('rate_limit', {}) or {}
+        rate_limiter = TokenBucketRateLimiter.from_config(rate_limit_config)
+        self.logger.info(
+            f"レートリミッターを作成しました: tps={rate_limiter.tps}, burst={rate_limiter.burst}, tpd={rate_limiter.tpd}"
+        )
+        return rate_limiter
+    
+    def _create_response_cache(self) -> Optional[ResponseCache]:
+        """設定からレスポンスキャッシュを作成"""
+        response_cache = ResponseCache.from_config(self.config.get('cache', {}))
+        if response_cache is not None:
+            self.logger.info(f"レスポンスキャッシュを作成しました: ttl={response_cache.ttls}")
+        return response_cache
+    
+    def _get_cached_response(self, operation: str, params: Dict) -> Optional[Dict]:
+        """キャッシュ済みレスポンスを取得（署名・HTTP送信を省略）"""
+        if self.response_cache is None:
+            return None
+        
+        cached = self.response_cache.get(operation, params)
+        if cached is not None:
+            self.logger.debug(f"キャッシュヒット: {operation}")
+            self._record_request(operation, cache_hit=True)
+        return cached
+    
+    def _record_request(self, operation: str, status: Optional[int] = 200, cache_hit: bool = False):
+        """リクエスト数を記録（記録の失敗はリクエストに影響させない）"""
+        if self.request_accounting is None:
+            return
+        try:
+            self.request_accounting.record(operation, status, self.marketplace, cache_hit)
+        except Exception as e:
+            self.logger.warning(f"リクエスト記録エラー: {e}")
+    
+    def get_quota_usage(self, day: Optional[str] = None) -> Dict:
+        """
+        このマーケットプレイスの日次リクエスト数を取得
+        
+        Args:
+            day: UTC日付（YYYY-MM-DD、Noneの場合は当日）
+        
+        Returns:
+            合計・オペレーション別・ジョブ別のリクエスト数
+        """
+        if self.request_accounting is None:
+            return {}
+        return self.request_accounting.get_daily_usage(day, self.marketplace)
+    
+    def plan_refresh(self, watchlist_size: int, job: str, chunk_size: Optional[int] = None) -> Dict:
+        """
+        ウォッチリスト更新のリクエスト数・所要時間を見積もる
+        
+        レート制限・scheduling の実行間隔は設定から、当日の消費量はリクエスト記録
+        （無効の場合はレートリミッター）から取得する
+        
+        Args:
+            watchlist_size: 更新対象のASIN数
+            job: ジョブ名（price_update / stock_update / analysis）
+            chunk_size: 1リクエストあたりのASIN数（Noneの場合は single_flight.batch_size）
+        
+        Returns:
+            見積もり結果（QuotaPlanner.plan_refresh を参照）
+        """
+        planner = QuotaPlanner.from_config(self.config, config_manager.get('scheduling', {}))
+        if self.request_accounting is not None:
+            # プロセスの再起動後も当日の消費量を引き継ぐため、永続化した記録を使う
+            used_today = self.get_quota_usage()['requests']
+        else:
+            used_today = self.rate_limiter.get_status().get('daily_used', 0)
+        return planner.plan_refresh(watchlist_size, job, chunk_size, used_today)
+    
+    def _store_cached_response(self, operation: str, params: Dict, result: Dict):
+        """
+        成功レスポンスをキャッシュに登録
+        
+        一時的なエラー・未返却のASINを含むGetItemsレスポンスは、再取得時に
+        キャッシュの不完全な結果を返さないよう登録しない
+        """
+        if self.response_cache is None:
+            return
+        if operation == 'getitems' and not is_complete_result(params.get('ItemIds', '').split(','), result):
+            self.logger.debug(f"未解決のASINを含むためキャッシュに登録しません: {params.get('ItemIds')}")
+            return
+        self.response_cache.set(operation, params, result)
+    
+    def _is_stale_while_revalidate_enabled(self) -> bool:
+        """古いキャッシュでの応答が有効か判定"""
+        return (
+            bool(self.swr_config.get('enabled', False))
+            and self.response_cache is not None
+            and self.response_cache.stale_ttl > 0
+        )
+    
+    def _is_throttled(self) -> bool:
+        """レート制限・サーキットブレーカーにより送信を待たされる状態か判定（状態の参照のみ）"""
+        wait_threshold = float(self.swr_config.get('wait_threshold', 1.0))
+        return (
+            self.circuit_breaker.get_wait_time() > 0
+            or self.rate_limiter.get_wait_time() > wait_threshold
+        )
+    
+    def _get_stale_response(self, operation: str, params: Dict) -> Optional[Dict]:
+        """
+        期限切れのキャッシュを経過時間付きで取得
+        
+        Args:
+            operation: オペレーションのパス
+            params: クエリパラメータ
+        
+        Returns:
+            Stale（AgeSeconds: 登録からの経過秒数, StoredAt: 登録時刻）を付与したレスポンス
+            （古いキャッシュもない場合はNone）
+        """
+        stale = self.response_cache.get_stale(operation, params)
+        if stale is None:
+            return None
+        
+        value, stored_at = stale
+        self._record_request(operation, cache_hit=True)
+        return {**value, 'Stale': {'AgeSeconds': round(time.time() - stored_at, 1), 'StoredAt': stored_at}}
+    
+    def _schedule_revalidation(self, operation: str, params: Dict):
+        """古いキャッシュで応答したリクエストの再取得を登録"""
+        with self._revalidator_lock:
+            if self.revalidator is None:
+                self.revalidator = BackgroundRevalidator.from_config(
+                    self._revalidate, self.swr_config, self.retry_policy
+                )
+        if self.revalidator.submit(self.response_cache.make_key(operation, params), operation, params):
+            self.logger.info(f"古いキャッシュで応答し、再取得を登録: {operation}")
+    
+    def _revalidate(self, operation: str, params: Dict) -> Dict:
+        """バックグラウンドでAPIを呼び出してキャッシュを更新（_fetch_json はサブクラスで実装）"""
+        return self._fetch_json(operation, params)
+    
+    def _is_transient_error(self, error: BaseException) -> bool:
+        """
+        古いキャッシュで応答してよい一時的な失敗か判定
+        
+        スロットリング・サーバーエラー・通信エラー・API停止中・クォータ待ちのみを対象とし、
+        リクエスト内容や認証の誤り（400/401/403等）は呼び出し元に返す
+        """
+        return (
+            isinstance(error, BackgroundRevalidator.RECOVERABLE_EXCEPTIONS)
+            or self.retry_policy.is_retryable(error)
+        )
+    
+    def get_revalidation_stats(self) -> Dict:
+        """
+        バックグラウンド再取得の統計を取得
+        
+        Returns:
+            登録件数・再取得件数・失敗回数・破棄件数・待ち件数（未使用の場合は空）
+        """
+        if self.revalidator is None:
+            return {}
+        return self.revalidator.get_stats()
+    
+    def _close_revalidator(self):
+        """再取得スレッドを停止"""
+        if self.revalidator is not None:
+            self.revalidator.close()
+            self.revalidator = None
+    
+    def _flush_request_accounting(self):
+        """未書き込みのリクエスト記録を書き込む（他のクライアントと共有するため閉じない）"""
+        if self.request_accounting is not None:
+            self.request_accounting.flush()
+    
+    def _get_retry_delay(self, operation: str, error: Exception, attempt: int) -> Optional[float]:
+        """
+        失敗したリクエストのリトライ待機時間を判定
+        
+        一時的なエラーはサーキットブレーカーに記録し、リトライ回数内であれば
+        待機秒数を返す。恒久的なエラーやリトライ上限到達時はNoneを返す
+        
+        Args:
+            operation: オペレーションのパス
+            error: 発生した例外
+            attempt: 試行回数（1始まり）
+            
+        Returns:
+            待機秒数（リトライしない場合はNone）
+        """
+        if not self.retry_policy.is_retryable(error):
+            return None
+        
+        self.circuit_breaker.record_failure()
+        if attempt >= self.retry_policy.max_attempts:
+            self.logger.error(f"リトライ上限到達: {operation} ({attempt}回)")
+            return None
+        
+        retry_after = getattr(error, 'retry_after', None)
+        delay = self.retry_policy.get_delay(attempt, retry_after)
+        if delay is None:
+            self.logger.error(f"Retry-Afterが上限を超えるためリトライしません: {operation} ({retry_after:.1f}秒)")
+            return None
+        self.logger.warning(f"一時的なエラーのためリトライ: {operation} {attempt}回目 ({delay:.2f}秒後) - {error}")
+        return delay
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        レスポンスキャッシュの統計を取得
+        
+        Returns:
+            ヒット・ミス件数とヒット率
+        """
+        if self.response_cache is None:
+            return {}
+        return self.response_cache.get_stats()
+    
+    def _create_signer(self) -> SigV4Signer:
+        """設定のリージョン・サービスで署名キーをキャッシュする署名器を作成"""
+        return SigV4Signer(
+            self.session.get_credentials,
+            region=self.config.get('region', 'us-west-2'),
+            service=self.config.get('service', 'execute-api')
+        )
+    
+    def _sign_request(self, method: str, url: str, params: Dict = None) -> Tuple[str, Dict]:
         """
         AWS Signature Version 4 でリクエストに署名
         
@@ -46,32 +374,342 @@ class AmazonAPIClient:
             method: HTTPメソッド
             url: リクエストURL
             params: クエリパラメータ
-            data: リクエストボディ
-            
+        
         Returns:
-            署名済みリクエストヘッダー
+            エンコード済みクエリ付きURLと署名済みリクエストヘッダー
         """
         try:
-            # リクエストを作成
-            request = AWSRequest(
-                method=method,
-                url=url,
-                data=data,
-                params=params
-            )
-            
-            # 署名を作成
-            credentials = self.session.get_credentials()
-            SigV4Auth(credentials, "us-east-1", "execute-api").add_auth(request)
-            
-            # 署名済みヘッダーを取得
-            return dict(request.headers)
-            
+            return self.signer.sign(method, url, params)
+        
         except Exception as e:
             self.logger.error(f"リクエスト署名エラー: {e}")
             raise
     
-    def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10) -> Dict:
+    def _build_url(self, operation: str) -> str:
+        """オペレーションのリクエストURLを生成"""
+        return f"{self.base_url}/{operation}"
+    
+    def _get_timeout(self) -> tuple:
+        """接続・読み込みタイムアウトを取得"""
+        http_config = self.config.get('http', {}) or {}
+        connect_timeout = float(http_config.get('connect_timeout', 3.05))
+        read_timeout = float(http_config.get('read_timeout', 10))
+        return (connect_timeout, read_timeout)
+    
+    def _get_max_wait(self) -> Optional[float]:
+        """トークン取得の最大待機秒数を取得"""
+        return (self.config.get('rate_limit', {}) or {}).get('max_wait')
+    
+    def _resolve_resources(self, resources: Optional[Union[str, List[str]]] = None) -> Optional[List[str]]:
+        """
+        要求するPA-APIリソース一覧を決定
+        
+        Args:
+            resources: プロファイル名またはリソース一覧（Noneの場合は実行中ジョブのプロファイル）
+        
+        Returns:
+            リソース一覧（ジョブ・既定プロファイルとも未設定の場合はNone）
+        """
+        if resources is None:
+            # RequestAccounting.job() で指定したジョブのプロファイル（未割り当てなら既定プロファイル）
+            job = (self.request_accounting or RequestAccounting).current_job()
+            resources = get_job_profile(self.config.get('resources', {}), job)
+        return resolve_resources(resources)
+    
+    def _build_common_params(self, resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """全オペレーション共通のリクエストパラメータを生成"""
+        params = {
+            'PartnerTag': self.config.get('associate_tag'),
+            'PartnerType': 'Associates',
+            'Marketplace': self.marketplace
+        }
+        resource_list = self._resolve_resources(resources)
+        if resource_list:
+            params['Resources'] = ','.join(resource_list)
+        return params
+    
+    def _build_search_params(self, keywords: str, search_index: str, item_count: int,
+                             resources: Optional[Union[str, List[str]]] = None, item_page: int = 1) -> Dict:
+        """SearchItemsのリクエストパラメータを生成"""
+        params = {
+            'Keywords': keywords,
+            'SearchIndex': search_index,
+            'ItemCount': item_count,
+            **self._build_common_params(resources)
+        }
+        # 1ページ目は従来どおりItemPageを省略（キャッシュキーを共有）
+        if item_page > 1:
+            params['ItemPage'] = item_page
+        return params
+    
+    def _build_get_items_params(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """GetItemsのリクエストパラメータを生成"""
+        return {
+            'ItemIds': ','.join(asins),
+            **self._build_common_params(resources)
+        }
+    
+    def _build_similar_items_params(self, asin: str, item_count: int,
+                                    resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """GetSimilarItemsのリクエストパラメータを生成"""
+        return {
+            'ItemId': asin,
+            'ItemCount': item_count,
+            **self._build_common_params(resources)
+        }
+    
+    def _chunk_asins(self, asins: List[str]) -> List[List[str]]:
+        """ASINリストを重複除去してAPI上限サイズに分割"""
+        unique_asins = list(dict.fromkeys(asins))
+        size = self.GET_ITEMS_MAX_IDS
+        return [unique_asins[i:i + size] for i in range(0, len(unique_asins), size)]
+    
+    def _create_item_collector(self, asins: List[str]) -> ItemBatchCollector:
+        """部分エラーのASINを再取得するGetItems集約器を作成"""
+        requeue_rounds = int((self.config.get('retry', {}) or {}).get('requeue_rounds', 2))
+        return ItemBatchCollector(asins, self.GET_ITEMS_MAX_IDS, max_rounds=1 + max(requeue_rounds, 0))
+    
+    def _partition_negative_cached(self, asins: List[str]) -> Tuple[List[str], List[str]]:
+        """ネガティブキャッシュで再確認時刻前のASINをバッチから除外"""
+        if self.negative_cache is None:
+            return asins, []
+        
+        to_fetch, suppressed = self.negative_cache.partition(list(dict.fromkeys(asins)), self.marketplace)
+        if suppressed:
+            self.logger.info(f"無効ASINを除外: {len(suppressed)}件")
+        return to_fetch, suppressed
+    
+    def _record_item_outcomes(self, collector: ItemBatchCollector):
+        """再取得しても成功しないASINを記録し、取得できたASINをネガティブキャッシュから削除"""
+        if self.negative_cache is not None:
+            self.negative_cache.record_success(list(collector.items), self.marketplace)
+            for asin, error in collector.invalid.items():
+                self.negative_cache.record_failure(asin, error, self.marketplace)
+        
+        if not collector.invalid:
+            return
+        with self._invalid_items_lock:
+            self._invalid_items.update(collector.invalid)
+        self.logger.warning(f"無効なASINを記録: {', '.join(collector.invalid)}")
+    
+    def get_suppressed_report(self) -> List[Dict]:
+        """
+        ネガティブキャッシュに記録されたASINの一覧を取得
+        
+        Returns:
+            ASIN・エラー内容・連続判定回数・次回再確認時刻・除外中かどうかのリスト
+        """
+        if self.negative_cache is None:
+            return []
+        return self.negative_cache.get_report(self.marketplace)
+    
+    def get_invalid_asins(self) -> Dict[str, Dict]:
+        """
+        無効（存在しない・API経由で取得不可）と判定されたASINを取得
+        
+        Returns:
+            ASINとエラー内容の対応
+        """
+        with self._invalid_items_lock:
+            return dict(self._invalid_items)
+    
+    def get_rate_limit_status(self) -> Dict:
+        """
+        レート制限の状態を取得
+        
+        Returns:
+            トークン残量・待ち時間・日次使用量
+        """
+        return self.rate_limiter.get_status()
+
+
+class AmazonAPIClient(BaseAmazonAPIClient):
+    """Amazon Product Advertising API クライアント"""
+    
+    RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+    
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 marketplace_config: Optional[Dict] = None,
+                 request_accounting: Optional[RequestAccounting] = None,
+                 negative_cache: Optional[NegativeCache] = None):
+        """
+        初期化
+        
+        Args:
+            rate_limiter: 共有するレートリミッター（Noneの場合は設定から作成）
+            response_cache: 共有するレスポンスキャッシュ（Noneの場合は設定から作成）
+            circuit_breaker: 共有するサーキットブレーカー（Noneの場合は設定から作成）
+            marketplace_config: amazon 直下の設定を上書きするマーケットプレイス別設定
+            request_accounting: 共有するリクエスト記録（Noneの場合は設定から作成）
+            negative_cache: 共有するネガティブキャッシュ（Noneの場合は設定から作成）
+        """
+        super().__init__(
+            rate_limiter, response_cache, circuit_breaker, marketplace_config, request_accounting, negative_cache
+        )
+        self.http_session = self._create_http_session()
+        self.timeout = self._get_timeout()
+    
+    def _create_http_session(self) -> requests.Session:
+        """
+        コネクションプール付きのHTTPセッションを作成
+        
+        全オペレーション・全スレッドで共有し、Keep-Aliveで
+        TCP/TLSハンドシェイクを再利用する
+        """
+        http_config = self.config.get('http', {}) or {}
+        pool_maxsize = int(http_config.get('pool_maxsize', 10))
+        
+        adapter = HTTPAdapter(
+            pool_connections=int(http_config.get('pool_connections', 10)),
+            pool_maxsize=pool_maxsize,
+            max_retries=int(http_config.get('max_retries', 0)),
+            pool_block=bool(http_config.get('pool_block', False))
+        )
+        
+        http_session = requests.Session()
+        http_session.mount('https://', adapter)
+        http_session.mount('http://', adapter)
+        http_session.headers.update({'Connection': 'keep-alive'})
+        
+        self.logger.info(
+            f"HTTPセッションを作成しました: pool_maxsize={pool_maxsize}"
+        )
+        return http_session
+    
+    def _send_request(self, operation: str, params: Dict) -> requests.Response:
+        """
+        署名済みリクエストを共有セッション経由で送信
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            HTTPレスポンス
+        """
+        url = self._build_url(operation)
+        
+        # トークンを取得できるまで必要最小限だけ待機
+        self.rate_limiter.acquire(timeout=self._get_max_wait())
+        
+        # 署名に用いたクエリをそのまま送信し、再エンコードを避ける
+        signed_url, headers = self._sign_request('GET', url, params=params)
+        
+        # プール済みコネクションでリクエストを実行
+        return self.http_session.get(signed_url, headers=headers, timeout=self.timeout)
+    
+    def _request_json(self, operation: str, params: Dict) -> Dict:
+        """
+        キャッシュを確認し、未登録の場合のみAPIを呼び出してJSONを取得
+        
+        stale-while-revalidate が有効な場合、スロットリング中またはAPI呼び出しの一時的な失敗時は
+        期限切れのキャッシュを Stale 付きで返し、再取得をバックグラウンドに回す
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            レスポンスJSON
+        
+        Raises:
+            APIRequestError: リトライ後も200以外のステータスが返された場合
+            CircuitOpenError: サーキットブレーカーの停止時間が待機上限を超える場合
+        """
+        cached = self._get_cached_response(operation, params)
+        if cached is not None:
+            return cached
+        
+        if not self._is_stale_while_revalidate_enabled():
+            return self._fetch_json(operation, params)
+        
+        if self._is_throttled():
+            stale = self._get_stale_response(operation, params)
+            if stale is not None:
+                self._schedule_revalidation(operation, params)
+                return stale
+        
+        try:
+            return self._fetch_json(operation, params)
+        except Exception as e:
+            if not self._is_transient_error(e):
+                raise
+            stale = self._get_stale_response(operation, params)
+            if stale is None:
+                raise
+            self._schedule_revalidation(operation, params)
+            return stale
+    
+    def fetch_uncached(self, operation: str, params: Dict) -> Dict:
+        """
+        キャッシュを参照・登録せずにAPIを呼び出してJSONを取得（スタブサーバーの記録用）
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+        
+        Returns:
+            レスポンスJSON
+        
+        Raises:
+            APIRequestError: リトライ後も200以外のステータスが返された場合
+        """
+        return self._fetch_json(operation, params, store=False)
+    
+    def _fetch_json(self, operation: str, params: Dict, store: bool = True) -> Dict:
+        """
+        APIを呼び出してJSONを取得し、キャッシュに登録（一時的なエラーはリトライ）
+        
+        Args:
+            operation: オペレーションのパス（例: searchitems）
+            params: クエリパラメータ
+            store: 取得結果をキャッシュに登録するか
+        
+        Returns:
+            レスポンスJSON
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            
+            # API障害中は全ワーカーが再開まで待機
+            wait_time = self.circuit_breaker.check(self._get_max_wait())
+            if wait_time > 0:
+                self.logger.warning(f"サーキットブレーカー待機: {wait_time:.1f}秒")
+                time.sleep(wait_time)
+            
+            try:
+                response = self._send_request(operation, params)
+                self._record_request(operation, response.status_code)
+                if response.status_code != 200:
+                    raise APIRequestError(
+                        response.status_code, response.text,
+                        parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                result = response.json()
+            except Exception as e:
+                delay = self._get_retry_delay(operation, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            
+            self.circuit_breaker.record_success()
+            if store:
+                self._store_cached_response(operation, params, result)
+            return result
+    
+    def close(self):
+        """再取得スレッドを停止し、HTTPセッションを閉じてプール済みコネクションを解放"""
+        self._close_revalidator()
+        self._flush_request_accounting()
+        self.http_session.close()
+        self.logger.debug("HTTPセッションを閉じました")
+    
+    def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                     resources: Optional[Union[str, List[str]]] = None, item_page: int = 1) -> Dict:
         """
         商品検索を実行
         
@@ -79,7 +717,9 @@ class AmazonAPIClient:
             keywords: 検索キーワード
             search_index: 検索インデックス
             item_count: 取得件数
-            
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+            item_page: 取得するページ番号（1〜10）
+        
         Returns:
             検索結果
         """
@@ -87,86 +727,137 @@ class AmazonAPIClient:
             self.logger.info(f"商品検索を実行: {keywords}")
             
             # リクエストパラメータ
-            params = {
-                'Keywords': keywords,
-                'SearchIndex': search_index,
-                'ItemCount': item_count,
-                'PartnerTag': self.config.get('associate_tag'),
-                'PartnerType': 'Associates',
-                'Marketplace': 'www.amazon.co.jp'
-            }
-            
-            # リクエストURL
-            url = f"{self.base_url}/searchitems"
-            
-            # 署名済みヘッダーを取得
-            headers = self._sign_request('GET', url, params=params)
+            params = self._build_search_params(keywords, search_index, item_count, resources, item_page)
             
             # リクエストを実行
-            response = requests.get(url, params=params, headers=headers)
+            result = self._request_json('searchitems', params)
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"検索成功: {len(result.get('SearchResult', {}).get('Items', []))}件")
-                return result
-            else:
-                self.logger.error(f"検索エラー: {response.status_code} - {response.text}")
-                return {}
-                
+            self.logger.info(f"検索成功: {len(result.get('SearchResult', {}).get('Items', []))}件")
+            return result
+        
+        except APIRequestError as e:
+            self.logger.error(f"検索エラー: {e.status_code} - {e.body}")
+            return {}
         except Exception as e:
             self.logger.error(f"商品検索エラー: {e}")
             return {}
     
-    def get_items(self, asins: List[str]) -> Dict:
+    def iter_search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                          max_pages: int = SEARCH_MAX_PAGES,
+                          resources: Optional[Union[str, List[str]]] = None) -> SearchItemsIterator:
+        """
+        商品検索結果をItemPage単位で遅延取得
+        
+        次のページは前のページの商品を消費し終えた時点で取得するため、
+        途中で打ち切った場合は以降のページのリクエストを送信しない
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 1ページあたりの取得件数
+            max_pages: 取得する最大ページ数（上限10）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            商品を1件ずつ返すイテレーター（total_result_count で総件数を参照可能）
+        """
+        return SearchItemsIterator(
+            lambda page: self.search_items(keywords, search_index, item_count, resources, item_page=page),
+            max_pages=max_pages,
+            item_count=item_count
+        )
+    
+    def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
         """
         商品詳細情報を取得
         
+        PA-APIの上限（1リクエスト10件）を超えるASINリストは自動的に
+        分割して連続送信し、結果を1つのItemsResultに統合する。
+        一時的なエラーのASINのみを後続のバッチにまとめて再取得する
+        
         Args:
-            asins: ASINリスト
-            
+            asins: ASINリスト（件数制限なし）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
         Returns:
-            商品詳細情報
+            商品詳細情報（ASIN単位のエラーは Errors に格納し、Retryable で再取得の可否を示す。
+            ネガティブキャッシュで除外したASINは SuppressedItemIds に格納）
         """
         try:
-            self.logger.info(f"商品詳細取得: {len(asins)}件")
+            to_fetch, suppressed = self._partition_negative_cached(asins)
+            collector = self._create_item_collector(to_fetch)
+            self.logger.info(f"商品詳細取得: {len(to_fetch)}件")
             
-            # リクエストパラメータ
-            params = {
-                'ItemIds': ','.join(asins),
-                'PartnerTag': self.config.get('associate_tag'),
-                'PartnerType': 'Associates',
-                'Marketplace': 'www.amazon.co.jp'
-            }
+            while not collector.done:
+                for chunk in collector.next_round():
+                    collector.add_result(chunk, self._get_items_chunk(chunk, resources))
             
-            # リクエストURL
-            url = f"{self.base_url}/getitems"
+            result = collector.build_result()
+            self._record_item_outcomes(collector)
+            if suppressed:
+                result['SuppressedItemIds'] = suppressed
             
-            # 署名済みヘッダーを取得
-            headers = self._sign_request('GET', url, params=params)
+            self.logger.info(
+                f"商品詳細取得成功: {result['ItemsResult']['TotalResultCount']}件 (エラー: {len(result.get('Errors', []))}件)"
+            )
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"商品詳細取得エラー: {e}")
+            return {}
+    
+    def iter_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Iterator[Dict]:
+        """
+        商品詳細情報をチャンク単位で順次取得
+        
+        Args:
+            asins: ASINリスト（件数制限なし）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Yields:
+            チャンクごとのGetItemsレスポンス
+        """
+        for chunk in self._chunk_asins(asins):
+            yield self._get_items_chunk(chunk, resources)
+    
+    def _get_items_chunk(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        1リクエスト分のASINで商品詳細情報を取得
+        
+        Args:
+            asins: ASINリスト（最大10件）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
+        Returns:
+            GetItemsレスポンス（失敗時は Errors のみ）
+        """
+        try:
+            # リクエストパラメータ
+            params = self._build_get_items_params(asins, resources)
             
             # リクエストを実行
-            response = requests.get(url, params=params, headers=headers)
+            result = self._request_json('getitems', params)
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"商品詳細取得成功: {len(result.get('ItemsResult', {}).get('Items', []))}件")
-                return result
-            else:
-                self.logger.error(f"商品詳細取得エラー: {response.status_code} - {response.text}")
-                return {}
-                
+            self.logger.debug(f"チャンク取得成功: {len(result.get('ItemsResult', {}).get('Items', []))}件")
+            return result
+        
+        except APIRequestError as e:
+            self.logger.error(f"商品詳細取得エラー: {e.status_code} - {e.body}")
+            return {'Errors': [{'Code': f"HTTP{e.status_code}", 'Message': e.body}]}
         except Exception as e:
             self.logger.error(f"商品詳細取得エラー: {e}")
-            return {}
+            return {'Errors': [{'Code': type(e).__name__, 'Message': str(e)}]}
     
-    def get_similar_items(self, asin: str, item_count: int = 10) -> Dict:
+    def get_similar_items(self, asin: str, item_count: int = 10,
+                          resources: Optional[Union[str, List[str]]] = None) -> Dict:
         """
         類似商品を取得
         
         Args:
             asin: 商品ASIN
             item_count: 取得件数
-            
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+        
         Returns:
             類似商品情報
         """
@@ -174,45 +865,62 @@ class AmazonAPIClient:
             self.logger.info(f"類似商品取得: {asin}")
             
             # リクエストパラメータ
-            params = {
-                'ItemId': asin,
-                'ItemCount': item_count,
-                'PartnerTag': self.config.get('associate_tag'),
-                'PartnerType': 'Associates',
-                'Marketplace': 'www.amazon.co.jp'
-            }
-            
-            # リクエストURL
-            url = f"{self.base_url}/getsimilaritems"
-            
-            # 署名済みヘッダーを取得
-            headers = self._sign_request('GET', url, params=params)
+            params = self._build_similar_items_params(asin, item_count, resources)
             
             # リクエストを実行
-            response = requests.get(url, params=params, headers=headers)
+            result = self._request_json('getsimilaritems', params)
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"類似商品取得成功: {len(result.get('SimilarItemsResult', {}).get('Items', []))}件")
-                return result
-            else:
-                self.logger.error(f"類似商品取得エラー: {response.status_code} - {response.text}")
-                return {}
-                
+            self.logger.info(f"類似商品取得成功: {len(result.get('SimilarItemsResult', {}).get('Items', []))}件")
+            return result
+        
+        except APIRequestError as e:
+            self.logger.error(f"類似商品取得エラー: {e.status_code} - {e.body}")
+            return {}
         except Exception as e:
             self.logger.error(f"類似商品取得エラー: {e}")
             return {}
     
-    def rate_limit_delay(self, seconds: float = 1.0):
+    def rate_limit_delay(self, seconds: Optional[float] = None):
         """
         レート制限対応のための遅延
         
+        リクエストは送信時に自動でレートリミッターを通過するため、
+        次のトークンが補充されるまでの必要な時間だけ待機する
+        
         Args:
-            seconds: 遅延秒数
+            seconds: 最大待機秒数（Noneの場合は無制限）
         """
-        time.sleep(seconds)
-        self.logger.debug(f"レート制限対応: {seconds}秒遅延")
+        wait_time = self.rate_limiter.get_wait_time()
+        if seconds is not None:
+            wait_time = min(wait_time, seconds)
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+        self.logger.debug(f"レート制限対応: {wait_time:.3f}秒遅延")
+
+
+# グローバルクライアントインスタンス（初回利用時に生成）
+_amazon_client = None
+_amazon_client_lock = threading.Lock()
+
+
+def get_amazon_client() -> AmazonAPIClient:
+    """
+    グローバルクライアントを取得（初回呼び出し時に生成）
+    
+    Returns:
+        AmazonAPIClientインスタンス
+    """
+    global _amazon_client
+    if _amazon_client is None:
+        with _amazon_client_lock:
+            if _amazon_client is None:
+                _amazon_client = AmazonAPIClient()
+    return _amazon_client
 
 
-# グローバルクライアントインスタンス
-amazon_client = AmazonAPIClient() 
\ No newline at end of file
+def __getattr__(name: str):
+    """従来の `amazon_client` 参照を遅延生成で維持"""
+    if name == 'amazon_client':
+        return get_amazon_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
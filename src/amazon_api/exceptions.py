@@ -0,0 +1,37 @@
+"""
+Amazon API 例外定義
+"""
+
+from typing import Optional
+
+
+class APIRequestError(Exception):
+    """PA-APIが200以外のステータスを返した場合の例外"""
+    
+    def __init__(self, status_code: int, body: str = '', retry_after: Optional[float] = None):
+        """
+        初期化
+        
+        Args:
+            status_code: HTTPステータスコード
+            body: レスポンス本文
+            retry_after: Retry-Afterヘッダーで指定された待機秒数
+        """
+        super().__init__(f"{status_code} - {body}")
+        self.status_code = status_code
+        self.body = body
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーがオープン中でリクエストを送信できない場合の例外"""
+    
+    def __init__(self, wait_time: float):
+        """
+        初期化
+        
+        Args:
+            wait_time: 再開までの秒数
+        """
+        super().__init__(f"サーキットブレーカーがオープン中です（再開まで {wait_time:.1f}秒）")
+        self.wait_time = wait_time
@@ -0,0 +1,207 @@
+"""
+GetItems 部分エラー処理モジュール
+レスポンスを取得済みの商品とASIN単位のエラーに振り分け、
+一時的なエラーのASINのみを後続のバッチで再取得する
+"""
+
+import re
+from typing import Dict, List, Optional
+from src.amazon_api.retry import RetryPolicy
+
+
+# ASIN自体が原因で、再取得しても成功しないエラー
+PERMANENT_ITEM_ERROR_CODES = ('InvalidParameterValue', 'ItemNotAccessible')
+
+# リクエスト単位の一時的なエラー（PA-APIのエラーコード・通信例外名）
+RETRYABLE_ERROR_CODES = (
+    'TooManyRequests', 'InternalFailure', 'ServiceUnavailable', 'RequestThrottled',
+    'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout', 'TimeoutError',
+    'ClientConnectionError', 'ServerDisconnectedError', 'RateLimitExceeded', 'CircuitOpenError'
+)
+
+# 応答に含まれず、エラーも返されなかったASINのエラーコード
+MISSING_ITEM_CODE = 'ItemNotReturned'
+
+_ERROR_ASIN_PATTERN = re.compile(r'ItemId\s+([0-9A-Z]{10})\b')
+
+
+def find_error_asin(error: Dict) -> Optional[str]:
+    """
+    エラーメッセージから対象のASINを取得
+    
+    Args:
+        error: PA-API形式のエラー
+    
+    Returns:
+        ASIN（リクエスト単位のエラーの場合はNone）
+    """
+    match = _ERROR_ASIN_PATTERN.search(error.get('Message') or '')
+    return match.group(1) if match else None
+
+
+def is_retryable_error(error: Dict) -> bool:
+    """
+    再取得で解消する可能性のあるエラーか判定
+    
+    Args:
+        error: PA-API形式のエラー（HTTPエラーは HTTP<ステータス> のコード）
+    
+    Returns:
+        一時的なエラーの場合True
+    """
+    code = error.get('Code') or ''
+    if code in PERMANENT_ITEM_ERROR_CODES:
+        return False
+    if code.startswith('HTTP') and code[4:].isdigit():
+        return int(code[4:]) in RetryPolicy.RETRYABLE_STATUS_CODES
+    return code in RETRYABLE_ERROR_CODES or code == MISSING_ITEM_CODE
+
+
+def is_complete_result(asins: List[str], result: Dict) -> bool:
+    """
+    GetItemsレスポンスが再取得の不要な結果か判定（キャッシュ登録の可否）
+    
+    Args:
+        asins: 要求したASINリスト
+        result: GetItemsレスポンス
+    
+    Returns:
+        全ASINが取得済み、または恒久的なエラーの場合True
+        （一時的なエラー・ASIN不明のエラー・未返却のASINを含む場合False）
+    """
+    resolved = {item.get('ASIN') for item in (result or {}).get('ItemsResult', {}).get('Items', [])}
+    for error in (result or {}).get('Errors', []):
+        asin = find_error_asin(error)
+        if asin is None or is_retryable_error(error):
+            return False
+        resolved.add(asin)
+    return all(asin in resolved for asin in asins)
+
+
+class ItemBatchCollector:
+    """
+    GetItemsのチャンク結果を集約し、再取得が必要なASINを管理する
+    
+    取得済みの商品は再送信せず、一時的なエラーのASINのみを
+    次のラウンドで10件単位に詰め直して送信する
+    """
+    
+    def __init__(self, asins: List[str], chunk_size: int = 10, max_rounds: int = 3):
+        """
+        初期化
+        
+        Args:
+            asins: ASINリスト（重複は除去）
+            chunk_size: 1リクエストのASIN数
+            max_rounds: 初回を含む最大送信ラウンド数
+        """
+        self.asins = list(dict.fromkeys(asins))
+        self.chunk_size = max(int(chunk_size), 1)
+        self.max_rounds = max(int(max_rounds), 1)
+        self.rounds = 0
+        
+        self.items: Dict[str, Dict] = {}
+        self.invalid: Dict[str, Dict] = {}
+        self._pending: List[str] = list(self.asins)
+        self._requeue: Dict[str, Dict] = {}
+        self._request_errors: List[Dict] = []
+        self._stale: Dict[str, Dict] = {}
+    
+    @property
+    def done(self) -> bool:
+        """送信対象が残っていないか、ラウンド数の上限に達した場合True"""
+        return not self._pending or self.rounds >= self.max_rounds
+    
+    def next_round(self) -> List[List[str]]:
+        """
+        次のラウンドで送信するチャンクを取得
+        
+        Returns:
+            チャンクごとのASINリスト
+        """
+        pending = self._pending
+        self._pending = []
+        self._requeue = {}
+        self.rounds += 1
+        return [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+    
+    def add_result(self, chunk: List[str], result: Dict):
+        """
+        チャンクの結果を振り分け
+        
+        Args:
+            chunk: 送信したASINリスト
+            result: GetItemsレスポンス（失敗時は Errors のみ）
+        """
+        stale = (result or {}).get('Stale')
+        for item in (result or {}).get('ItemsResult', {}).get('Items', []):
+            self.items[item.get('ASIN')] = item
+            if stale is not None:
+                self._stale[item.get('ASIN')] = stale
+        
+        unresolved = [asin for asin in chunk if asin not in self.items]
+        request_errors = []
+        for error in (result or {}).get('Errors', []):
+            asin = find_error_asin(error)
+            if asin is None:
+                request_errors.append(error)
+            elif asin in unresolved:
+                self._mark(asin, error)
+        
+        # ASINを特定できないエラーは、未取得のASIN全体に適用
+        remaining = [asin for asin in unresolved if asin not in self.invalid and asin not in self._requeue]
+        for error in request_errors:
+            if not remaining:
+                break
+            if is_retryable_error(error):
+                for asin in remaining:
+                    self._mark(asin, error)
+            else:
+                self._request_errors.append({**error, 'ItemIds': remaining, 'Retryable': False})
+            remaining = []
+        
+        for asin in remaining:
+            self._mark(asin, {'Code': MISSING_ITEM_CODE, 'Message': f"The ItemId {asin} was not returned."})
+    
+    def _mark(self, asin: str, error: Dict):
+        """ASINのエラーを記録し、一時的なエラーであれば次のラウンドに回す"""
+        if is_retryable_error(error):
+            if asin not in self._requeue:
+                self._requeue[asin] = error
+                self._pending.append(asin)
+        else:
+            self.invalid[asin] = error
+    
+    def build_result(self) -> Dict:
+        """
+        統合したGetItemsレスポンスを作成
+        
+        Returns:
+            要求順の商品と、ASIN単位のエラー（Retryable で再取得の可否を示す）。
+            古いキャッシュから返した商品がある場合は Stale に対象ASINと最大経過秒数を格納
+        """
+        items = [self.items[asin] for asin in self.asins if asin in self.items]
+        errors = [
+            {**error, 'ItemIds': [asin], 'Retryable': False}
+            for asin, error in self.invalid.items()
+        ]
+        errors.extend(self._request_errors)
+        errors.extend(
+            {**error, 'ItemIds': [asin], 'Retryable': True}
+            for asin, error in self._requeue.items()
+        )
+        
+        result = {
+            'ItemsResult': {
+                'Items': items,
+                'TotalResultCount': len(items)
+            }
+        }
+        if errors:
+            result['Errors'] = errors
+        
+        stale_asins = [asin for asin in self.asins if asin in self._stale]
+        if stale_asins:
+            oldest = min(stale_asins, key=lambda asin: self._stale[asin]['StoredAt'])
+            result['Stale'] = {**self._stale[oldest], 'ItemIds': stale_asins}
+        return result
@@ -0,0 +1,119 @@
+"""
+キーワード転置インデックス
+タイトル・ブランドの語から商品を検索する（キーワードは語の部分文字列として照合）
+"""
+
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word: str) -> str:
+    """語を正規化（商品名の語は繰り返し現れるためキャッシュ）"""
+    return unicodedata.normalize('NFKC', word).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    テキストを空白区切りの語に分割
+    
+    全角英数字・大文字小文字の違いを吸収するため、NFKC正規化・小文字化する
+    
+    Args:
+        text: 対象テキスト
+    
+    Returns:
+        語のリスト（重複あり）
+    """
+    return [_normalize_word(word) for word in text.split()]
+
+
+def tokenize_query(query: str) -> List[str]:
+    """
+    検索クエリをキーワードに分割
+    
+    Args:
+        query: 検索クエリ（空白区切り）
+    
+    Returns:
+        重複を除いた正規化済みキーワードのリスト
+    """
+    return list(dict.fromkeys(tokenize(query)))
+
+
+class KeywordIndex:
+    """
+    語ごとに文書IDの昇順リストを保持する転置インデックス
+    
+    キーワードは空白を含まないため、「キーワードがテキストの部分文字列」であることは
+    「いずれかの語の部分文字列」であることと同値となる。検索時は語彙からキーワードを含む語を
+    探し、その文書IDリストを統合する（例: "phone" は "smartphone"・"iphone" に一致）。
+    文書IDは追加順に単調増加させる必要がある
+    """
+    
+    def __init__(self):
+        """初期化"""
+        self._postings: Dict[str, array] = {}
+        self._last_doc_id = -1
+        self.document_count = 0
+    
+    def add(self, doc_id: int, texts: Iterable[str]):
+        """
+        文書を登録
+        
+        Args:
+            doc_id: 文書ID（前回より大きい値）
+            texts: 索引対象のテキスト
+        """
+        if doc_id <= self._last_doc_id:
+            raise ValueError(f"文書IDは昇順で登録してください: {doc_id}")
+        
+        words = set()
+        for text in texts:
+            words.update(tokenize(text))
+        
+        for word in words:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array('I')
+            postings.append(doc_id)
+        
+        self._last_doc_id = doc_id
+        self.document_count += 1
+    
+    def search(self, query: str) -> List[int]:
+        """
+        いずれかのキーワードを部分文字列として含む文書を検索
+        
+        Args:
+            query: 検索クエリ（空白区切り）
+        
+        Returns:
+            文書IDの昇順リスト
+        """
+        postings_lists = [
+            postings
+            for keyword in tokenize_query(query)
+            for word, postings in self._postings.items()
+            if keyword in word
+        ]
+        if len(postings_lists) == 1:
+            return list(postings_lists[0])
+        
+        # 複数の語に一致した文書の重複を除いて昇順に並べる
+        return sorted(set().union(*postings_lists))
+    
+    def get_stats(self) -> Dict:
+        """
+        インデックスの統計を取得
+        
+        Returns:
+            文書数・語彙数・登録件数
+        """
+        return {
+            'documents': self.document_count,
+            'tokens': len(self._postings),
+            'postings': sum(len(postings) for postings in self._postings.values())
+        }
@@ -0,0 +1,194 @@
+"""
+モッククライアントの遅延・障害シミュレーション
+応答遅延の分布と、スロットリング・一時障害・部分エラーの注入を提供
+"""
+
+import bisect
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+from src.amazon_api.exceptions import APIRequestError
+
+
+class LatencyModel:
+    """
+    応答遅延の分布モデル
+    
+    - fixed: 固定秒数
+    - lognormal: 中央値とσを指定した対数正規分布（裾の長い遅延）
+    - percentile: パーセンタイル値を線形補間した経験分布
+    """
+    
+    DISTRIBUTIONS = ('fixed', 'lognormal', 'percentile')
+    
+    def __init__(self, distribution: str = 'fixed', seconds: float = 0.0, median: float = 0.1,
+                 sigma: float = 0.5, percentiles: Optional[Dict[float, float]] = None,
+                 max_seconds: Optional[float] = None, seed: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            distribution: 分布の種類（fixed / lognormal / percentile）
+            seconds: fixed の遅延秒数
+            median: lognormal の中央値（秒）
+            sigma: lognormal の対数標準偏差
+            percentiles: percentile のパーセンタイル（0〜100）と遅延秒数の対応
+            max_seconds: 遅延の上限秒数
+            seed: 乱数シード
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"未対応の遅延分布です: {distribution}")
+        if distribution == 'percentile' and not percentiles:
+            raise ValueError("percentile 分布にはパーセンタイル値が必要です")
+        
+        self.distribution = distribution
+        self.seconds = max(float(seconds), 0.0)
+        self.median = max(float(median), 0.0)
+        self.sigma = max(float(sigma), 0.0)
+        self.max_seconds = max_seconds
+        self._rng = random.Random(seed)
+        
+        points: List[Tuple[float, float]] = sorted(
+            (float(percentile), float(value)) for percentile, value in (percentiles or {}).items()
+        )
+        if points:
+            # 指定範囲外のパーセンタイルは端の値で打ち切る
+            if points[0][0] > 0:
+                points.insert(0, (0.0, points[0][1]))
+            if points[-1][0] < 100:
+                points.append((100.0, points[-1][1]))
+        self._percentile_points = points
+        self._percentile_keys = [percentile for percentile, _ in points]
+    
+    @classmethod
+    def from_config(cls, latency_config: Optional[Dict], seed: Optional[int] = None) -> "LatencyModel":
+        """設定辞書から遅延モデルを作成"""
+        latency_config = latency_config or {}
+        return cls(
+            distribution=latency_config.get('distribution', 'fixed'),
+            seconds=latency_config.get('seconds', 0.0),
+            median=latency_config.get('median', 0.1),
+            sigma=latency_config.get('sigma', 0.5),
+            percentiles=latency_config.get('percentiles'),
+            max_seconds=latency_config.get('max_seconds'),
+            seed=seed
+        )
+    
+    def sample(self) -> float:
+        """
+        1リクエスト分の遅延秒数を生成
+        
+        Returns:
+            遅延秒数
+        """
+        if self.distribution == 'fixed':
+            delay = self.seconds
+        elif self.distribution == 'lognormal':
+            delay = self.median * math.exp(self._rng.gauss(0.0, self.sigma)) if self.median > 0 else 0.0
+        else:
+            delay = self._sample_percentile(self._rng.uniform(0.0, 100.0))
+        
+        if self.max_seconds is not None:
+            delay = min(delay, float(self.max_seconds))
+        return max(delay, 0.0)
+    
+    def _sample_percentile(self, percentile: float) -> float:
+        """パーセンタイル値を線形補間して遅延秒数に変換"""
+        position = bisect.bisect_left(self._percentile_keys, percentile)
+        if position == 0:
+            return self._percentile_points[0][1]
+        
+        low_percentile, low_value = self._percentile_points[position - 1]
+        high_percentile, high_value = self._percentile_points[position]
+        ratio = (percentile - low_percentile) / (high_percentile - low_percentile)
+        return low_value + (high_value - low_value) * ratio
+
+
+class FaultInjector:
+    """スロットリング（429）・一時障害（503）・商品単位の部分エラーを確率的に注入"""
+    
+    def __init__(self, throttle_rate: float = 0.0, unavailable_rate: float = 0.0,
+                 partial_error_rate: float = 0.0, retry_after: Optional[float] = None,
+                 seed: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            throttle_rate: 429 TooManyRequests を返す確率
+            unavailable_rate: 503 ServiceUnavailable を返す確率
+            partial_error_rate: GetItemsで商品ごとにエラーとする確率
+            retry_after: 429に付与するRetry-After秒数
+            seed: 乱数シード
+        """
+        self.throttle_rate = min(max(float(throttle_rate), 0.0), 1.0)
+        self.unavailable_rate = min(max(float(unavailable_rate), 0.0), 1.0)
+        self.partial_error_rate = min(max(float(partial_error_rate), 0.0), 1.0)
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._stats = {'throttled': 0, 'unavailable': 0, 'partial_errors': 0}
+    
+    @classmethod
+    def from_config(cls, faults_config: Optional[Dict], seed: Optional[int] = None) -> "FaultInjector":
+        """設定辞書から障害注入を作成"""
+        faults_config = faults_config or {}
+        return cls(
+            throttle_rate=faults_config.get('throttle_rate', 0.0),
+            unavailable_rate=faults_config.get('unavailable_rate', 0.0),
+            partial_error_rate=faults_config.get('partial_error_rate', 0.0),
+            retry_after=faults_config.get('retry_after'),
+            seed=seed
+        )
+    
+    def check(self, operation: str):
+        """
+        リクエスト単位の障害を判定
+        
+        Args:
+            operation: オペレーション名
+        
+        Raises:
+            APIRequestError: 障害を注入する場合
+        """
+        value = self._rng.random()
+        if value < self.throttle_rate:
+            self._stats['throttled'] += 1
+            raise APIRequestError(
+                429,
+                '{"Errors":[{"Code":"TooManyRequests","Message":"The request was denied due to request throttling."}]}',
+                self.retry_after
+            )
+        if value < self.throttle_rate + self.unavailable_rate:
+            self._stats['unavailable'] += 1
+            raise APIRequestError(503, f'{{"Errors":[{{"Code":"ServiceUnavailable","Message":"{operation}"}}]}}')
+    
+    def split_partial_errors(self, asins: List[str]) -> Tuple[List[str], List[Dict]]:
+        """
+        GetItemsの対象ASINを成功分とエラー分に振り分け
+        
+        Args:
+            asins: 要求されたASINリスト
+        
+        Returns:
+            成功とするASINリストと、PA-API形式のErrorsリスト
+        """
+        succeeded = []
+        errors = []
+        for asin in asins:
+            if self.partial_error_rate and self._rng.random() < self.partial_error_rate:
+                errors.append({
+                    'Code': 'ItemNotAccessible',
+                    'Message': f"The ItemId {asin} is not accessible through the Product Advertising API."
+                })
+            else:
+                succeeded.append(asin)
+        self._stats['partial_errors'] += len(errors)
+        return succeeded, errors
+    
+    def get_stats(self) -> Dict:
+        """
+        注入した障害の件数を取得
+        
+        Returns:
+            429・503・部分エラーの件数
+        """
+        return dict(self._stats)
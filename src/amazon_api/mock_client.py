@@ -3,21 +3,52 @@ Amazon API モッククライアント
 審査期間中の開発用にモックデータを提供
 """
 
+import asyncio
 import json
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+from src.amazon_api.exceptions import APIRequestError
+from src.amazon_api.keyword_index import KeywordIndex
+from src.amazon_api.mock_behavior import FaultInjector, LatencyModel
+from src.amazon_api.pagination import SEARCH_MAX_PAGES, AsyncSearchItemsIterator, SearchItemsIterator
+from src.amazon_api.resources import project_item
+from src.amazon_api.synthetic_catalog import SyntheticCatalog
+from src.utils.config import config_manager
 from src.utils.logger import get_logger
 
 
 class MockAmazonAPIClient:
     """Amazon API モッククライアント"""
     
-    def __init__(self):
-        """初期化"""
+    def __init__(self, catalog_size: Optional[int] = None, seed: Optional[int] = None,
+                 latency: Optional[LatencyModel] = None, fault_injector: Optional[FaultInjector] = None):
+        """
+        初期化
+        
+        Args:
+            catalog_size: 固定データに追加する合成商品の件数（Noneの場合は設定値）
+            seed: 合成カタログ・遅延・障害の乱数シード（Noneの場合は設定値）
+            latency: 応答遅延モデル（Noneの場合は設定から作成）
+            fault_injector: 障害注入（Noneの場合は設定から作成）
+        """
         self.logger = get_logger("mock_amazon_api")
         self.mock_data = self._load_mock_data()
         
+        mock_config = config_manager.get('mock', {}) or {}
+        if catalog_size is None:
+            catalog_size = mock_config.get('catalog_size', 0) or 0
+        if seed is None:
+            seed = mock_config.get('seed', 0) or 0
+        self.catalog = SyntheticCatalog(catalog_size, seed=seed)
+        # 検索インデックスは初回検索時に作成（検索しない用途では作成コストを払わない）
+        self._keyword_index: Optional[KeywordIndex] = None
+        self._keyword_index_lock = threading.Lock()
+        
+        self.latency = latency or LatencyModel.from_config(mock_config.get('latency'), seed=seed)
+        self.fault_injector = fault_injector or FaultInjector.from_config(mock_config.get('faults'), seed=seed)
+        
     def _load_mock_data(self) -> Dict:
         """モックデータを読み込み"""
         return {
@@ -244,7 +275,59 @@ class MockAmazonAPIClient:
             }
         }
     
-    def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10) -> Dict:
+    def _simulate_request(self, operation: str):
+        """
+        遅延・障害を再現（リトライは行わず、実際の送信と同様にエラーとして返す）
+        
+        Args:
+            operation: オペレーション名
+            
+        Raises:
+            APIRequestError: 障害を注入した場合（429はretry_afterを含む）
+        """
+        time.sleep(self.latency.sample())
+        self.fault_injector.check(operation)
+    
+    @staticmethod
+    def _build_request_errors(error: APIRequestError) -> Dict:
+        """実クライアントのGetItemsと同じ形式のリクエスト単位エラーを作成"""
+        return {'Errors': [{'Code': f"HTTP{error.status_code}", 'Message': error.body}]}
+    
+    def build_search_result(self, keywords: str, search_index: str, item_count: int,
+                            resources: Optional[Union[str, List[str]]], item_page: int) -> Dict:
+        """
+        転置インデックスで検索し、該当ページのみ生成したSearchItemsレスポンスを作成
+        
+        いずれかのキーワードをタイトルまたはブランドに部分文字列として含む商品を返す
+        
+        遅延・障害の注入は行わない（スタブサーバーの応答生成にも使用）
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 1ページあたりの取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            item_page: 取得するページ番号
+            
+        Returns:
+            SearchItemsレスポンス
+        """
+        matches = self.keyword_index.search(keywords)
+        start = (item_page - 1) * item_count
+        items = [
+            project_item(self._get_search_item(doc_id), resources)
+            for doc_id in matches[start:start + item_count]
+        ]
+        return {
+            "SearchResult": {
+                "Items": items,
+                "TotalResultCount": len(matches),
+                "SearchIndex": search_index
+            }
+        }
+    
+    def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                     resources: Optional[Union[str, List[str]]] = None, item_page: int = 1) -> Dict:
         """
         商品検索を実行（モック）
         
@@ -252,6 +335,8 @@ class MockAmazonAPIClient:
             keywords: 検索キーワード
             search_index: 検索インデックス
             item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            item_page: 取得するページ番号
             
         Returns:
             検索結果
@@ -259,43 +344,125 @@ class MockAmazonAPIClient:
         try:
             self.logger.info(f"モック商品検索を実行: {keywords}")
             
-            # キーワードに基づいてフィルタリング
-            filtered_results = []
-            for item in self.mock_data["search_results"]:
-                title = item["ItemInfo"]["Title"]["DisplayValue"].lower()
-                brand = item["ItemInfo"]["ByLineInfo"]["Brand"]["DisplayValue"].lower()
-                keywords_lower = keywords.lower()
-                
-                if any(keyword in title or keyword in brand for keyword in keywords_lower.split()):
-                    filtered_results.append(item)
-            
-            # 件数制限
-            filtered_results = filtered_results[:item_count]
+            # 遅延・障害シミュレーション
+            self._simulate_request('searchitems')
             
-            # レート制限シミュレーション
-            time.sleep(0.1)
-            
-            result = {
-                "SearchResult": {
-                    "Items": filtered_results,
-                    "TotalResultCount": len(filtered_results),
-                    "SearchIndex": search_index
-                }
-            }
+            result = self.build_search_result(keywords, search_index, item_count, resources, item_page)
             
-            self.logger.info(f"モック検索成功: {len(filtered_results)}件")
+            self.logger.info(f"モック検索成功: {len(result['SearchResult']['Items'])}件")
             return result
             
+        except APIRequestError as e:
+            self.logger.error(f"モック検索エラー: {e.status_code} - {e.body}")
+            return {}
         except Exception as e:
             self.logger.error(f"モック商品検索エラー: {e}")
             return {"SearchResult": {"Items": []}}
     
-    def get_items(self, asins: List[str]) -> Dict:
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """検索インデックスを取得（初回アクセス時に作成）"""
+        if self._keyword_index is None:
+            with self._keyword_index_lock:
+                if self._keyword_index is None:
+                    self._keyword_index = self._build_keyword_index()
+        return self._keyword_index
+    
+    def _build_keyword_index(self) -> KeywordIndex:
+        """
+        固定データ・合成カタログのタイトルとブランドから転置インデックスを作成
+        
+        文書IDは固定データを先頭に、合成商品は固定データ件数＋インデックスとする
+        
+        Returns:
+            キーワードインデックス
+        """
+        keyword_index = KeywordIndex()
+        fixtures = self.mock_data["search_results"]
+        for doc_id, item in enumerate(fixtures):
+            keyword_index.add(doc_id, (
+                item["ItemInfo"]["Title"]["DisplayValue"],
+                item["ItemInfo"]["ByLineInfo"]["Brand"]["DisplayValue"]
+            ))
+        for index in range(len(self.catalog)):
+            keyword_index.add(len(fixtures) + index, self.catalog.title_at(index))
+        
+        self.logger.info(f"検索インデックスを作成: {keyword_index.get_stats()}")
+        return keyword_index
+    
+    def _get_search_item(self, doc_id: int) -> Dict:
+        """文書IDに対応する商品を取得（合成商品はここで生成）"""
+        fixtures = self.mock_data["search_results"]
+        if doc_id < len(fixtures):
+            return fixtures[doc_id]
+        return self.catalog.get_item(doc_id - len(fixtures))
+    
+    def iter_search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                          max_pages: int = SEARCH_MAX_PAGES,
+                          resources: Optional[Union[str, List[str]]] = None) -> SearchItemsIterator:
+        """
+        商品検索結果をページ単位で遅延取得（モック）
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 1ページあたりの取得件数
+            max_pages: 取得する最大ページ数（上限10）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            商品を1件ずつ返すイテレーター
+        """
+        return SearchItemsIterator(
+            lambda page: self.search_items(keywords, search_index, item_count, resources, item_page=page),
+            max_pages=max_pages,
+            item_count=item_count
+        )
+    
+    def build_items_result(self, asins: List[str], resources: Optional[Union[str, List[str]]]) -> Dict:
+        """
+        固定データ・合成カタログからGetItemsレスポンスを作成
+        
+        ASIN単位の部分エラーのみ注入し、遅延・リクエスト単位の障害は注入しない
+        
+        Args:
+            asins: ASINリスト
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            GetItemsレスポンス（取得できないASINは Errors に格納）
+        """
+        succeeded, errors = self.fault_injector.split_partial_errors(asins)
+        
+        items = []
+        for asin in succeeded:
+            item = self.mock_data["item_details"].get(asin) or self.catalog.get_item_by_asin(asin)
+            if item is not None:
+                items.append(project_item(item, resources))
+            else:
+                # 実APIと同様に、存在しないASINはASIN単位のエラーとして返す
+                errors.append({
+                    'Code': 'InvalidParameterValue',
+                    'Message': f"The ItemId {asin} provided in the request is invalid."
+                })
+        
+        result = {
+            "ItemsResult": {
+                "Items": items,
+                "TotalResultCount": len(items)
+            }
+        }
+        if errors:
+            result["Errors"] = errors
+        return result
+    
+    def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
         """
         商品詳細情報を取得（モック）
         
         Args:
             asins: ASINリスト
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
             
         Returns:
             商品詳細情報
@@ -303,35 +470,60 @@ class MockAmazonAPIClient:
         try:
             self.logger.info(f"モック商品詳細取得: {len(asins)}件")
             
-            items = []
-            for asin in asins:
-                if asin in self.mock_data["item_details"]:
-                    items.append(self.mock_data["item_details"][asin])
-            
-            # レート制限シミュレーション
-            time.sleep(0.1)
+            # 遅延・障害シミュレーション
+            self._simulate_request('getitems')
             
-            result = {
-                "ItemsResult": {
-                    "Items": items,
-                    "TotalResultCount": len(items)
-                }
-            }
+            result = self.build_items_result(asins, resources)
             
-            self.logger.info(f"モック商品詳細取得成功: {len(items)}件")
+            self.logger.info(f"モック商品詳細取得成功: {result['ItemsResult']['TotalResultCount']}件")
             return result
             
+        except APIRequestError as e:
+            self.logger.error(f"モック商品詳細取得エラー: {e.status_code} - {e.body}")
+            return self._build_request_errors(e)
         except Exception as e:
             self.logger.error(f"モック商品詳細取得エラー: {e}")
             return {"ItemsResult": {"Items": []}}
     
-    def get_similar_items(self, asin: str, item_count: int = 10) -> Dict:
+    def build_similar_result(self, asin: str, item_count: int,
+                             resources: Optional[Union[str, List[str]]]) -> Dict:
+        """
+        類似商品のGetSimilarItemsレスポンスを作成（合成商品は後続のインデックスを類似商品とする）
+        
+        Args:
+            asin: 商品ASIN
+            item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            GetSimilarItemsレスポンス
+        """
+        index = self.catalog.index_of(asin)
+        if index is None:
+            similar_items = self.mock_data["search_results"][:item_count]
+        else:
+            similar_items = [
+                self.catalog.get_item((index + offset) % len(self.catalog))
+                for offset in range(1, min(item_count, len(self.catalog) - 1) + 1)
+            ]
+        similar_items = [project_item(item, resources) for item in similar_items]
+        
+        return {
+            "SimilarItemsResult": {
+                "Items": similar_items,
+                "TotalResultCount": len(similar_items)
+            }
+        }
+    
+    def get_similar_items(self, asin: str, item_count: int = 10,
+                          resources: Optional[Union[str, List[str]]] = None) -> Dict:
         """
         類似商品を取得（モック）
         
         Args:
             asin: 商品ASIN
             item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
             
         Returns:
             類似商品情報
@@ -339,26 +531,30 @@ class MockAmazonAPIClient:
         try:
             self.logger.info(f"モック類似商品取得: {asin}")
             
-            # 類似商品のモックデータ
-            similar_items = self.mock_data["search_results"][:item_count]
+            # 遅延・障害シミュレーション
+            self._simulate_request('getsimilaritems')
             
-            # レート制限シミュレーション
-            time.sleep(0.1)
+            result = self.build_similar_result(asin, item_count, resources)
             
-            result = {
-                "SimilarItemsResult": {
-                    "Items": similar_items,
-                    "TotalResultCount": len(similar_items)
-                }
-            }
-            
-            self.logger.info(f"モック類似商品取得成功: {len(similar_items)}件")
+            self.logger.info(f"モック類似商品取得成功: {len(result['SimilarItemsResult']['Items'])}件")
             return result
             
+        except APIRequestError as e:
+            self.logger.error(f"モック類似商品取得エラー: {e.status_code} - {e.body}")
+            return {}
         except Exception as e:
             self.logger.error(f"モック類似商品取得エラー: {e}")
             return {"SimilarItemsResult": {"Items": []}}
     
+    def get_fault_stats(self) -> Dict:
+        """
+        注入した障害の件数を取得
+        
+        Returns:
+            429・503・部分エラーの件数
+        """
+        return self.fault_injector.get_stats()
+    
     def rate_limit_delay(self, seconds: float = 1.0):
         """
         レート制限対応のための遅延（モック）
@@ -370,5 +566,150 @@ class MockAmazonAPIClient:
         self.logger.debug(f"モックレート制限対応: {seconds}秒遅延")
 
 
-# グローバルモッククライアントインスタンス
-mock_amazon_client = MockAmazonAPIClient() 
\ No newline at end of file
+class AsyncMockAmazonAPIClient(MockAmazonAPIClient):
+    """
+    Amazon API 非同期モッククライアント
+    
+    遅延はイベントループを止めずに待機するため、AsyncAmazonAPIClient と同様に
+    多数のリクエストを並行実行して同時実行・レート制限の挙動を検証できる
+    """
+    
+    async def _simulate_request_async(self, operation: str):
+        """
+        遅延・障害を再現（非同期）
+        
+        Args:
+            operation: オペレーション名
+            
+        Raises:
+            APIRequestError: 障害を注入した場合（429はretry_afterを含む）
+        """
+        await asyncio.sleep(self.latency.sample())
+        self.fault_injector.check(operation)
+    
+    async def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                           resources: Optional[Union[str, List[str]]] = None, item_page: int = 1) -> Dict:
+        """
+        商品検索を実行（非同期モック）
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            item_page: 取得するページ番号
+            
+        Returns:
+            検索結果
+        """
+        try:
+            await self._simulate_request_async('searchitems')
+            return self.build_search_result(keywords, search_index, item_count, resources, item_page)
+        except APIRequestError as e:
+            self.logger.error(f"モック検索エラー: {e.status_code} - {e.body}")
+            return {}
+        except Exception as e:
+            self.logger.error(f"モック商品検索エラー: {e}")
+            return {"SearchResult": {"Items": []}}
+    
+    def iter_search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                          max_pages: int = SEARCH_MAX_PAGES,
+                          resources: Optional[Union[str, List[str]]] = None) -> AsyncSearchItemsIterator:
+        """
+        商品検索結果をページ単位で遅延取得（非同期モック）
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: 1ページあたりの取得件数
+            max_pages: 取得する最大ページ数（上限10）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            商品を1件ずつ返す非同期イテレーター
+        """
+        return AsyncSearchItemsIterator(
+            lambda page: self.search_items(keywords, search_index, item_count, resources, item_page=page),
+            max_pages=max_pages,
+            item_count=item_count
+        )
+    
+    async def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        商品詳細情報を取得（非同期モック）
+        
+        Args:
+            asins: ASINリスト
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            商品詳細情報
+        """
+        try:
+            await self._simulate_request_async('getitems')
+            return self.build_items_result(asins, resources)
+        except APIRequestError as e:
+            self.logger.error(f"モック商品詳細取得エラー: {e.status_code} - {e.body}")
+            return self._build_request_errors(e)
+        except Exception as e:
+            self.logger.error(f"モック商品詳細取得エラー: {e}")
+            return {"ItemsResult": {"Items": []}}
+    
+    async def get_similar_items(self, asin: str, item_count: int = 10,
+                                resources: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        類似商品を取得（非同期モック）
+        
+        Args:
+            asin: 商品ASIN
+            item_count: 取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は全項目）
+            
+        Returns:
+            類似商品情報
+        """
+        try:
+            await self._simulate_request_async('getsimilaritems')
+            return self.build_similar_result(asin, item_count, resources)
+        except APIRequestError as e:
+            self.logger.error(f"モック類似商品取得エラー: {e.status_code} - {e.body}")
+            return {}
+        except Exception as e:
+            self.logger.error(f"モック類似商品取得エラー: {e}")
+            return {"SimilarItemsResult": {"Items": []}}
+    
+    async def rate_limit_delay(self, seconds: float = 1.0):
+        """
+        レート制限対応のための遅延（非同期モック）
+        
+        Args:
+            seconds: 遅延秒数
+        """
+        await asyncio.sleep(seconds)
+
+
+# グローバルモッククライアントインスタンス（初回利用時に生成）
+_mock_amazon_client = None
+_mock_amazon_client_lock = threading.Lock()
+
+
+def get_mock_amazon_client() -> MockAmazonAPIClient:
+    """
+    グローバルモッククライアントを取得（初回呼び出し時に生成）
+    
+    Returns:
+        MockAmazonAPIClientインスタンス
+    """
+    global _mock_amazon_client
+    if _mock_amazon_client is None:
+        with _mock_amazon_client_lock:
+            if _mock_amazon_client is None:
+                _mock_amazon_client = MockAmazonAPIClient()
+    return _mock_amazon_client
+
+
+def __getattr__(name: str):
+    """従来の `mock_amazon_client` 参照を遅延生成で維持"""
+    if name == 'mock_amazon_client':
+        return get_mock_amazon_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
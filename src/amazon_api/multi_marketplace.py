@@ -0,0 +1,242 @@
+"""
+マルチマーケットプレイス クライアント
+同じASIN・キーワードを複数のマーケットプレイスへ並列に問い合わせ、
+(マーケットプレイス, ASIN) をキーとして結果を統合する
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from src.amazon_api.client import AmazonAPIClient
+from src.amazon_api.negative_cache import NegativeCache
+from src.amazon_api.quota import RequestAccounting
+from src.amazon_api.response_cache import ResponseCache
+from src.utils.config import config_manager
+from src.utils.logger import get_logger
+
+
+class MultiMarketplaceClient:
+    """
+    マーケットプレイスごとのクライアントへリクエストを振り分ける
+    
+    各クライアントはコネクションプール・レートリミッター・認証情報を個別に持ち、
+    レスポンスキャッシュ・リクエスト記録・ネガティブキャッシュのみを共有する（いずれも Marketplace で区別）
+    """
+    
+    def __init__(self, clients: Dict[str, AmazonAPIClient], max_workers: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            clients: マーケットプレイス名とクライアントの対応
+            max_workers: 並列に送信するマーケットプレイス数（Noneの場合は全マーケットプレイス）
+        """
+        if not clients:
+            raise ValueError("マーケットプレイスが指定されていません")
+        
+        self.logger = get_logger("multi_marketplace")
+        self.clients = dict(clients)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.clients),
+            thread_name_prefix="paapi-marketplace"
+        )
+    
+    @classmethod
+    def from_config(cls, amazon_config: Optional[Dict] = None,
+                    marketplaces: Optional[List[str]] = None) -> "MultiMarketplaceClient":
+        """
+        設定の amazon.marketplaces からマーケットプレイス別クライアントを作成
+        
+        Args:
+            amazon_config: amazon 直下の設定（Noneの場合は設定ファイルから取得）
+            marketplaces: 使用するマーケットプレイス名（Noneの場合は設定の全件）
+        
+        Returns:
+            MultiMarketplaceClientインスタンス
+        """
+        if amazon_config is None:
+            amazon_config = config_manager.get_amazon_config()
+        
+        marketplace_configs = amazon_config.get('marketplaces') or {}
+        if marketplaces is not None:
+            unknown = [name for name in marketplaces if name not in marketplace_configs]
+            if unknown:
+                raise ValueError(f"未設定のマーケットプレイスです: {unknown}")
+            marketplace_configs = {name: marketplace_configs[name] for name in marketplaces}
+        
+        # キャッシュ・リクエスト記録・ネガティブキャッシュは全マーケットプレイスで1つを共有
+        response_cache = ResponseCache.from_config(amazon_config.get('cache', {}))
+        request_accounting = RequestAccounting.from_config(amazon_config.get('accounting', {}))
+        negative_cache = NegativeCache.from_config(amazon_config.get('negative_cache', {}))
+        clients = {
+            name: AmazonAPIClient(
+                response_cache=response_cache,
+                marketplace_config=marketplace_config or {},
+                request_accounting=request_accounting,
+                negative_cache=negative_cache
+            )
+            for name, marketplace_config in marketplace_configs.items()
+        }
+        return cls(clients)
+    
+    def _select_clients(self, marketplaces: Optional[List[str]]) -> Dict[str, AmazonAPIClient]:
+        """指定されたマーケットプレイスのクライアントを取得"""
+        if marketplaces is None:
+            return self.clients
+        
+        unknown = [name for name in marketplaces if name not in self.clients]
+        if unknown:
+            raise ValueError(f"未登録のマーケットプレイスです: {unknown}")
+        return {name: self.clients[name] for name in marketplaces}
+    
+    def _fan_out(self, marketplaces: Optional[List[str]],
+                 request: Callable[[AmazonAPIClient], Dict]) -> Dict[str, Dict]:
+        """
+        マーケットプレイスごとのリクエストを並列に実行
+        
+        ワーカースレッドは呼び出し元のコンテキスト（RequestAccounting.job のジョブ名）を
+        引き継がないため、マーケットプレイスごとにコピーしたコンテキスト上で実行し、
+        ジョブ別の記録とリソースプロファイルを呼び出し元と揃える
+        
+        Args:
+            marketplaces: 対象のマーケットプレイス名（Noneの場合は全件）
+            request: クライアントを受け取りレスポンスを返す関数
+        
+        Returns:
+            マーケットプレイス名とレスポンスの対応
+        """
+        futures = {
+            name: self._executor.submit(contextvars.copy_context().run, request, client)
+            for name, client in self._select_clients(marketplaces).items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+    
+    @staticmethod
+    def _merge_results(results: Dict[str, Dict], result_key: str) -> Dict:
+        """
+        マーケットプレイスごとのレスポンスを (マーケットプレイス, ASIN) キーで統合
+        
+        Args:
+            results: マーケットプレイス名とレスポンスの対応
+            result_key: 商品リストを持つキー（SearchResult / ItemsResult）
+        
+        Returns:
+            Items・TotalResultCount（マーケットプレイス別）・Errors（Marketplace付き）・
+            Stale（古いキャッシュで応答したマーケットプレイス別）
+        """
+        items: Dict[Tuple[str, str], Dict] = {}
+        total_result_count = {}
+        errors = []
+        stale = {}
+        for name, result in results.items():
+            if not result:
+                errors.append({'Code': 'RequestFailed', 'Message': 'リクエストに失敗しました', 'Marketplace': name})
+                continue
+            
+            section = result.get(result_key, {})
+            for item in section.get('Items', []):
+                items[(name, item.get('ASIN'))] = item
+            total_result_count[name] = section.get('TotalResultCount', 0)
+            errors.extend({**error, 'Marketplace': name} for error in result.get('Errors', []))
+            if 'Stale' in result:
+                stale[name] = result['Stale']
+        
+        merged = {'Items': items, 'TotalResultCount': total_result_count}
+        if errors:
+            merged['Errors'] = errors
+        if stale:
+            merged['Stale'] = stale
+        return merged
+    
+    def search_items(self, keywords: str, search_index: str = "All", item_count: int = 10,
+                     resources: Optional[Union[str, List[str]]] = None,
+                     marketplaces: Optional[List[str]] = None) -> Dict:
+        """
+        複数マーケットプレイスで商品検索を並列に実行
+        
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索インデックス
+            item_count: マーケットプレイスごとの取得件数
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+            marketplaces: 対象のマーケットプレイス名（Noneの場合は全件）
+        
+        Returns:
+            (マーケットプレイス, ASIN) をキーとする検索結果
+        """
+        try:
+            results = self._fan_out(
+                marketplaces,
+                lambda client: client.search_items(keywords, search_index, item_count, resources)
+            )
+            merged = self._merge_results(results, 'SearchResult')
+            self.logger.info(f"マルチマーケットプレイス検索成功: {keywords} ({len(merged['Items'])}件)")
+            return merged
+        
+        except Exception as e:
+            self.logger.error(f"マルチマーケットプレイス検索エラー: {e}")
+            return {}
+    
+    def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None,
+                  marketplaces: Optional[List[str]] = None) -> Dict:
+        """
+        複数マーケットプレイスで商品詳細情報を並列に取得
+        
+        マーケットプレイス内のチャンクは各クライアントのレートリミッターに従って送信する
+        
+        Args:
+            asins: ASINリスト（件数制限なし）
+            resources: リソースプロファイル名またはリソース一覧（Noneの場合は設定の既定プロファイル）
+            marketplaces: 対象のマーケットプレイス名（Noneの場合は全件）
+        
+        Returns:
+            (マーケットプレイス, ASIN) をキーとする商品詳細情報
+        """
+        try:
+            results = self._fan_out(marketplaces, lambda client: client.get_items(asins, resources))
+            merged = self._merge_results(results, 'ItemsResult')
+            self.logger.info(
+                f"マルチマーケットプレイス商品詳細取得成功: {len(merged['Items'])}件 "
+                f"(エラー: {len(merged.get('Errors', []))}件)"
+            )
+            return merged
+        
+        except Exception as e:
+            self.logger.error(f"マルチマーケットプレイス商品詳細取得エラー: {e}")
+            return {}
+    
+    def get_rate_limit_status(self) -> Dict[str, Dict]:
+        """
+        マーケットプレイスごとのレート制限の状態を取得
+        
+        Returns:
+            マーケットプレイス名とレート制限の状態の対応
+        """
+        return {name: client.get_rate_limit_status() for name, client in self.clients.items()}
+    
+    def close(self):
+        """並列実行用のスレッドと各クライアントのHTTPセッションを閉じる"""
+        self._executor.shutdown(wait=True)
+        for client in self.clients.values():
+            client.close()
+
+
+# グローバルマルチマーケットプレイスクライアント（初回利用時に生成）
+_multi_marketplace_client = None
+_multi_marketplace_client_lock = threading.Lock()
+
+
+def get_multi_marketplace_client() -> MultiMarketplaceClient:
+    """
+    設定の全マーケットプレイスを対象とするクライアントを取得（初回呼び出し時に生成）
+    
+    Returns:
+        MultiMarketplaceClientインスタンス
+    """
+    global _multi_marketplace_client
+    if _multi_marketplace_client is None:
+        with _multi_marketplace_client_lock:
+            if _multi_marketplace_client is None:
+                _multi_marketplace_client = MultiMarketplaceClient.from_config()
+    return _multi_marketplace_client
@@ -0,0 +1,214 @@
+"""
+ネガティブキャッシュモジュール
+取扱終了・無効なASINを記録し、再確認までの間隔を指数的に延ばして
+GetItemsのバッチから除外する
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.utils.logger import get_logger
+
+
+class NegativeCache:
+    """
+    無効と判定されたASINの再確認時刻を管理する
+    
+    n回連続で無効と判定されたASINは base_interval × multiplier^(n-1) 秒後
+    （最大 max_interval 秒）まで問い合わせ対象から除外する
+    """
+    
+    def __init__(self, base_interval: float = 86400, max_interval: float = 2592000,
+                 multiplier: float = 2.0, db_path: Optional[str] = None):
+        """
+        初期化
+        
+        Args:
+            base_interval: 初回判定後の再確認までの秒数
+            max_interval: 再確認間隔の上限秒数
+            multiplier: 連続判定ごとの間隔の倍率
+            db_path: SQLiteファイルパス（Noneの場合はメモリ上のみ）
+        """
+        self.logger = get_logger("negative_cache")
+        self.base_interval = max(float(base_interval), 0.0)
+        self.max_interval = max(float(max_interval), self.base_interval)
+        self.multiplier = max(float(multiplier), 1.0)
+        
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict] = {}
+        self._suppressed_count = 0
+        
+        self._conn = None
+        if db_path:
+            self._conn = self._open_database(db_path)
+            self._load_entries()
+        # SQLiteに永続化する場合はディスクI/Oを伴うため、非同期クライアントはイベントループ外で呼び出す
+        self.blocking = self._conn is not None
+    
+    @classmethod
+    def from_config(cls, negative_cache_config: Optional[Dict]) -> Optional["NegativeCache"]:
+        """設定辞書からネガティブキャッシュを作成（無効化されている場合はNone）"""
+        negative_cache_config = negative_cache_config or {}
+        if not negative_cache_config.get('enabled', True):
+            return None
+        
+        return cls(
+            base_interval=negative_cache_config.get('base_interval', 86400),
+            max_interval=negative_cache_config.get('max_interval', 2592000),
+            multiplier=negative_cache_config.get('multiplier', 2.0),
+            db_path=negative_cache_config.get('db_path')
+        )
+    
+    def _open_database(self, db_path: str) -> sqlite3.Connection:
+        """SQLiteファイルを開き、テーブルを作成"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS negative_cache ("
+            "marketplace TEXT, asin TEXT, code TEXT, message TEXT, failures INTEGER, "
+            "first_failed_at REAL, last_failed_at REAL, next_check_at REAL, "
+            "PRIMARY KEY (marketplace, asin))"
+        )
+        conn.commit()
+        return conn
+    
+    def _load_entries(self):
+        """記録済みのASINをメモリに読み込み（バッチ作成時の照会をメモリのみで行う）"""
+        rows = self._conn.execute(
+            "SELECT marketplace, asin, code, message, failures, first_failed_at, last_failed_at, next_check_at "
+            "FROM negative_cache"
+        ).fetchall()
+        for marketplace, asin, code, message, failures, first_failed_at, last_failed_at, next_check_at in rows:
+            self._entries[(marketplace, asin)] = {
+                'code': code,
+                'message': message,
+                'failures': failures,
+                'first_failed_at': first_failed_at,
+                'last_failed_at': last_failed_at,
+                'next_check_at': next_check_at
+            }
+    
+    def get_interval(self, failures: int) -> float:
+        """連続判定回数に対する再確認間隔（秒）"""
+        return min(self.base_interval * self.multiplier ** max(failures - 1, 0), self.max_interval)
+    
+    def record_failure(self, asin: str, error: Dict, marketplace: str = '', now: Optional[float] = None) -> float:
+        """
+        無効と判定されたASINを記録
+        
+        Args:
+            asin: ASIN
+            error: PA-API形式のエラー
+            marketplace: マーケットプレイス
+            now: 判定時刻（Noneの場合は現在時刻）
+        
+        Returns:
+            次回の再確認時刻（UNIX時間）
+        """
+        now = time.time() if now is None else now
+        key = (marketplace, asin)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            failures = entry['failures'] + 1 if entry else 1
+            entry = {
+                'code': error.get('Code'),
+                'message': error.get('Message'),
+                'failures': failures,
+                'first_failed_at': entry['first_failed_at'] if entry else now,
+                'last_failed_at': now,
+                'next_check_at': now + self.get_interval(failures)
+            }
+            self._entries[key] = entry
+            
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO negative_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (marketplace, asin, entry['code'], entry['message'], failures,
+                     entry['first_failed_at'], now, entry['next_check_at'])
+                )
+                self._conn.commit()
+        
+        return entry['next_check_at']
+    
+    def record_success(self, asins: List[str], marketplace: str = ''):
+        """
+        取得できたASINの記録を削除（再出品された場合）
+        
+        Args:
+            asins: 取得できたASINリスト
+            marketplace: マーケットプレイス
+        """
+        with self._lock:
+            recovered = [asin for asin in asins if self._entries.pop((marketplace, asin), None) is not None]
+            if recovered and self._conn is not None:
+                self._conn.executemany(
+                    "DELETE FROM negative_cache WHERE marketplace = ? AND asin = ?",
+                    [(marketplace, asin) for asin in recovered]
+                )
+                self._conn.commit()
+        
+        if recovered:
+            self.logger.info(f"再取得できたASINを除外対象から削除: {', '.join(recovered)}")
+    
+    def partition(self, asins: List[str], marketplace: str = '',
+                  now: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """
+        ASINを問い合わせ対象と除外対象に振り分け
+        
+        Args:
+            asins: ASINリスト
+            marketplace: マーケットプレイス
+            now: 判定時刻（Noneの場合は現在時刻）
+        
+        Returns:
+            問い合わせ対象のASINリストと、再確認時刻前のため除外するASINリスト
+        """
+        now = time.time() if now is None else now
+        to_fetch = []
+        suppressed = []
+        with self._lock:
+            for asin in asins:
+                entry = self._entries.get((marketplace, asin))
+                if entry is not None and entry['next_check_at'] > now:
+                    suppressed.append(asin)
+                else:
+                    to_fetch.append(asin)
+            self._suppressed_count += len(suppressed)
+        return to_fetch, suppressed
+    
+    def get_report(self, marketplace: Optional[str] = None, now: Optional[float] = None) -> List[Dict]:
+        """
+        記録済みASINの一覧を取得
+        
+        Args:
+            marketplace: マーケットプレイス（Noneの場合は全件）
+            now: 判定時刻（Noneの場合は現在時刻）
+        
+        Returns:
+            ASIN・エラー内容・連続判定回数・次回再確認時刻・除外中かどうかのリスト（再確認が遠い順）
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            report = [
+                {'marketplace': key[0], 'asin': key[1], **entry, 'suppressed': entry['next_check_at'] > now}
+                for key, entry in self._entries.items()
+                if marketplace is None or key[0] == marketplace
+            ]
+        report.sort(key=lambda entry: entry['next_check_at'], reverse=True)
+        return report
+    
+    def get_stats(self) -> Dict:
+        """
+        ネガティブキャッシュの統計を取得
+        
+        Returns:
+            記録件数・除外したASIN数（累計）
+        """
+        with self._lock:
+            return {'entries': len(self._entries), 'suppressed': self._suppressed_count}
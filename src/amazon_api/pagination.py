@@ -0,0 +1,134 @@
+"""
+SearchItems ページング
+ItemPageを必要になった時点で1ページずつ取得するイテレーターを提供
+"""
+
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+
+# PA-APIで指定できるItemPageの上限
+SEARCH_MAX_PAGES = 10
+
+
+class _SearchPagingState:
+    """同期/非同期イテレーター共通のページング状態"""
+    
+    def __init__(self, max_pages: int = SEARCH_MAX_PAGES, item_count: int = 10):
+        """
+        初期化
+        
+        Args:
+            max_pages: 取得する最大ページ数（上限10）
+            item_count: 1ページあたりの取得件数
+        """
+        self.max_pages = min(max(int(max_pages), 1), SEARCH_MAX_PAGES)
+        self.item_count = item_count
+        self.total_result_count: Optional[int] = None
+        self.pages_fetched = 0
+    
+    def _read_page(self, page: int, result: Dict) -> List[Dict]:
+        """
+        取得したページを記録し、商品リストを返す
+        
+        Args:
+            page: ページ番号（1始まり）
+            result: SearchItemsレスポンス
+        
+        Returns:
+            ページ内の商品リスト
+        """
+        self.pages_fetched = page
+        search_result = (result or {}).get('SearchResult', {})
+        if self.total_result_count is None and 'TotalResultCount' in search_result:
+            self.total_result_count = search_result['TotalResultCount']
+        return search_result.get('Items', [])
+    
+    def _has_next_page(self, page: int, items: List[Dict]) -> bool:
+        """次のページを取得する必要があるか判定"""
+        if page >= self.max_pages or len(items) < self.item_count:
+            return False
+        if self.total_result_count is not None and page * self.item_count >= self.total_result_count:
+            return False
+        return True
+
+
+class SearchItemsIterator(_SearchPagingState):
+    """
+    SearchItemsの結果を1商品ずつ返すイテレーター
+    
+    次のページは前のページの商品を消費し終えた時点で取得するため、
+    利用側が途中で打ち切ったページ以降のリクエストは送信しない
+    """
+    
+    def __init__(self, fetch_page: Callable[[int], Dict], max_pages: int = SEARCH_MAX_PAGES,
+                 item_count: int = 10):
+        """
+        初期化
+        
+        Args:
+            fetch_page: ページ番号を受け取りSearchItemsレスポンスを返す関数
+            max_pages: 取得する最大ページ数（上限10）
+            item_count: 1ページあたりの取得件数
+        """
+        super().__init__(max_pages, item_count)
+        self.fetch_page = fetch_page
+        self._items = self._generate()
+    
+    def __iter__(self) -> "SearchItemsIterator":
+        return self
+    
+    def __next__(self) -> Dict:
+        return next(self._items)
+    
+    def close(self):
+        """以降のページ取得を打ち切る"""
+        self._items.close()
+    
+    def _generate(self) -> Iterator[Dict]:
+        """ページを順に取得して商品を返す"""
+        page = 1
+        while True:
+            items = self._read_page(page, self.fetch_page(page))
+            yield from items
+            if not self._has_next_page(page, items):
+                return
+            page += 1
+
+
+class AsyncSearchItemsIterator(_SearchPagingState):
+    """SearchItemsの結果を1商品ずつ返す非同期イテレーター"""
+    
+    def __init__(self, fetch_page: Callable[[int], Awaitable[Dict]], max_pages: int = SEARCH_MAX_PAGES,
+                 item_count: int = 10):
+        """
+        初期化
+        
+        Args:
+            fetch_page: ページ番号を受け取りSearchItemsレスポンスを返すコルーチン関数
+            max_pages: 取得する最大ページ数（上限10）
+            item_count: 1ページあたりの取得件数
+        """
+        super().__init__(max_pages, item_count)
+        self.fetch_page = fetch_page
+        self._items = self._generate()
+    
+    def __aiter__(self) -> "AsyncSearchItemsIterator":
+        return self
+    
+    async def __anext__(self) -> Dict:
+        return await self._items.__anext__()
+    
+    async def aclose(self):
+        """以降のページ取得を打ち切る"""
+        await self._items.aclose()
+    
+    async def _generate(self) -> AsyncIterator[Dict]:
+        """ページを順に取得して商品を返す"""
+        page = 1
+        while True:
+            items = self._read_page(page, await self.fetch_page(page))
+            for item in items:
+                yield item
+            if not self._has_next_page(page, items):
+                return
+            page += 1
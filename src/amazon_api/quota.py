@@ -0,0 +1,359 @@
+"""
+PA-API クォータ管理モジュール
+オペレーション・ジョブ・日付別のリクエスト数を記録し、
+ウォッチリストの更新に必要なリクエスト数・所要時間を見積もる
+"""
+
+import atexit
+import contextvars
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.utils.logger import get_logger
+
+
+# 集計対象のジョブ（スレッド・非同期タスクごとに保持）
+_current_job: contextvars.ContextVar = contextvars.ContextVar('paapi_job', default=None)
+
+# ジョブ未指定のリクエストの集計名
+UNASSIGNED_JOB = '-'
+
+SECONDS_PER_DAY = 86400
+
+
+def _utc_day(timestamp: Optional[float] = None) -> str:
+    """UTC日付（レートリミッターの日次集計と同じ区切り）"""
+    return datetime.fromtimestamp(time.time() if timestamp is None else timestamp, timezone.utc).strftime('%Y-%m-%d')
+
+
+class RequestAccounting:
+    """
+    PA-APIリクエスト数をSQLiteに記録する
+    
+    HTTP送信ごとにリクエスト数を、キャッシュで応答した場合はキャッシュヒット数を加算する。
+    加算はメモリ上に溜め、flush_interval 秒ごと・集計時・close() 時にまとめて書き込む
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, flush_interval: float = 5.0):
+        """
+        初期化
+        
+        Args:
+            db_path: SQLiteファイルパス（Noneの場合はメモリ上のみ）
+            flush_interval: メモリ上の加算をSQLiteに書き込む間隔（秒、0で毎回書き込む）
+        """
+        self.logger = get_logger("quota")
+        self.flush_interval = max(float(flush_interval), 0.0)
+        self._lock = threading.Lock()
+        # (day, marketplace, job, operation) ごとの未書き込みの加算
+        self._pending: Dict[Tuple[str, str, str, str], List[int]] = {}
+        self._last_flush = time.monotonic()
+        
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path or ':memory:', timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS request_counts ("
+            "day TEXT, marketplace TEXT, job TEXT, operation TEXT, "
+            "requests INTEGER DEFAULT 0, throttled INTEGER DEFAULT 0, "
+            "errors INTEGER DEFAULT 0, cache_hits INTEGER DEFAULT 0, "
+            "PRIMARY KEY (day, marketplace, job, operation))"
+        )
+        self._conn.commit()
+        # ファイルに記録する場合はディスクI/Oを伴うため、非同期クライアントはイベントループ外で呼び出す
+        self.blocking = bool(db_path)
+        if db_path:
+            # close() されずに終了した場合も未書き込みの加算を失わない
+            atexit.register(self._flush_at_exit)
+    
+    @classmethod
+    def from_config(cls, accounting_config: Optional[Dict]) -> Optional["RequestAccounting"]:
+        """設定辞書からリクエスト記録を作成（無効化されている場合はNone）"""
+        accounting_config = accounting_config or {}
+        if not accounting_config.get('enabled', True):
+            return None
+        return cls(
+            db_path=accounting_config.get('db_path'),
+            flush_interval=accounting_config.get('flush_interval', 5.0)
+        )
+    
+    @staticmethod
+    @contextmanager
+    def job(name: str) -> Iterator[None]:
+        """
+        ブロック内のリクエストを指定ジョブとして集計
+        
+        Args:
+            name: ジョブ名（scheduling の price_update など）
+        """
+        token = _current_job.set(name)
+        try:
+            yield
+        finally:
+            _current_job.reset(token)
+    
+    @staticmethod
+    def current_job() -> str:
+        """集計対象のジョブ名を取得"""
+        return _current_job.get() or UNASSIGNED_JOB
+    
+    def record(self, operation: str, status: Optional[int] = 200, marketplace: str = '',
+               cache_hit: bool = False, timestamp: Optional[float] = None):
+        """
+        1リクエスト分を記録
+        
+        Args:
+            operation: オペレーション名
+            status: HTTPステータス（キャッシュヒットの場合は無視）
+            marketplace: マーケットプレイス
+            cache_hit: キャッシュで応答した場合True（クォータは消費しない）
+            timestamp: 記録時刻（Noneの場合は現在時刻）
+        """
+        if cache_hit:
+            counts = (0, 0, 0, 1)
+        else:
+            counts = (1, int(status == 429), int(status != 200 and status != 429), 0)
+        
+        key = (_utc_day(timestamp), marketplace, self.current_job(), operation)
+        with self._lock:
+            pending = self._pending.setdefault(key, [0, 0, 0, 0])
+            for index, count in enumerate(counts):
+                pending[index] += count
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+    
+    def flush(self):
+        """メモリ上の加算をSQLiteに書き込む"""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        """メモリ上の加算を1トランザクションで書き込む（ロック取得中に呼び出す）"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        
+        rows = [(*key, *counts) for key, counts in self._pending.items()]
+        try:
+            self._conn.executemany(
+                "INSERT INTO request_counts VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, marketplace, job, operation) DO UPDATE SET "
+                "requests = requests + excluded.requests, throttled = throttled + excluded.throttled, "
+                "errors = errors + excluded.errors, cache_hits = cache_hits + excluded.cache_hits",
+                rows
+            )
+            self._conn.commit()
+        except Exception:
+            # 書き込みロックを保持したままにしない（加算はメモリに残し次回に書き込む）
+            self._conn.rollback()
+            raise
+        self._pending = {}
+    
+    def _flush_at_exit(self):
+        """終了時に未書き込みの加算を書き込む（失敗は記録のみ）"""
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.warning(f"終了時のリクエスト記録の書き込みに失敗しました: {e}")
+    
+    def close(self):
+        """未書き込みの加算を書き込み、SQLite接続を閉じる"""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+        atexit.unregister(self._flush_at_exit)
+    
+    def get_daily_usage(self, day: Optional[str] = None, marketplace: Optional[str] = None) -> Dict:
+        """
+        日次のリクエスト数を集計
+        
+        Args:
+            day: UTC日付（YYYY-MM-DD、Noneの場合は当日）
+            marketplace: マーケットプレイス（Noneの場合は全件）
+        
+        Returns:
+            合計・オペレーション別・ジョブ別のリクエスト数、429件数、エラー件数、キャッシュヒット数
+        """
+        day = day or _utc_day()
+        query = "SELECT job, operation, requests, throttled, errors, cache_hits FROM request_counts WHERE day = ?"
+        params = [day]
+        if marketplace is not None:
+            query += " AND marketplace = ?"
+            params.append(marketplace)
+        
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(query, params).fetchall()
+        
+        usage = {
+            'day': day,
+            'requests': 0,
+            'throttled': 0,
+            'errors': 0,
+            'cache_hits': 0,
+            'by_operation': {},
+            'by_job': {}
+        }
+        for job, operation, requests, throttled, errors, cache_hits in rows:
+            usage['requests'] += requests
+            usage['throttled'] += throttled
+            usage['errors'] += errors
+            usage['cache_hits'] += cache_hits
+            usage['by_operation'][operation] = usage['by_operation'].get(operation, 0) + requests
+            usage['by_job'][job] = usage['by_job'].get(job, 0) + requests
+        return usage
+    
+    def get_history(self, days: int = 7) -> Dict[str, int]:
+        """
+        直近の日別リクエスト数を取得
+        
+        Args:
+            days: 取得する日数
+        
+        Returns:
+            UTC日付とリクエスト数の対応（新しい順）
+        """
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                "SELECT day, SUM(requests) FROM request_counts GROUP BY day ORDER BY day DESC LIMIT ?",
+                (days,)
+            ).fetchall()
+        return dict(rows)
+
+
+class QuotaPlanner:
+    """
+    TPS・TPD制限とスケジュール間隔からウォッチリスト更新の可否を見積もる
+    """
+    
+    def __init__(self, tps: float = 1.0, burst: int = 1, tpd: Optional[int] = 8640,
+                 chunk_size: int = 10, intervals: Optional[Dict[str, int]] = None):
+        """
+        初期化
+        
+        Args:
+            tps: 1秒あたりのリクエスト数
+            burst: 連続送信を許容するリクエスト数
+            tpd: 1日あたりのリクエスト数（Noneまたは0で無制限）
+            chunk_size: GetItems 1リクエストあたりのASIN数
+            intervals: ジョブ名と実行間隔（秒）の対応
+        """
+        self.tps = float(tps)
+        self.burst = max(int(burst), 1)
+        self.tpd = int(tpd) if tpd else None
+        self.chunk_size = max(int(chunk_size), 1)
+        self.intervals = dict(intervals or {})
+    
+    @classmethod
+    def from_config(cls, amazon_config: Dict, scheduling_config: Optional[Dict] = None) -> "QuotaPlanner":
+        """
+        amazon.rate_limit と scheduling の *_interval から作成
+        
+        Args:
+            amazon_config: amazon 直下の設定
+            scheduling_config: scheduling の設定
+        
+        Returns:
+            QuotaPlannerインスタンス
+        """
+        rate_limit_config = amazon_config.get('rate_limit', {}) or {}
+        intervals = {
+            name[:-len('_interval')]: int(value)
+            for name, value in (scheduling_config or {}).items()
+            if name.endswith('_interval') and value
+        }
+        return cls(
+            tps=rate_limit_config.get('tps', 1.0),
+            burst=rate_limit_config.get('burst', 1),
+            tpd=rate_limit_config.get('tpd', 8640),
+            chunk_size=(amazon_config.get('single_flight', {}) or {}).get('batch_size', 10),
+            intervals=intervals
+        )
+    
+    def estimate_duration(self, requests: int) -> float:
+        """
+        リクエストを送信し終えるまでの最短秒数（バースト分は待機なし）
+        
+        Args:
+            requests: リクエスト数
+        
+        Returns:
+            所要秒数
+        """
+        return max(requests - self.burst, 0) / self.tps if self.tps > 0 else math.inf
+    
+    def plan_refresh(self, watchlist_size: int, job: str, chunk_size: Optional[int] = None,
+                     used_today: int = 0) -> Dict:
+        """
+        ウォッチリストの更新に必要なリクエスト数・所要時間を見積もる
+        
+        Args:
+            watchlist_size: 更新対象のASIN数
+            job: ジョブ名（実行間隔の参照に使用）
+            chunk_size: 1リクエストあたりのASIN数（Noneの場合は既定値）
+            used_today: 当日すでに消費したリクエスト数
+        
+        Returns:
+            リクエスト数・所要秒数・日次リクエスト数・実行間隔と日次上限に収まるか・
+            収まる最大ウォッチリストサイズ
+        """
+        chunk_size = min(max(int(chunk_size or self.chunk_size), 1), 10)
+        requests = math.ceil(watchlist_size / chunk_size)
+        duration = self.estimate_duration(requests)
+        
+        interval = self.intervals.get(job)
+        runs_per_day = SECONDS_PER_DAY / interval if interval else 1.0
+        daily_requests = math.ceil(requests * runs_per_day)
+        
+        # 実行間隔内・日次上限内に送信できるリクエスト数の上限
+        max_requests = math.inf
+        if interval:
+            max_requests = math.floor(interval * self.tps) + self.burst
+        if self.tpd:
+            max_requests = min(max_requests, math.floor(self.tpd / runs_per_day))
+        
+        plan = {
+            'job': job,
+            'watchlist_size': watchlist_size,
+            'chunk_size': chunk_size,
+            'requests': requests,
+            'duration_seconds': round(duration, 1),
+            'interval_seconds': interval,
+            'fits_interval': interval is None or duration <= interval,
+            'daily_requests': daily_requests,
+            'fits_daily_limit': self.tpd is None or daily_requests <= self.tpd,
+            'fits_remaining_today': self.tpd is None or requests <= self.tpd - used_today,
+            'max_watchlist_size': None if max_requests == math.inf else int(max_requests * chunk_size)
+        }
+        plan['fits'] = plan['fits_interval'] and plan['fits_daily_limit']
+        return plan
+    
+    def plan_schedule(self, watchlist_sizes: Dict[str, int], chunk_size: Optional[int] = None) -> Dict:
+        """
+        複数ジョブの更新を合算し、日次上限に収まるかを見積もる
+        
+        Args:
+            watchlist_sizes: ジョブ名と更新対象のASIN数の対応
+            chunk_size: 1リクエストあたりのASIN数（Noneの場合は既定値）
+        
+        Returns:
+            ジョブ別の見積もり・日次リクエスト数の合計・日次上限に収まるか
+        """
+        plans = {job: self.plan_refresh(size, job, chunk_size) for job, size in watchlist_sizes.items()}
+        daily_requests = sum(plan['daily_requests'] for plan in plans.values())
+        fits_daily_limit = self.tpd is None or daily_requests <= self.tpd
+        return {
+            'jobs': plans,
+            'daily_requests': daily_requests,
+            'tpd': self.tpd,
+            'fits_daily_limit': fits_daily_limit,
+            'fits': fits_daily_limit and all(plan['fits_interval'] for plan in plans.values())
+        }
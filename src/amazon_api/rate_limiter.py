@@ -0,0 +1,295 @@
+"""
+レート制限モジュール
+PA-APIのTPS（1秒あたり）・TPD（1日あたり）制限をトークンバケットで管理する
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+from src.utils.logger import get_logger
+
+
+class RateLimitExceeded(Exception):
+    """待機上限内にトークンを取得できなかった場合の例外"""
+
+
+class _MemoryBucketStore:
+    """プロセス内で共有するバケット状態"""
+    
+    # ロック待ちでイベントループを止めることはない
+    blocking = False
+    
+    def __init__(self, initial_tokens: float):
+        self._lock = threading.Lock()
+        self._state = (initial_tokens, time.time(), '', 0)
+    
+    def transact(self, update: Callable[[Tuple], Tuple[Tuple, object]]):
+        """状態を排他的に読み書きする"""
+        with self._lock:
+            self._state, result = update(self._state)
+            return result
+    
+    def read(self) -> Tuple:
+        """状態を読み取る"""
+        with self._lock:
+            return self._state
+
+
+class _SQLiteBucketStore:
+    """同一ホストの複数プロセスで共有するSQLiteバックエンドのバケット状態"""
+    
+    # 他プロセスのロック解放を待つため、イベントループ外で実行する
+    blocking = True
+    
+    def __init__(self, path: str, name: str, initial_tokens: float):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._name = name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_bucket ("
+            "name TEXT PRIMARY KEY, tokens REAL, updated_at REAL, day TEXT, day_count INTEGER)"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO token_bucket VALUES (?, ?, ?, '', 0)",
+            (name, initial_tokens, time.time())
+        )
+    
+    def transact(self, update: Callable[[Tuple], Tuple[Tuple, object]]):
+        """BEGIN IMMEDIATE でプロセス間の排他を取り、状態を読み書きする"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._conn.execute(
+                    "SELECT tokens, updated_at, day, day_count FROM token_bucket WHERE name = ?",
+                    (self._name,)
+                ).fetchone()
+                new_state, result = update(state)
+                self._conn.execute(
+                    "UPDATE token_bucket SET tokens = ?, updated_at = ?, day = ?, day_count = ? WHERE name = ?",
+                    (*new_state, self._name)
+                )
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def read(self) -> Tuple:
+        """書き込みロックを取らずに状態を読み取る（待ち時間・状態の参照用）"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT tokens, updated_at, day, day_count FROM token_bucket WHERE name = ?",
+                (self._name,)
+            ).fetchone()
+
+
+class TokenBucketRateLimiter:
+    """TPS・バースト・TPDを考慮したトークンバケット型レートリミッター"""
+    
+    def __init__(self, tps: float = 1.0, burst: int = 1, tpd: Optional[int] = 8640,
+                 state_path: Optional[str] = None, name: str = "paapi"):
+        """
+        初期化
+        
+        Args:
+            tps: 1秒あたりの補充トークン数
+            burst: バケット容量（連続で送信できるリクエスト数）
+            tpd: 1日あたりの上限（UTC日付で集計、Noneまたは0で無制限）
+            state_path: SQLiteファイルパス（指定時は同一ホストのプロセス間で共有）
+            name: バケット名（同じファイルで複数のバケットを区別）
+        
+        Raises:
+            ValueError: tpsが0以下の場合（トークンが補充されず待機時間を計算できない）
+        """
+        if tps is None or float(tps) <= 0:
+            raise ValueError(f"tpsには正の値を指定してください: {tps}")
+        
+        self.logger = get_logger("rate_limiter")
+        self.tps = float(tps)
+        self.burst = max(float(burst), 1.0)
+        self.tpd = int(tpd) if tpd else None
+        
+        if state_path:
+            self._store = _SQLiteBucketStore(state_path, name, self.burst)
+        else:
+            self._store = _MemoryBucketStore(self.burst)
+    
+    @classmethod
+    def from_config(cls, rate_limit_config: Optional[Dict]) -> "TokenBucketRateLimiter":
+        """
+        設定辞書からレートリミッターを作成
+        
+        Raises:
+            ValueError: rate_limit.tps が0以下の場合
+        """
+        rate_limit_config = rate_limit_config or {}
+        return cls(
+            tps=rate_limit_config.get('tps', 1.0),
+            burst=rate_limit_config.get('burst', 1),
+            tpd=rate_limit_config.get('tpd', 8640),
+            state_path=rate_limit_config.get('state_path'),
+            name=rate_limit_config.get('name', 'paapi')
+        )
+    
+    @property
+    def blocking(self) -> bool:
+        """状態の読み書きがプロセス間のロック待ちを伴うか（SQLiteで共有する場合True）"""
+        return self._store.blocking
+    
+    def _refill(self, state: Tuple, now: float) -> Tuple[float, str, int]:
+        """経過時間分のトークンを補充し、日付が変わっていれば日次カウントをリセット"""
+        tokens, updated_at, day, day_count = state
+        tokens = min(self.burst, tokens + max(now - updated_at, 0.0) * self.tps)
+        
+        today = datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%d')
+        if day != today:
+            day, day_count = today, 0
+        
+        return tokens, day, day_count
+    
+    def _wait_for(self, tokens: float, day_count: int, requested: int, now: float) -> float:
+        """指定トークン数を取得できるまでの待ち時間（秒）を計算"""
+        if self.tpd and day_count + requested > self.tpd:
+            # 日次上限到達時はUTCの翌日0時まで待機
+            current = datetime.fromtimestamp(now, timezone.utc)
+            tomorrow = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            return (tomorrow - current).total_seconds()
+        
+        if tokens >= requested:
+            return 0.0
+        
+        return (requested - tokens) / self.tps
+    
+    def _reserve(self, requested: int, consume: bool) -> float:
+        """トークン取得を試み、取得できなければ必要な待ち時間を返す"""
+        def update(state):
+            now = time.time()
+            tokens, day, day_count = self._refill(state, now)
+            wait = self._wait_for(tokens, day_count, requested, now)
+            
+            if wait == 0.0 and consume:
+                tokens -= requested
+                day_count += requested
+            
+            return (tokens, now, day, day_count), wait
+        
+        return self._store.transact(update)
+    
+    def _check_requested(self, tokens: int):
+        """一度に取得できないトークン数の要求を拒否"""
+        if tokens > self.burst:
+            raise ValueError(f"要求トークン数がバケット容量を超えています: {tokens} > {self.burst:g}")
+        if self.tpd and tokens > self.tpd:
+            raise ValueError(f"要求トークン数が日次上限を超えています: {tokens} > {self.tpd}")
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        待機せずにトークンの取得を試みる
+        
+        Args:
+            tokens: 取得するトークン数
+        
+        Returns:
+            取得できた場合True
+        """
+        return self._reserve(tokens, consume=True) == 0.0
+    
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        トークンを取得できるまで必要な時間だけ待機
+        
+        Args:
+            tokens: 取得するトークン数
+            timeout: 最大待機秒数（Noneで無制限）
+        
+        Returns:
+            実際に待機した秒数
+        
+        Raises:
+            RateLimitExceeded: timeout内に取得できない場合
+            ValueError: バケット容量・日次上限を超えるトークン数を要求した場合
+        """
+        self._check_requested(tokens)
+        waited = 0.0
+        while True:
+            wait = self._reserve(tokens, consume=True)
+            if wait == 0.0:
+                if waited > 0:
+                    self.logger.debug(f"レート制限待機: {waited:.3f}秒")
+                return waited
+            
+            if timeout is not None and waited + wait > timeout:
+                raise RateLimitExceeded(f"レート制限によりトークンを取得できません（必要待機時間: {wait:.1f}秒）")
+            
+            time.sleep(wait)
+            waited += wait
+    
+    async def acquire_async(self, tokens: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        トークンを取得できるまでイベントループをブロックせずに待機
+        
+        Args:
+            tokens: 取得するトークン数
+            timeout: 最大待機秒数（Noneで無制限）
+            
+        Returns:
+            実際に待機した秒数
+            
+        Raises:
+            RateLimitExceeded: timeout内に取得できない場合
+            ValueError: バケット容量・日次上限を超えるトークン数を要求した場合
+        """
+        self._check_requested(tokens)
+        loop = asyncio.get_running_loop()
+        waited = 0.0
+        while True:
+            if self._store.blocking:
+                # SQLiteのロック待ちで他のコルーチンを止めない
+                wait = await loop.run_in_executor(None, self._reserve, tokens, True)
+            else:
+                wait = self._reserve(tokens, consume=True)
+            if wait == 0.0:
+                return waited
+            
+            if timeout is not None and waited + wait > timeout:
+                raise RateLimitExceeded(f"レート制限によりトークンを取得できません（必要待機時間: {wait:.1f}秒）")
+            
+            await asyncio.sleep(wait)
+            waited += wait
+    
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """トークンを取得できるまでの待ち時間（秒）を取得（状態を読み取るのみで消費・更新はしない）"""
+        now = time.time()
+        available, _, day_count = self._refill(self._store.read(), now)
+        return self._wait_for(available, day_count, tokens, now)
+    
+    def get_token_level(self) -> float:
+        """現在のトークン残量を取得"""
+        return self.get_status()['tokens']
+    
+    def get_status(self) -> Dict:
+        """
+        バケットの状態を取得
+        
+        Returns:
+            トークン残量・待ち時間・日次使用量
+        """
+        now = time.time()
+        tokens, _, day_count = self._refill(self._store.read(), now)
+        return {
+            'tokens': tokens,
+            'burst': self.burst,
+            'tps': self.tps,
+            'wait_time': self._wait_for(tokens, day_count, 1, now),
+            'daily_used': day_count,
+            'daily_limit': self.tpd,
+            'daily_remaining': self.tpd - day_count if self.tpd else None
+        }
@@ -0,0 +1,142 @@
+"""
+PA-API Resources プロファイル定義
+ジョブに必要なフィールドだけを要求してレスポンスを縮小する
+"""
+
+from typing import Dict, FrozenSet, List, Optional, Sequence, Union
+
+
+# 名前付きリソースプロファイル
+RESOURCE_PROFILES: Dict[str, List[str]] = {
+    # 価格監視用: 価格・在庫のみ
+    'price_only': [
+        'Offers.Listings.Price',
+        'Offers.Listings.SavingBasis',
+        'Offers.Listings.Availability.Message'
+    ],
+    # 在庫監視用: 在庫のみ
+    'availability': [
+        'Offers.Listings.Availability.Message',
+        'Offers.Listings.Availability.Type'
+    ],
+    # カタログ用: 商品情報・画像
+    'catalog': [
+        'ItemInfo.Title',
+        'ItemInfo.ByLineInfo',
+        'Images.Primary.Large'
+    ],
+    # 正規化データの全フィールド
+    'full': [
+        'ItemInfo.Title',
+        'ItemInfo.ByLineInfo',
+        'Images.Primary.Large',
+        'Offers.Listings.Price',
+        'Offers.Listings.SavingBasis',
+        'Offers.Listings.Availability.Message',
+        'CustomerReviews.Count',
+        'CustomerReviews.StarRating'
+    ]
+}
+
+# リソースの接頭辞と、それにより値が得られる正規化フィールド
+RESOURCE_FIELDS: Dict[str, FrozenSet[str]] = {
+    'ItemInfo.Title': frozenset(['title']),
+    'ItemInfo.ByLineInfo': frozenset(['brand']),
+    'Images': frozenset(['image_url']),
+    'Offers.Listings.Price': frozenset(['current_price', 'original_price', 'discount_rate', 'currency']),
+    'Offers.Listings.SavingBasis': frozenset(['original_price', 'discount_rate']),
+    'Offers.Listings.Availability': frozenset(['availability']),
+    'CustomerReviews': frozenset(['rating', 'review_count'])
+}
+
+# リソース指定の有無にかかわらず常に得られるフィールド
+ALWAYS_FIELDS = frozenset(['asin', 'processed_at'])
+
+# レスポンスのトップレベルキーと対応するリソース接頭辞
+RESPONSE_KEYS = ('ItemInfo', 'Images', 'Offers', 'CustomerReviews')
+
+
+def resolve_resources(resources: Optional[Union[str, Sequence[str]]]) -> Optional[List[str]]:
+    """
+    プロファイル名またはリソース一覧をリソース一覧に変換
+    
+    Args:
+        resources: プロファイル名・リソース一覧（Noneの場合は指定なし）
+    
+    Returns:
+        リソース一覧（指定なしの場合はNone）
+    
+    Raises:
+        ValueError: 未定義のプロファイル名の場合
+    """
+    if resources is None:
+        return None
+    
+    if isinstance(resources, str):
+        if resources not in RESOURCE_PROFILES:
+            raise ValueError(f"未定義のリソースプロファイルです: {resources}")
+        return list(RESOURCE_PROFILES[resources])
+    
+    return list(resources)
+
+
+def get_job_profile(resources_config: Optional[Dict], job: Optional[str] = None) -> Optional[str]:
+    """
+    ジョブに割り当てられたプロファイル名を取得
+    
+    Args:
+        resources_config: amazon.resources 設定
+        job: ジョブ名（例: stock_update、Noneの場合は既定プロファイル）
+    
+    Returns:
+        プロファイル名（設定がない場合はNone）
+    """
+    resources_config = resources_config or {}
+    jobs = resources_config.get('jobs', {}) or {}
+    if job and jobs.get(job):
+        return jobs[job]
+    return resources_config.get('default_profile') or None
+
+
+def get_covered_fields(resources: Optional[Union[str, Sequence[str]]]) -> Optional[FrozenSet[str]]:
+    """
+    リソース指定で値が得られる正規化フィールドを取得
+    
+    Args:
+        resources: プロファイル名またはリソース一覧
+    
+    Returns:
+        フィールド名の集合（指定なしの場合はNone＝全フィールド）
+    """
+    resource_list = resolve_resources(resources)
+    if resource_list is None:
+        return None
+    
+    fields = set(ALWAYS_FIELDS)
+    for resource in resource_list:
+        for prefix, prefix_fields in RESOURCE_FIELDS.items():
+            if resource == prefix or resource.startswith(prefix + '.'):
+                fields.update(prefix_fields)
+    return frozenset(fields)
+
+
+def project_item(item: Dict, resources: Optional[Union[str, Sequence[str]]]) -> Dict:
+    """
+    商品データを要求リソースのトップレベル項目に絞り込む（モック・スタブ用）
+    
+    Args:
+        item: 商品データ
+        resources: プロファイル名またはリソース一覧
+    
+    Returns:
+        絞り込んだ商品データ
+    """
+    resource_list = resolve_resources(resources)
+    if resource_list is None:
+        return item
+    
+    requested = {resource.split('.', 1)[0] for resource in resource_list}
+    return {
+        key: value for key, value in item.items()
+        if key not in RESPONSE_KEYS or key in requested
+    }
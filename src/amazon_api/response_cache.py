@@ -0,0 +1,265 @@
+"""
+レスポンスキャッシュモジュール
+PA-APIレスポンスをメモリ（LRU）とSQLiteの2層でTTL付きキャッシュする
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from src.utils.logger import get_logger
+
+
+class ResponseCache:
+    """オペレーション＋正規化パラメータをキーとする2層TTLキャッシュ"""
+    
+    # キャッシュキーから除外するパラメータ（レスポンス内容に影響しないもの）
+    IGNORED_PARAMS = ('PartnerType',)
+    
+    def __init__(self, ttls: Optional[Dict[str, int]] = None, default_ttl: int = 3600,
+                 memory_max_entries: int = 10000, db_path: Optional[str] = None,
+                 stale_ttl: int = 0):
+        """
+        初期化
+        
+        Args:
+            ttls: オペレーション別TTL（秒）
+            default_ttl: TTL未設定オペレーションのTTL（秒）
+            memory_max_entries: メモリ層の最大エントリ数
+            db_path: SQLiteファイルパス（Noneの場合はメモリ層のみ）
+            stale_ttl: 期限切れ後も古いデータとして保持する秒数（stale-while-revalidate用）
+        """
+        self.logger = get_logger("response_cache")
+        self.ttls = dict(ttls or {})
+        self.default_ttl = int(default_ttl)
+        self.stale_ttl = max(int(stale_ttl), 0)
+        self.memory_max_entries = max(int(memory_max_entries), 1)
+        
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'stale_hits': 0}
+        
+        self._conn = None
+        if db_path:
+            self._conn = self._open_database(db_path)
+        # SQLite層を使う場合はディスクI/Oを伴うため、非同期クライアントはイベントループ外で呼び出す
+        self.blocking = self._conn is not None
+    
+    @classmethod
+    def from_config(cls, cache_config: Optional[Dict]) -> Optional["ResponseCache"]:
+        """設定辞書からキャッシュを作成（無効化されている場合はNone）"""
+        cache_config = cache_config or {}
+        if not cache_config.get('enabled', True):
+            return None
+        
+        return cls(
+            ttls=cache_config.get('ttl', {}),
+            default_ttl=cache_config.get('default_ttl', 3600),
+            memory_max_entries=cache_config.get('memory_max_entries', 10000),
+            db_path=cache_config.get('db_path'),
+            stale_ttl=cache_config.get('stale_ttl', 0)
+        )
+    
+    def _open_database(self, db_path: str) -> sqlite3.Connection:
+        """SQLiteキャッシュ層を開く"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, operation TEXT, stored_at REAL, expires_at REAL, value TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_expires ON response_cache (expires_at)")
+        conn.commit()
+        return conn
+    
+    @classmethod
+    def make_key(cls, operation: str, params: Dict, ignored_params: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        キャッシュキーを生成
+        
+        パラメータ名でソートし、ItemIdsは順序に依存しないよう並べ替える
+        
+        Args:
+            operation: オペレーション名
+            params: リクエストパラメータ
+            ignored_params: キーに含めないパラメータ（Noneの場合は IGNORED_PARAMS）
+        
+        Returns:
+            キャッシュキー
+        """
+        if ignored_params is None:
+            ignored_params = cls.IGNORED_PARAMS
+        normalized = {}
+        for name, value in params.items():
+            if name in ignored_params or value is None:
+                continue
+            if name == 'ItemIds':
+                value = ','.join(sorted(str(value).split(',')))
+            normalized[name] = str(value)
+        
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        return f"{operation}:{digest}"
+    
+    def get_ttl(self, operation: str) -> int:
+        """オペレーションのTTL（秒）を取得"""
+        return int(self.ttls.get(operation, self.default_ttl))
+    
+    def get(self, operation: str, params: Dict) -> Optional[Dict]:
+        """
+        キャッシュからレスポンスを取得
+        
+        Args:
+            operation: オペレーション名
+            params: リクエストパラメータ
+        
+        Returns:
+            キャッシュ済みレスポンス（未登録・期限切れの場合はNone）
+        """
+        key = self.make_key(operation, params)
+        now = time.time()
+        
+        with self._lock:
+            # メモリ層
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return value
+                if expires_at + self.stale_ttl <= now:
+                    del self._memory[key]
+            
+            # SQLite層
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT stored_at, expires_at, value FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[2])
+                    self._remember(key, (row[0], row[1], value))
+                    self._stats['disk_hits'] += 1
+                    return value
+            
+            self._stats['misses'] += 1
+            return None
+    
+    def get_stale(self, operation: str, params: Dict) -> Optional[Tuple[Dict, float]]:
+        """
+        期限切れでも保持期間内のレスポンスを取得（stale-while-revalidate用）
+        
+        Args:
+            operation: オペレーション名
+            params: リクエストパラメータ
+        
+        Returns:
+            レスポンスと登録時刻（UNIX時間）の組（未登録・保持期間切れの場合はNone）
+        """
+        key = self.make_key(operation, params)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT stored_at, expires_at, value FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1], json.loads(row[2]))
+            
+            if entry is None or entry[1] + self.stale_ttl <= now:
+                return None
+            
+            self._stats['stale_hits'] += 1
+            return entry[2], entry[0]
+    
+    def set(self, operation: str, params: Dict, value: Dict):
+        """
+        レスポンスをキャッシュに登録
+        
+        Args:
+            operation: オペレーション名
+            params: リクエストパラメータ
+            value: レスポンス
+        """
+        ttl = self.get_ttl(operation)
+        if ttl <= 0:
+            return
+        
+        key = self.make_key(operation, params)
+        stored_at = time.time()
+        expires_at = stored_at + ttl
+        
+        with self._lock:
+            self._remember(key, (stored_at, expires_at, value))
+            
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, operation, stored_at, expires_at, json.dumps(value, ensure_ascii=False))
+                )
+                self._conn.commit()
+            
+            self._stats['stores'] += 1
+    
+    def _remember(self, key: str, entry: tuple):
+        """メモリ層に登録し、上限を超えた古いエントリを追い出す"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+    
+    def purge_expired(self) -> int:
+        """
+        期限切れエントリを削除
+        
+        Returns:
+            SQLite層から削除した件数
+        """
+        # 古いデータとして保持する期間を過ぎたもののみ削除
+        now = time.time() - self.stale_ttl
+        with self._lock:
+            expired_keys = [key for key, entry in self._memory.items() if entry[1] <= now]
+            for key in expired_keys:
+                del self._memory[key]
+            
+            if self._conn is None:
+                return 0
+            
+            cursor = self._conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+            self.logger.info(f"期限切れキャッシュを削除: {cursor.rowcount}件")
+            return cursor.rowcount
+    
+    def clear(self):
+        """全エントリを削除"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM response_cache")
+                self._conn.commit()
+    
+    def get_stats(self) -> Dict:
+        """
+        ヒット・ミスの統計を取得
+        
+        Returns:
+            統計情報
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        
+        stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0
+        return stats
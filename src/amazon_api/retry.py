@@ -0,0 +1,218 @@
+"""
+リトライ制御モジュール
+指数バックオフ＋ジッター、Retry-After対応、サーキットブレーカーを提供
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Type
+from src.amazon_api.exceptions import APIRequestError, CircuitOpenError
+from src.utils.logger import get_logger
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-Afterヘッダーを秒数に変換
+    
+    Args:
+        value: ヘッダー値（秒数またはHTTP日付）
+    
+    Returns:
+        待機秒数（解釈できない場合はNone）
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """リトライ可否と待機時間を判定するポリシー"""
+    
+    # スロットリング・一時的なサーバーエラー
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, retry_attempts: int = 3, retry_delay: float = 1.0, max_delay: float = 30.0,
+                 jitter: bool = True, retryable_exceptions: Tuple[Type[BaseException], ...] = (OSError,),
+                 max_retry_after: float = 120.0):
+        """
+        初期化
+        
+        Args:
+            retry_attempts: 初回以降のリトライ回数
+            retry_delay: バックオフの基準待機秒数
+            max_delay: バックオフの最大待機秒数
+            jitter: ジッターを加えるか
+            retryable_exceptions: リトライ対象とする通信例外
+            max_retry_after: 従うRetry-Afterの上限秒数（超える場合はリトライしない）
+        """
+        self.retry_attempts = max(int(retry_attempts), 0)
+        self.retry_delay = float(retry_delay)
+        self.max_delay = float(max_delay)
+        self.jitter = jitter
+        self.retryable_exceptions = retryable_exceptions
+        self.max_retry_after = float(max_retry_after)
+    
+    @classmethod
+    def from_config(cls, data_processing_config: Optional[Dict], retry_config: Optional[Dict],
+                    retryable_exceptions: Tuple[Type[BaseException], ...] = (OSError,)) -> "RetryPolicy":
+        """設定辞書からリトライポリシーを作成"""
+        data_processing_config = data_processing_config or {}
+        retry_config = retry_config or {}
+        return cls(
+            retry_attempts=data_processing_config.get('retry_attempts', 3),
+            retry_delay=data_processing_config.get('retry_delay', 1),
+            max_delay=retry_config.get('max_delay', 30),
+            jitter=retry_config.get('jitter', True),
+            retryable_exceptions=retryable_exceptions,
+            max_retry_after=retry_config.get('max_retry_after', 120)
+        )
+    
+    @property
+    def max_attempts(self) -> int:
+        """初回を含む最大試行回数"""
+        return self.retry_attempts + 1
+    
+    def is_retryable(self, error: BaseException) -> bool:
+        """一時的なエラー（スロットリング・サーバーエラー・通信エラー）か判定"""
+        if isinstance(error, APIRequestError):
+            return error.status_code in self.RETRYABLE_STATUS_CODES
+        return isinstance(error, self.retryable_exceptions)
+    
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        次のリトライまでの待機秒数を計算
+        
+        Args:
+            attempt: 失敗した試行の回数（1始まり）
+            retry_after: サーバーが指定した待機秒数
+        
+        Returns:
+            待機秒数（Retry-After が max_retry_after を超える場合はNone＝リトライしない）
+        """
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None
+        
+        delay = min(self.max_delay, self.retry_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            # 同時に失敗したワーカーが一斉に再送しないよう分散させる
+            delay = random.uniform(delay / 2, delay)
+        
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        
+        return delay
+
+
+class CircuitBreaker:
+    """連続失敗時にAPI呼び出しを一時停止するサーキットブレーカー"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        初期化
+        
+        Args:
+            failure_threshold: オープンに移行する連続失敗回数
+            reset_timeout: オープン状態を維持する秒数
+        """
+        self.logger = get_logger("circuit_breaker")
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.reset_timeout = float(reset_timeout)
+        
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+    
+    @classmethod
+    def from_config(cls, circuit_breaker_config: Optional[Dict]) -> "CircuitBreaker":
+        """設定辞書からサーキットブレーカーを作成"""
+        circuit_breaker_config = circuit_breaker_config or {}
+        return cls(
+            failure_threshold=circuit_breaker_config.get('failure_threshold', 5),
+            reset_timeout=circuit_breaker_config.get('reset_timeout', 30)
+        )
+    
+    @property
+    def state(self) -> str:
+        """現在の状態"""
+        with self._lock:
+            self._update_state()
+            return self._state
+    
+    def _update_state(self):
+        """オープン期間が経過していればハーフオープンに移行"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self.logger.info("サーキットブレーカー: ハーフオープンに移行")
+    
+    def get_wait_time(self) -> float:
+        """
+        リクエストを送信できるまでの待機秒数を取得
+        
+        Returns:
+            待機秒数（クローズ・ハーフオープンの場合は0）
+        """
+        with self._lock:
+            self._update_state()
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+    
+    def check(self, max_wait: Optional[float] = None) -> float:
+        """
+        オープン中であれば待機時間を返し、上限を超える場合は例外を送出
+        
+        Args:
+            max_wait: 許容する最大待機秒数（Noneで無制限）
+        
+        Returns:
+            待機すべき秒数
+        
+        Raises:
+            CircuitOpenError: 待機時間が上限を超える場合
+        """
+        wait_time = self.get_wait_time()
+        if max_wait is not None and wait_time > max_wait:
+            raise CircuitOpenError(wait_time)
+        return wait_time
+    
+    def record_success(self):
+        """成功を記録してクローズに戻す"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                self.logger.info("サーキットブレーカー: クローズに復帰")
+            self._state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self):
+        """一時的な失敗を記録し、閾値を超えたらオープンに移行"""
+        with self._lock:
+            self._update_state()
+            self._failures += 1
+            
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.logger.warning(
+                        f"サーキットブレーカー: オープンに移行（連続失敗 {self._failures}回、{self.reset_timeout}秒停止）"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,187 @@
+"""
+バックグラウンド再検証モジュール
+スロットリング中に古いキャッシュで応答したリクエストを待ち行列に積み、
+クォータが回復した時点で再取得してキャッシュを更新する
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from src.amazon_api.exceptions import CircuitOpenError
+from src.amazon_api.rate_limiter import RateLimitExceeded
+from src.amazon_api.retry import RetryPolicy
+from src.utils.logger import get_logger
+
+
+class BackgroundRevalidator:
+    """
+    古いデータで応答したリクエストを1スレッドで順に再取得する
+    
+    同じキーの再取得は1件にまとめ、一時的なエラーで失敗した場合は待機時間を倍にして再試行する。
+    恒久的なエラー（400・403など）は再試行せずに破棄する
+    """
+    
+    # クォータ・API障害の回復を待てば成功する例外
+    RECOVERABLE_EXCEPTIONS = (CircuitOpenError, RateLimitExceeded)
+    
+    def __init__(self, fetch: Callable[[str, Dict], Dict], retry_delay: float = 5.0,
+                 max_retry_delay: float = 300.0, max_pending: int = 10000,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        初期化
+        
+        Args:
+            fetch: オペレーション名とパラメータを受け取り、取得結果をキャッシュに登録する関数
+            retry_delay: 再取得に失敗した場合の初回待機秒数
+            max_retry_delay: 再取得の待機秒数の上限
+            max_pending: 待ち行列の上限件数
+            retry_policy: 一時的なエラーの判定に使用するポリシー（Noneの場合は既定値）
+        """
+        self.logger = get_logger("revalidator")
+        self.fetch = fetch
+        self.retry_delay = max(float(retry_delay), 0.0)
+        self.max_retry_delay = max(float(max_retry_delay), self.retry_delay)
+        self.max_pending = max(int(max_pending), 1)
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._requests: Dict[str, Tuple[str, Dict, int]] = {}
+        self._sequence = itertools.count()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {'queued': 0, 'refreshed': 0, 'failed': 0, 'abandoned': 0, 'dropped': 0}
+    
+    @classmethod
+    def from_config(cls, fetch: Callable[[str, Dict], Dict], swr_config: Optional[Dict],
+                    retry_policy: Optional[RetryPolicy] = None) -> "BackgroundRevalidator":
+        """設定辞書からバックグラウンド再検証を作成"""
+        swr_config = swr_config or {}
+        return cls(
+            fetch,
+            retry_delay=swr_config.get('retry_delay', 5.0),
+            max_retry_delay=swr_config.get('max_retry_delay', 300.0),
+            max_pending=swr_config.get('max_pending', 10000),
+            retry_policy=retry_policy
+        )
+    
+    def submit(self, key: str, operation: str, params: Dict) -> bool:
+        """
+        再取得を待ち行列に登録
+        
+        Args:
+            key: 重複判定用のキー（キャッシュキー）
+            operation: オペレーション名
+            params: リクエストパラメータ
+        
+        Returns:
+            新たに登録した場合True（登録済み・上限到達の場合False）
+        """
+        with self._condition:
+            if self._closed or key in self._requests:
+                return False
+            if len(self._requests) >= self.max_pending:
+                self._stats['dropped'] += 1
+                return False
+            
+            self._requests[key] = (operation, params, 0)
+            heapq.heappush(self._heap, (time.monotonic(), next(self._sequence), key))
+            self._stats['queued'] += 1
+            self._ensure_worker()
+            self._condition.notify_all()
+            return True
+    
+    def _ensure_worker(self):
+        """再取得スレッドを起動（ロック取得中に呼び出す）"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="paapi-revalidator", daemon=True)
+            self._worker.start()
+    
+    def _is_retryable(self, error: BaseException) -> bool:
+        """再試行で成功する可能性のあるエラーか判定"""
+        return isinstance(error, self.RECOVERABLE_EXCEPTIONS) or self.retry_policy.is_retryable(error)
+    
+    def _run(self):
+        """実行時刻に達した再取得を順に実行"""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                
+                _, _, key = heapq.heappop(self._heap)
+                operation, params, failures = self._requests[key]
+            
+            try:
+                self.fetch(operation, params)
+            except Exception as e:
+                if not self._is_retryable(e):
+                    self.logger.error(f"再検証エラー: {operation} (再試行しません) - {e}")
+                    with self._condition:
+                        self._stats['abandoned'] += 1
+                        del self._requests[key]
+                        self._condition.notify_all()
+                    continue
+                
+                # クォータ回復まで待機時間を延ばして再試行
+                delay = min(self.retry_delay * (2 ** failures), self.max_retry_delay)
+                self.logger.warning(f"再検証エラー: {operation} ({delay:.1f}秒後に再試行) - {e}")
+                with self._condition:
+                    self._stats['failed'] += 1
+                    self._requests[key] = (operation, params, failures + 1)
+                    heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), key))
+                continue
+            
+            with self._condition:
+                self._stats['refreshed'] += 1
+                del self._requests[key]
+                self._condition.notify_all()
+    
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        待ち行列が空になるまで待機
+        
+        Args:
+            timeout: 最大待機秒数（Noneで無制限）
+        
+        Returns:
+            空になった場合True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._requests:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+    
+    def get_stats(self) -> Dict:
+        """
+        再検証の統計を取得
+        
+        Returns:
+            登録件数・再取得件数・失敗回数・恒久的なエラーで中止した件数・破棄件数・待ち件数
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._requests)
+            return stats
+    
+    def close(self):
+        """再取得スレッドを停止（未実行の再取得は破棄）"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
@@ -0,0 +1,159 @@
+"""
+AWS Signature Version 4 署名モジュール
+認証情報と日次署名キーをキャッシュし、リクエスト毎の署名コストを最小化する
+"""
+
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+
+# 空のリクエストボディのSHA256
+EMPTY_PAYLOAD_HASH = hashlib.sha256(b'').hexdigest()
+
+
+class SigV4Signer:
+    """認証情報・署名キーをキャッシュするSigV4署名クラス"""
+    
+    def __init__(self, credentials_provider: Callable, region: str = "us-east-1",
+                 service: str = "execute-api"):
+        """
+        初期化
+        
+        Args:
+            credentials_provider: botocore認証情報を返す関数（例: boto3.Session.get_credentials）
+            region: 署名リージョン
+            service: 署名サービス名
+        """
+        self.credentials_provider = credentials_provider
+        self.region = region
+        self.service = service
+        
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._frozen_credentials = None
+        self._signing_key_cache = {}
+    
+    def _get_frozen_credentials(self):
+        """
+        認証情報を取得（初回のみ解決し、ローテーション時のみ再取得）
+        
+        Returns:
+            アクセスキー・シークレットキー・トークンを持つ認証情報
+        """
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self.credentials_provider()
+                if self._credentials is None:
+                    raise RuntimeError("AWS認証情報が設定されていません")
+                self._frozen_credentials = self._credentials.get_frozen_credentials()
+            
+            # 一時認証情報は期限が近づいた場合のみ更新
+            elif getattr(self._credentials, 'refresh_needed', lambda: False)():
+                self._frozen_credentials = self._credentials.get_frozen_credentials()
+            
+            return self._frozen_credentials
+    
+    def _get_signing_key(self, secret_key: str, datestamp: str) -> Tuple[bytes, str]:
+        """
+        日次署名キーと認証スコープを取得（日付・キーごとにキャッシュ）
+        
+        Args:
+            secret_key: シークレットキー
+            datestamp: 日付（YYYYMMDD）
+        
+        Returns:
+            署名キーと認証スコープ
+        """
+        cache_key = (secret_key, datestamp)
+        cached = self._signing_key_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        k_date = hmac.new(f"AWS4{secret_key}".encode('utf-8'), datestamp.encode('utf-8'), hashlib.sha256).digest()
+        k_region = hmac.new(k_date, self.region.encode('utf-8'), hashlib.sha256).digest()
+        k_service = hmac.new(k_region, self.service.encode('utf-8'), hashlib.sha256).digest()
+        k_signing = hmac.new(k_service, b'aws4_request', hashlib.sha256).digest()
+        scope = f"{datestamp}/{self.region}/{self.service}/aws4_request"
+        
+        # 日付が変わったら古いキーは不要
+        self._signing_key_cache = {cache_key: (k_signing, scope)}
+        return k_signing, scope
+    
+    @staticmethod
+    def canonical_query_string(params: Optional[Dict]) -> str:
+        """SigV4の正規化クエリ文字列を生成（送信するクエリとしてもそのまま使用）"""
+        if not params:
+            return ''
+        
+        pairs = sorted(
+            (quote(str(key), safe='-_.~'), quote(str(value), safe='-_.~'))
+            for key, value in params.items()
+        )
+        return '&'.join(f"{key}={value}" for key, value in pairs)
+    
+    def sign(self, method: str, url: str, params: Optional[Dict] = None,
+             now: Optional[datetime] = None) -> Tuple[str, Dict[str, str]]:
+        """
+        リクエストに署名
+        
+        Args:
+            method: HTTPメソッド
+            url: クエリを含まないリクエストURL
+            params: クエリパラメータ
+            now: 署名時刻（テスト用、Noneの場合は現在時刻）
+        
+        Returns:
+            署名に用いたクエリ付きURLと署名済みヘッダー
+        """
+        credentials = self._get_frozen_credentials()
+        
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        signing_key, scope = self._get_signing_key(credentials.secret_key, amz_date[:8])
+        
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        if parts.port and not ((parts.scheme == 'https' and parts.port == 443) or
+                               (parts.scheme == 'http' and parts.port == 80)):
+            host = f"{host}:{parts.port}"
+        query = self.canonical_query_string(params)
+        
+        if credentials.token:
+            canonical_headers = f"host:{host}\nx-amz-date:{amz_date}\nx-amz-security-token:{credentials.token}\n"
+            signed_headers = 'host;x-amz-date;x-amz-security-token'
+        else:
+            canonical_headers = f"host:{host}\nx-amz-date:{amz_date}\n"
+            signed_headers = 'host;x-amz-date'
+        
+        canonical_request = '\n'.join((
+            method.upper(),
+            quote(parts.path or '/', safe='/~'),
+            query,
+            canonical_headers,
+            signed_headers,
+            EMPTY_PAYLOAD_HASH
+        ))
+        string_to_sign = '\n'.join((
+            'AWS4-HMAC-SHA256',
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+        ))
+        signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+        
+        headers = {
+            'X-Amz-Date': amz_date,
+            'Authorization': (
+                f"AWS4-HMAC-SHA256 Credential={credentials.access_key}/{scope}, "
+                f"SignedHeaders={signed_headers}, Signature={signature}"
+            )
+        }
+        if credentials.token:
+            headers['X-Amz-Security-Token'] = credentials.token
+        
+        signed_url = f"{url}?{query}" if query else url
+        return signed_url, headers
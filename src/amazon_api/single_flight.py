@@ -0,0 +1,294 @@
+"""
+GetItems リクエスト集約モジュール
+同時に要求された同一ASINの取得を1回にまとめ、単発の要求を10件単位のバッチに統合する
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+from src.amazon_api.client import get_amazon_client
+from src.amazon_api.quota import RequestAccounting
+from src.utils.config import config_manager
+from src.utils.logger import get_logger
+
+
+class CoalescingItemFetcher:
+    """
+    クライアントの get_items の前段に置くシングルフライト層
+    
+    取得中のASINへの要求は新たに送信せず取得中の結果を待ち、
+    待機中の要求はバッチ待機時間内に10件単位のGetItemsへまとめて送信する。
+    集約・バッチ化は解決後のリソース一覧とジョブ（RequestAccounting.job）が同じ要求に限り、
+    送信は要求元のコンテキストで実行する
+    """
+    
+    def __init__(self, client, batch_window: float = 0.05, batch_size: int = 10):
+        """
+        初期化
+        
+        Args:
+            client: get_items(asins, resources) を持つAmazon APIクライアント
+            batch_window: 最初の要求からバッチを送信するまでの最大待機秒数
+            batch_size: 1バッチのASIN数（PA-APIの上限は10）
+        """
+        self.logger = get_logger("single_flight")
+        self.client = client
+        self.batch_window = max(float(batch_window), 0.0)
+        self.batch_size = min(max(int(batch_size), 1), client.GET_ITEMS_MAX_IDS)
+        
+        self._condition = threading.Condition()
+        self._pending: Dict[Tuple[str, Hashable], Future] = {}
+        self._queue: List[Tuple[str, Hashable, float, contextvars.Context]] = []
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {'requested': 0, 'coalesced': 0, 'batches': 0}
+    
+    @classmethod
+    def from_config(cls, client, single_flight_config: Optional[Dict]) -> "CoalescingItemFetcher":
+        """設定辞書からリクエスト集約層を作成"""
+        single_flight_config = single_flight_config or {}
+        return cls(
+            client,
+            batch_window=single_flight_config.get('batch_window', 0.05),
+            batch_size=single_flight_config.get('batch_size', 10)
+        )
+    
+    @staticmethod
+    def _resources_key(resources: Optional[Union[str, List[str]]]) -> Hashable:
+        """リソース指定をハッシュ可能なキーに変換"""
+        if resources is None or isinstance(resources, str):
+            return resources
+        return tuple(resources)
+    
+    def _group_key(self, resources: Optional[Union[str, List[str]]]) -> Tuple[Hashable, str]:
+        """
+        要求をまとめるキーを作成（要求元のスレッドで呼び出す）
+        
+        リソース未指定時はジョブごとにプロファイルが異なり、リクエスト記録もジョブ別のため、
+        解決後のリソース一覧と実行中のジョブ名の組をキーとする
+        
+        Args:
+            resources: リソースプロファイル名またはリソース一覧
+        
+        Returns:
+            リソース指定キーとジョブ名
+        """
+        accounting = getattr(self.client, 'request_accounting', None) or RequestAccounting
+        resolve_resources = getattr(self.client, '_resolve_resources', None)
+        if resolve_resources is not None:
+            resources = resolve_resources(resources)
+        return self._resources_key(resources), accounting.current_job()
+    
+    def get_items(self, asins: List[str], resources: Optional[Union[str, List[str]]] = None,
+                  timeout: Optional[float] = None) -> Dict:
+        """
+        商品詳細情報を取得（同時要求は集約）
+        
+        Args:
+            asins: ASINリスト
+            resources: リソースプロファイル名またはリソース一覧
+            timeout: 結果を待つ最大秒数（Noneで無制限）
+        
+        Returns:
+            商品詳細情報（ASIN単位のエラーは Errors、ネガティブキャッシュで除外したASINは
+            SuppressedItemIds、古いキャッシュから返した商品は Stale に格納）
+        """
+        try:
+            group_key = self._group_key(resources)
+            context = contextvars.copy_context()
+            unique_asins = list(dict.fromkeys(asins))
+            futures = []
+            
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("リクエスト集約層は終了しています")
+                self._ensure_worker()
+                
+                for asin in unique_asins:
+                    key = (asin, group_key)
+                    future = self._pending.get(key)
+                    if future is None:
+                        future = Future()
+                        self._pending[key] = future
+                        self._queue.append((asin, group_key, time.monotonic(), context))
+                        self._stats['requested'] += 1
+                    else:
+                        # 取得中の結果を共有
+                        self._stats['coalesced'] += 1
+                    futures.append(future)
+                
+                self._condition.notify_all()
+            
+            items = []
+            errors = []
+            suppressed = []
+            stale = {}
+            for asin, future in zip(unique_asins, futures):
+                item, error, item_stale, is_suppressed = future.result(timeout)
+                if item is not None:
+                    items.append(item)
+                if error is not None and not any(error is seen for seen in errors):
+                    errors.append(error)
+                if is_suppressed:
+                    suppressed.append(asin)
+                if item_stale is not None:
+                    stale[asin] = item_stale
+            
+            result = {'ItemsResult': {'Items': items, 'TotalResultCount': len(items)}}
+            if errors:
+                result['Errors'] = errors
+            if suppressed:
+                result['SuppressedItemIds'] = suppressed
+            if stale:
+                oldest = min(stale.values(), key=lambda value: value['StoredAt'])
+                result['Stale'] = {**oldest, 'ItemIds': list(stale)}
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"集約商品詳細取得エラー: {e}")
+            return {}
+    
+    def _ensure_worker(self):
+        """バッチ送信スレッドを起動（ロック取得中に呼び出す）"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="paapi-single-flight", daemon=True)
+            self._worker.start()
+    
+    def _run(self):
+        """待機中の要求をバッチにまとめて送信"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                
+                # バッチが埋まるか、最も古い要求の待機時間が過ぎるまで待つ
+                deadline = self._queue[0][2] + self.batch_window
+                while not self._closed and len(self._queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                group_key, batch, context = self._take_batch()
+            
+            self._dispatch(group_key, batch, context)
+    
+    def _take_batch(self) -> Tuple[Tuple[Hashable, str], List[str], contextvars.Context]:
+        """
+        先頭の要求と同じリソース指定・ジョブの要求を最大バッチサイズ分取り出す（ロック取得中に呼び出す）
+        
+        Returns:
+            集約キー・ASINリスト・送信に使う先頭の要求元のコンテキスト
+        """
+        group_key = self._queue[0][1]
+        context = self._queue[0][3]
+        batch = []
+        remaining = []
+        for entry in self._queue:
+            if entry[1] == group_key and len(batch) < self.batch_size:
+                batch.append(entry[0])
+            else:
+                remaining.append(entry)
+        self._queue = remaining
+        return group_key, batch, context
+    
+    def _dispatch(self, group_key: Tuple[Hashable, str], batch: List[str], context: contextvars.Context):
+        """
+        バッチを送信し、各ASINの待機者に結果を配布
+        
+        Args:
+            group_key: 集約キー（リソース指定キーとジョブ名）
+            batch: ASINリスト
+            context: 要求元のコンテキスト（同じジョブの要求のみをまとめるため、バッチ内で共通）
+        """
+        resources_key = group_key[0]
+        resources = list(resources_key) if isinstance(resources_key, tuple) else resources_key
+        with self._condition:
+            self._stats['batches'] += 1
+            futures = [self._pending[(asin, group_key)] for asin in batch]
+        
+        try:
+            result = context.run(self.client.get_items, batch, resources)
+            if not result:
+                raise RuntimeError("GetItemsの取得に失敗しました")
+            items_by_asin = {
+                item.get('ASIN'): item for item in result.get('ItemsResult', {}).get('Items', [])
+            }
+            errors = result.get('Errors', [])
+            suppressed = set(result.get('SuppressedItemIds', []))
+            stale = result.get('Stale')
+            stale_asins = set(stale.get('ItemIds', items_by_asin)) if stale is not None else set()
+            outcomes = [
+                (
+                    items_by_asin.get(asin),
+                    None if asin in items_by_asin or asin in suppressed else self._find_error(asin, errors),
+                    {key: value for key, value in stale.items() if key != 'ItemIds'}
+                    if asin in stale_asins and asin in items_by_asin else None,
+                    asin in suppressed
+                )
+                for asin in batch
+            ]
+        except Exception as e:
+            self.logger.error(f"バッチ送信エラー: {e}")
+            outcomes = [(None, {'Code': type(e).__name__, 'Message': str(e), 'ItemIds': batch}, None, False)] * len(batch)
+        
+        # 結果確定後の要求は新たに取得する（以降の再利用はレスポンスキャッシュに任せる）
+        with self._condition:
+            for asin in batch:
+                self._pending.pop((asin, group_key), None)
+        for future, outcome in zip(futures, outcomes):
+            future.set_result(outcome)
+    
+    @staticmethod
+    def _find_error(asin: str, errors: List[Dict]) -> Optional[Dict]:
+        """ASINに該当するエラーを検索"""
+        for error in errors:
+            if asin in error.get('ItemIds', []) or asin in error.get('Message', ''):
+                return error
+        return None
+    
+    def get_stats(self) -> Dict:
+        """
+        集約の統計を取得
+        
+        Returns:
+            送信対象ASIN数・集約されたASIN数・送信バッチ数
+        """
+        with self._condition:
+            return dict(self._stats)
+    
+    def close(self):
+        """待機中の要求を送信し終えてからバッチ送信スレッドを停止"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+
+
+# グローバルリクエスト集約インスタンス（初回利用時に生成）
+_coalescing_item_fetcher = None
+_coalescing_item_fetcher_lock = threading.Lock()
+
+
+def get_coalescing_item_fetcher() -> CoalescingItemFetcher:
+    """
+    グローバルクライアントを共有するリクエスト集約層を取得（初回呼び出し時に生成）
+    
+    Returns:
+        CoalescingItemFetcherインスタンス
+    """
+    global _coalescing_item_fetcher
+    if _coalescing_item_fetcher is None:
+        with _coalescing_item_fetcher_lock:
+            if _coalescing_item_fetcher is None:
+                _coalescing_item_fetcher = CoalescingItemFetcher.from_config(
+                    get_amazon_client(),
+                    config_manager.get_amazon_config().get('single_flight', {})
+                )
+    return _coalescing_item_fetcher
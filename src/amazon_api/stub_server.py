@@ -0,0 +1,352 @@
+"""
+PA-API スタブHTTPサーバー
+/paapi5/searchitems・getitems・getsimilaritems を模擬し、実クライアントの
+署名・HTTP・JSONデコードを含む経路をローカルで検証する
+
+モード:
+    synthetic: モックの合成カタログから応答
+    replay: 記録済みの応答を返す
+    record: 上流クライアント（実API）に転送し、応答を記録
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from src.amazon_api.exceptions import APIRequestError
+from src.amazon_api.mock_client import MockAmazonAPIClient
+from src.amazon_api.rate_limiter import TokenBucketRateLimiter
+from src.amazon_api.response_cache import ResponseCache
+from src.utils.logger import get_logger
+
+
+# 記録キーに含めないパラメータ（アカウント固有の値）
+RECORDING_IGNORED_PARAMS = ('PartnerTag', 'PartnerType')
+
+OPERATIONS = ('searchitems', 'getitems', 'getsimilaritems')
+
+
+def make_recording_key(operation: str, params: Dict) -> str:
+    """
+    記録済み応答の照合キーを生成（レスポンスキャッシュと同じ正規化）
+    
+    Args:
+        operation: オペレーション名
+        params: リクエストパラメータ
+    
+    Returns:
+        照合キー
+    """
+    return ResponseCache.make_key(operation, params, RECORDING_IGNORED_PARAMS)
+
+
+def _error_body(code: str, message: str) -> Dict:
+    """PA-API形式のエラー応答本文"""
+    return {'Errors': [{'Code': code, 'Message': message}]}
+
+
+class PAAPIStubServer:
+    """PA-APIスタブHTTPサーバー"""
+    
+    MODES = ('synthetic', 'replay', 'record')
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, mode: str = 'synthetic',
+                 recordings_path: Optional[str] = None, mock_client: Optional[MockAmazonAPIClient] = None,
+                 upstream_client=None, rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 require_signature: bool = True, max_request_log: int = 100000):
+        """
+        初期化
+        
+        Args:
+            host: 待ち受けホスト
+            port: 待ち受けポート（0の場合は空きポート）
+            mode: 応答モード（synthetic / replay / record）
+            recordings_path: 記録ファイル（JSON Lines）のパス
+            mock_client: syntheticモードで使用するモッククライアント
+            upstream_client: recordモードの転送先（fetch_uncached を持つ実クライアント）
+            rate_limiter: PA-API相当のレート制限（Noneの場合は制限なし）
+            require_signature: SigV4のAuthorizationヘッダーを必須とするか
+            max_request_log: 保持するリクエスト記録の上限件数
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"未対応のモードです: {mode}")
+        if mode in ('replay', 'record') and not recordings_path:
+            raise ValueError(f"{mode}モードには記録ファイルの指定が必要です")
+        if mode == 'record' and upstream_client is None:
+            raise ValueError("recordモードには転送先クライアントの指定が必要です")
+        
+        self.logger = get_logger("paapi_stub")
+        self.mode = mode
+        self.recordings_path = recordings_path
+        self.upstream_client = upstream_client
+        self.rate_limiter = rate_limiter
+        self.require_signature = require_signature
+        
+        self._lock = threading.Lock()
+        self._request_log = deque(maxlen=max_request_log)
+        self._recordings: Dict[str, Tuple[int, Dict]] = {}
+        if mode == 'synthetic':
+            self.mock_client = mock_client or MockAmazonAPIClient()
+        else:
+            self.mock_client = None
+            self._load_recordings()
+        
+        self._httpd = ThreadingHTTPServer((host, port), self._create_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """クライアントの amazon.base_url に指定するURL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/paapi5"
+    
+    def start(self) -> "PAAPIStubServer":
+        """バックグラウンドスレッドで待ち受けを開始"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="paapi-stub", daemon=True)
+        self._thread.start()
+        self.logger.info(f"PA-APIスタブサーバーを起動しました: {self.base_url} (mode={self.mode})")
+        return self
+    
+    def stop(self):
+        """待ち受けを停止"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self.logger.info("PA-APIスタブサーバーを停止しました")
+    
+    def __enter__(self) -> "PAAPIStubServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def _load_recordings(self):
+        """記録ファイルを読み込み"""
+        if not os.path.exists(self.recordings_path):
+            return
+        
+        with open(self.recordings_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = make_recording_key(record['operation'], record['params'])
+                self._recordings[key] = (record.get('status', 200), record['body'])
+        self.logger.info(f"記録済み応答を読み込みました: {len(self._recordings)}件")
+    
+    def _save_recording(self, operation: str, params: Dict, status: int, body: Dict):
+        """応答を記録ファイルに追記"""
+        record = {'operation': operation, 'params': params, 'status': status, 'body': body}
+        with self._lock:
+            self._recordings[make_recording_key(operation, params)] = (status, body)
+            directory = os.path.dirname(self.recordings_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.recordings_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    
+    def handle_request(self, operation: str, params: Dict, headers: Dict) -> Tuple[int, Dict]:
+        """
+        リクエストを処理して応答を生成
+        
+        Args:
+            operation: オペレーション名
+            params: クエリパラメータ
+            headers: リクエストヘッダー
+        
+        Returns:
+            ステータスコードと応答本文
+        """
+        if operation not in OPERATIONS:
+            return 404, _error_body('UnknownOperation', f"Unknown operation: {operation}")
+        
+        if self.require_signature and not headers.get('Authorization', '').startswith('AWS4-HMAC-SHA256 '):
+            return 401, _error_body('IncompleteSignature', 'The request signature does not conform to AWS standards.')
+        
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            return 429, _error_body('TooManyRequests', 'The request was denied due to request throttling.')
+        
+        if self.mode == 'synthetic':
+            return 200, self._build_synthetic_response(operation, params)
+        
+        key = make_recording_key(operation, params)
+        recording = self._recordings.get(key)
+        if recording is not None:
+            return recording
+        if self.mode == 'replay':
+            return 404, _error_body('RecordingNotFound', f"No recorded response for {key}")
+        
+        # recordモード: パートナータグを上流の設定に差し替え、キャッシュを経由せずに転送して記録
+        upstream_params = dict(params)
+        upstream_params['PartnerTag'] = self.upstream_client.config.get('associate_tag')
+        try:
+            body = self.upstream_client.fetch_uncached(operation, upstream_params)
+            status = 200
+        except APIRequestError as e:
+            status = e.status_code
+            try:
+                body = json.loads(e.body)
+            except (TypeError, ValueError):
+                body = _error_body(f"HTTP{e.status_code}", str(e.body))
+        self._save_recording(operation, params, status, body)
+        return status, body
+    
+    def _build_synthetic_response(self, operation: str, params: Dict) -> Dict:
+        """モックの合成カタログから応答を生成"""
+        resources = params['Resources'].split(',') if params.get('Resources') else None
+        if operation == 'searchitems':
+            return self.mock_client.build_search_result(
+                params.get('Keywords', ''),
+                params.get('SearchIndex', 'All'),
+                int(params.get('ItemCount', 10)),
+                resources,
+                int(params.get('ItemPage', 1))
+            )
+        if operation == 'getitems':
+            asins = [asin for asin in params.get('ItemIds', '').split(',') if asin]
+            return self.mock_client.build_items_result(asins, resources)
+        return self.mock_client.build_similar_result(
+            params.get('ItemId', ''),
+            int(params.get('ItemCount', 10)),
+            resources
+        )
+    
+    def record_timing(self, operation: str, status: int, started_at: float, duration: float, size: int):
+        """リクエストの処理時間を記録"""
+        with self._lock:
+            self._request_log.append({
+                'operation': operation,
+                'status': status,
+                'started_at': started_at,
+                'duration_ms': round(duration * 1000, 3),
+                'bytes': size
+            })
+    
+    def get_request_log(self) -> List[Dict]:
+        """
+        リクエストの記録を取得
+        
+        Returns:
+            オペレーション・ステータス・開始時刻・処理時間・応答サイズのリスト
+        """
+        with self._lock:
+            return list(self._request_log)
+    
+    def get_stats(self) -> Dict:
+        """
+        リクエストの集計を取得
+        
+        Returns:
+            件数・ステータス別件数・処理時間のパーセンタイル（ミリ秒）・秒間リクエスト数
+        """
+        request_log = self.get_request_log()
+        if not request_log:
+            return {'requests': 0}
+        
+        durations = sorted(record['duration_ms'] for record in request_log)
+        statuses: Dict[int, int] = {}
+        for record in request_log:
+            statuses[record['status']] = statuses.get(record['status'], 0) + 1
+        
+        elapsed = request_log[-1]['started_at'] - request_log[0]['started_at']
+        
+        def percentile(ratio: float) -> float:
+            return durations[min(int(len(durations) * ratio), len(durations) - 1)]
+        
+        return {
+            'requests': len(request_log),
+            'statuses': statuses,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'requests_per_second': round(len(request_log) / elapsed, 2) if elapsed > 0 else None
+        }
+    
+    def _create_handler(self):
+        """このサーバーに紐付いたリクエストハンドラークラスを作成"""
+        server = self
+        
+        class PAAPIStubHandler(BaseHTTPRequestHandler):
+            """PA-APIスタブのリクエストハンドラー"""
+            
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                started_at = time.time()
+                start = time.perf_counter()
+                
+                parts = urlsplit(self.path)
+                operation = parts.path.rstrip('/').rsplit('/', 1)[-1].lower()
+                params = dict(parse_qsl(parts.query, keep_blank_values=True))
+                
+                try:
+                    status, body = server.handle_request(operation, params, dict(self.headers))
+                except Exception as e:
+                    server.logger.error(f"スタブ応答生成エラー: {e}")
+                    status, body = 500, _error_body('InternalFailure', str(e))
+                
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                
+                server.record_timing(operation, status, started_at, time.perf_counter() - start, len(payload))
+            
+            def log_message(self, format, *args):
+                # アクセスログはリクエスト記録で代替
+                pass
+        
+        return PAAPIStubHandler
+
+
+def main():
+    """コマンドラインからスタブサーバーを起動"""
+    parser = argparse.ArgumentParser(description="PA-API スタブHTTPサーバー")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--mode', choices=PAAPIStubServer.MODES, default='synthetic')
+    parser.add_argument('--recordings', help="記録ファイル（JSON Lines）のパス")
+    parser.add_argument('--catalog-size', type=int, default=0, help="合成カタログの件数")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--tps', type=float, default=1.0, help="秒間リクエスト数の上限（0で無制限）")
+    parser.add_argument('--burst', type=int, default=1)
+    args = parser.parse_args()
+    
+    mock_client = None
+    upstream_client = None
+    if args.mode == 'synthetic':
+        mock_client = MockAmazonAPIClient(catalog_size=args.catalog_size, seed=args.seed)
+    elif args.mode == 'record':
+        from src.amazon_api.client import get_amazon_client
+        upstream_client = get_amazon_client()
+    
+    rate_limiter = TokenBucketRateLimiter(tps=args.tps, burst=args.burst, tpd=None) if args.tps > 0 else None
+    server = PAAPIStubServer(
+        host=args.host,
+        port=args.port,
+        mode=args.mode,
+        recordings_path=args.recordings,
+        mock_client=mock_client,
+        upstream_client=upstream_client,
+        rate_limiter=rate_limiter
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(60)
+            print(json.dumps(server.get_stats(), ensure_ascii=False))
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+合成カタログモジュール
+負荷試験用に、シード指定で再現可能な大規模商品カタログを遅延生成する
+"""
+
+import random
+from typing import Dict, Iterator, Optional, Tuple
+
+
+# ブランド・カテゴリ・価格帯（円）
+BRAND_CATALOG = (
+    ('Apple', ('iPhone', 'iPad', 'AirPods', 'MacBook Air', 'Apple Watch'), (19800, 249800)),
+    ('Sony', ('ワイヤレスヘッドホン', 'ミラーレス一眼カメラ', 'Bluetoothスピーカー', 'ブラビア 4K液晶テレビ'), (6980, 198000)),
+    ('Nintendo', ('Nintendo Switch', 'Joy-Con', 'Proコントローラー', 'amiibo'), (1650, 37980)),
+    ('Panasonic', ('ドライヤー ナノケア', 'ラムダッシュ 電気シェーバー', 'スチームオーブンレンジ', '電動アシスト自転車'), (4980, 158000)),
+    ('Anker', ('モバイルバッテリー', 'USB-C 急速充電器', 'ワイヤレスイヤホン', 'ポータブル電源'), (1490, 89900)),
+    ('Logicool', ('ワイヤレスマウス', 'メカニカルキーボード', 'Webカメラ', 'ゲーミングヘッドセット'), (1980, 29800)),
+    ('SHARP', ('プラズマクラスター 空気清浄機', 'AQUOS 液晶テレビ', 'ヘルシオ ホットクック'), (9800, 168000)),
+    ('アイリスオーヤマ', ('サーキュレーター', 'LEDシーリングライト', '布団乾燥機', '電気ケトル'), (1980, 39800)),
+    ('象印', ('電気ポット', '圧力IH炊飯器', 'ステンレスマグ', 'ホットプレート'), (2480, 69800)),
+    ('無印良品', ('ポリプロピレン収納ケース', 'アロマディフューザー', 'ステンレスハンガー'), (390, 6990)),
+)
+
+COLORS = ('ブラック', 'ホワイト', 'シルバー', 'ブルー', 'レッド', 'グレー', 'ゴールド', 'グリーン')
+
+FEATURES = (
+    '長時間バッテリー', '急速充電対応', '軽量コンパクト設計', '1年間メーカー保証',
+    '省エネ設計', 'Bluetooth 5.3対応', '日本語説明書付き', '防水・防塵対応'
+)
+
+# 在庫メッセージと出現比率
+AVAILABILITY_MESSAGES = (
+    ('在庫あり。', 70),
+    ('残り3点 ご注文はお早めに', 8),
+    ('通常1～2週間以内に発送します。', 10),
+    ('一時的に在庫切れ; 入荷時期は未定です。', 8),
+    ('お取り寄せ', 4),
+)
+
+_MASK64 = (1 << 64) - 1
+_MODEL_LETTERS = 'ABCDEFGHKLMNPRSTX'
+
+
+def _mix64(value: int) -> int:
+    """整数を64bitハッシュに変換（SplitMix64のミキサー）"""
+    z = (value + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+# 合成ASINの接頭辞（実在ASINと区別するため）
+SYNTHETIC_ASIN_PREFIX = 'BZ'
+_ASIN_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_ASIN_BODY_LENGTH = 8
+
+
+class SyntheticCatalog:
+    """
+    シード指定で再現可能な合成商品カタログ
+    
+    各商品はインデックスとシードのみから都度生成するため、
+    件数（数百万件）に関わらずメモリ使用量は一定
+    """
+    
+    def __init__(self, size: int, seed: int = 0):
+        """
+        初期化
+        
+        Args:
+            size: 商品件数
+            seed: 乱数シード
+        """
+        if size < 0 or size > len(_ASIN_DIGITS) ** _ASIN_BODY_LENGTH:
+            raise ValueError(f"カタログ件数が範囲外です: {size}")
+        self.size = int(size)
+        self.seed = int(seed)
+        
+        self._availability_messages = [message for message, _ in AVAILABILITY_MESSAGES]
+        self._availability_weights = [weight for _, weight in AVAILABILITY_MESSAGES]
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def asin_at(self, index: int) -> str:
+        """インデックスに対応するASINを生成"""
+        body = []
+        for _ in range(_ASIN_BODY_LENGTH):
+            index, digit = divmod(index, len(_ASIN_DIGITS))
+            body.append(_ASIN_DIGITS[digit])
+        return SYNTHETIC_ASIN_PREFIX + ''.join(reversed(body))
+    
+    def index_of(self, asin: str) -> Optional[int]:
+        """
+        ASINに対応するインデックスを取得
+        
+        Args:
+            asin: ASIN
+        
+        Returns:
+            インデックス（カタログ外のASINの場合はNone）
+        """
+        if len(asin) != len(SYNTHETIC_ASIN_PREFIX) + _ASIN_BODY_LENGTH or not asin.startswith(SYNTHETIC_ASIN_PREFIX):
+            return None
+        
+        index = 0
+        for char in asin[len(SYNTHETIC_ASIN_PREFIX):]:
+            digit = _ASIN_DIGITS.find(char)
+            if digit < 0:
+                return None
+            index = index * len(_ASIN_DIGITS) + digit
+        return index if index < self.size else None
+    
+    def _rng(self, index: int) -> random.Random:
+        """インデックス固有の乱数生成器"""
+        return random.Random(self.seed * 1_000_003 + index)
+    
+    def _draw_title(self, index: int) -> Tuple[str, str, int]:
+        """
+        ブランド・タイトル・ブランド番号を生成
+        
+        検索インデックス作成時に全件分呼ばれるため、乱数生成器を作らず
+        1回のハッシュ値から各要素を取り出す
+        """
+        value = _mix64(self.seed * 1_000_003 + index)
+        value, brand_index = divmod(value, len(BRAND_CATALOG))
+        brand, products, _ = BRAND_CATALOG[brand_index]
+        value, product_index = divmod(value, len(products))
+        value, letter_index = divmod(value, len(_MODEL_LETTERS))
+        value, model_number = divmod(value, 999)
+        color_index = value % len(COLORS)
+        title = f"{brand} {products[product_index]} {_MODEL_LETTERS[letter_index]}{model_number + 1} {COLORS[color_index]}"
+        return brand, title, brand_index
+    
+    def title_at(self, index: int) -> Tuple[str, str]:
+        """
+        商品全体を生成せずにタイトルとブランドを取得（検索用）
+        
+        Args:
+            index: インデックス
+        
+        Returns:
+            タイトルとブランド
+        """
+        brand, title, _ = self._draw_title(index)
+        return title, brand
+    
+    def get_item(self, index: int) -> Dict:
+        """
+        インデックスの商品をPA-APIと同じ構造で生成
+        
+        Args:
+            index: インデックス
+        
+        Returns:
+            商品データ
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"カタログ範囲外のインデックスです: {index}")
+        
+        brand, title, brand_index = self._draw_title(index)
+        rng = self._rng(index)
+        low, high = BRAND_CATALOG[brand_index][2]
+        
+        # 定価は末尾を80円・00円に丸めた現実的な価格
+        list_price = max(int(rng.uniform(low, high)) // 100 * 100 - rng.choice((0, 20)), low)
+        discount_rate = 0 if rng.random() < 0.6 else rng.randint(5, 50)
+        current_price = max(list_price * (100 - discount_rate) // 100 // 10 * 10, 1)
+        
+        rating = round(min(max(rng.gauss(4.1, 0.45), 1.0), 5.0), 1)
+        review_count = int(rng.lognormvariate(4.0, 1.6))
+        availability = rng.choices(self._availability_messages, self._availability_weights)[0]
+        features = rng.sample(FEATURES, 3)
+        asin = self.asin_at(index)
+        
+        return {
+            "ASIN": asin,
+            "ItemInfo": {
+                "Title": {"DisplayValue": title},
+                "ByLineInfo": {"Brand": {"DisplayValue": brand}},
+                "Features": {"DisplayValues": features}
+            },
+            "Offers": {
+                "CurrentPrice": {"Amount": current_price, "Currency": "JPY"},
+                "ListPrice": {"Amount": list_price, "Currency": "JPY"},
+                "Availability": {"Message": availability}
+            },
+            "CustomerReviews": {
+                "Rating": rating,
+                "ReviewCount": review_count
+            },
+            "Images": {
+                "Primary": {
+                    "Large": {"URL": f"https://m.media-amazon.com/images/I/{asin}._AC_SL1500_.jpg"}
+                }
+            }
+        }
+    
+    def get_item_by_asin(self, asin: str) -> Optional[Dict]:
+        """ASINの商品を生成（カタログ外の場合はNone）"""
+        index = self.index_of(asin)
+        return None if index is None else self.get_item(index)
+    
+    def iter_items(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        """
+        商品を順に生成
+        
+        Args:
+            start: 開始インデックス
+            stop: 終了インデックス（Noneの場合は末尾）
+        
+        Yields:
+            商品データ
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        for index in range(start, stop):
+            yield self.get_item(index)
+    
+    def iter_get_items_responses(self, batch_size: int = 10) -> Iterator[Dict]:
+        """
+        カタログ全体をGetItemsレスポンス形式で順に生成（ベンチマーク用）
+        
+        Args:
+            batch_size: 1レスポンスあたりの商品数
+        
+        Yields:
+            GetItemsレスポンス
+        """
+        for start in range(0, self.size, batch_size):
+            items = list(self.iter_items(start, start + batch_size))
+            yield {"ItemsResult": {"Items": items, "TotalResultCount": len(items)}}
@@ -3,10 +3,37 @@ Amazonデータ処理モジュール
 取得したAmazon商品データを正規化・加工する機能を提供
 """
 
+import gzip
+import io
+import itertools
 import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+from typing import Dict, FrozenSet, IO, Iterable, Iterator, List, Optional, Any, Tuple, Union
+from src.amazon_api.resources import get_covered_fields
+from src.data_processor.normalized_item import NormalizedItem
+from src.utils.config import config_manager
 from src.utils.logger import get_logger
+from src.utils.timestamps import now_epoch_ms, to_epoch_ms
+
+try:
+    import zstandard
+except ImportError:  # zstd圧縮を使用しない場合は不要
+    zstandard = None
+
+
+# 正規化データの列（NormalizedItem のフィールドと同順）
+NORMALIZED_COLUMNS = NormalizedItem.__slots__
+
+# JSON Lines形式で保存するファイルの拡張子（圧縮拡張子を除く）
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+# 拡張子から判定する圧縮形式
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
 
 
 class AmazonDataProcessor:
@@ -16,24 +43,28 @@ class AmazonDataProcessor:
         """初期化"""
         self.logger = get_logger("data_processor")
     
-    def normalize_search_result(self, search_result: Dict) -> List[Dict]:
+    def normalize_search_result(self, search_result: Dict,
+                                resources: Optional[Union[str, List[str]]] = None) -> List[NormalizedItem]:
         """
         検索結果を正規化
         
         Args:
             search_result: Amazon API検索結果
+            resources: 取得時に指定したリソース（指定外のフィールドはNone）
             
         Returns:
-            正規化された商品データリスト
+            正規化された商品データリスト（辞書と同じキーで参照できる NormalizedItem）
         """
         try:
             normalized_items = []
+            covered_fields = get_covered_fields(resources)
+            processed_at = now_epoch_ms()
             
             # 検索結果から商品リストを取得
             items = search_result.get('SearchResult', {}).get('Items', [])
             
             for item in items:
-                normalized_item = self._normalize_item(item)
+                normalized_item = self._normalize_item(item, covered_fields, processed_at)
                 if normalized_item:
                     normalized_items.append(normalized_item)
             
@@ -44,24 +75,28 @@ class AmazonDataProcessor:
             self.logger.error(f"検索結果正規化エラー: {e}")
             return []
     
-    def normalize_items_result(self, items_result: Dict) -> List[Dict]:
+    def normalize_items_result(self, items_result: Dict,
+                               resources: Optional[Union[str, List[str]]] = None) -> List[NormalizedItem]:
         """
         商品詳細結果を正規化
         
         Args:
             items_result: Amazon API商品詳細結果
+            resources: 取得時に指定したリソース（指定外のフィールドはNone）
             
         Returns:
-            正規化された商品データリスト
+            正規化された商品データリスト（辞書と同じキーで参照できる NormalizedItem）
         """
         try:
             normalized_items = []
+            covered_fields = get_covered_fields(resources)
+            processed_at = now_epoch_ms()
             
             # 商品詳細結果から商品リストを取得
             items = items_result.get('ItemsResult', {}).get('Items', [])
             
             for item in items:
-                normalized_item = self._normalize_item(item)
+                normalized_item = self._normalize_item(item, covered_fields, processed_at)
                 if normalized_item:
                     normalized_items.append(normalized_item)
             
@@ -72,15 +107,379 @@ class AmazonDataProcessor:
             self.logger.error(f"商品詳細結果正規化エラー: {e}")
             return []
     
-    def _normalize_item(self, item: Dict) -> Optional[Dict]:
+    def normalize_search_result_frame(self, search_result: Dict,
+                                      resources: Optional[Union[str, List[str]]] = None) -> pd.DataFrame:
+        """
+        検索結果を列形式で正規化
+        
+        Args:
+            search_result: Amazon API検索結果
+            resources: 取得時に指定したリソース（指定外の列は欠損値）
+            
+        Returns:
+            正規化された商品データのDataFrame（列は normalize_batch を参照）
+        """
+        return self.normalize_batch(search_result.get('SearchResult', {}).get('Items', []), resources)
+    
+    def normalize_items_result_frame(self, items_result: Dict,
+                                     resources: Optional[Union[str, List[str]]] = None) -> pd.DataFrame:
+        """
+        商品詳細結果を列形式で正規化
+        
+        Args:
+            items_result: Amazon API商品詳細結果
+            resources: 取得時に指定したリソース（指定外の列は欠損値）
+            
+        Returns:
+            正規化された商品データのDataFrame（列は normalize_batch を参照）
+        """
+        return self.normalize_batch(items_result.get('ItemsResult', {}).get('Items', []), resources)
+    
+    def normalize_batch(self, items: Iterable[Dict],
+                        resources: Optional[Union[str, List[str]]] = None,
+                        processed_at: Optional[int] = None) -> pd.DataFrame:
+        """
+        PA-APIの商品データをまとめて列形式で正規化
+        
+        商品ごとの辞書を作らず、1回の走査で列ごとの配列に値を格納する。
+        値の規則は _normalize_item と同じで、型は次のとおり
+        
+        - current_price / original_price / review_count: int64（小数の価格を含む場合は価格のみfloat64）
+          値のない商品（CustomerReviews を含まない応答など）を含む場合は nullable な Int64 / Float64
+        - discount_rate: float64、rating: float32（値のない商品はNaN）
+        - brand / currency / availability: category
+        - processed_at: int64のエポックミリ秒（バッチ内で共通）
+        
+        Args:
+            items: 商品データ（複数レスポンス分の Items を連結したものでも可）
+            resources: 取得時に指定したリソース（指定外の列は欠損値）
+            processed_at: 取得日時のエポックミリ秒（Noneの場合は現在時刻）
+            
+        Returns:
+            正規化された商品データのDataFrame（列は NormalizedItem のフィールドと同じ）
+        """
+        try:
+            covered_fields = get_covered_fields(resources)
+            
+            asins = []
+            titles = []
+            brands = []
+            current_prices = []
+            original_prices = []
+            currencies = []
+            availabilities = []
+            ratings = []
+            review_counts = []
+            image_urls = []
+            
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                
+                item_info = item.get('ItemInfo') or {}
+                offers = item.get('Offers') or {}
+                current_price = offers.get('CurrentPrice') or {}
+                list_price = offers.get('ListPrice') or {}
+                reviews = item.get('CustomerReviews') or {}
+                
+                current_amount = current_price.get('Amount', 0)
+                asins.append(item.get('ASIN', ''))
+                titles.append((item_info.get('Title') or {}).get('DisplayValue', ''))
+                brands.append(((item_info.get('ByLineInfo') or {}).get('Brand') or {}).get('DisplayValue', ''))
+                current_prices.append(current_amount)
+                original_prices.append(list_price.get('Amount', current_amount))
+                currencies.append(current_price.get('Currency', 'JPY'))
+                availabilities.append((offers.get('Availability') or {}).get('Message', 'Unknown'))
+                ratings.append(reviews.get('Rating', 0))
+                review_counts.append(reviews.get('ReviewCount', 0))
+                image_urls.append((((item.get('Images') or {}).get('Primary') or {}).get('Large') or {}).get('URL', ''))
+            
+            count = len(asins)
+            # 値のない価格はNaNとして計算（比較はFalseとなり割引率は0）
+            current = np.array(current_prices, dtype=np.float64)
+            original = np.array(original_prices, dtype=np.float64)
+            
+            # 割引率（元価格より安い場合のみ）
+            discount_rate = np.zeros(count, dtype=np.float64)
+            discounted = (original > 0) & (current < original)
+            discount_rate[discounted] = (original[discounted] - current[discounted]) / original[discounted] * 100
+            
+            columns = {
+                'asin': np.array(asins, dtype=object),
+                'title': np.array(titles, dtype=object),
+                'brand': pd.Categorical(brands),
+                'current_price': self._to_number_column(current),
+                'original_price': self._to_number_column(original),
+                'discount_rate': np.round(discount_rate, 2),
+                'currency': pd.Categorical(currencies),
+                'availability': pd.Categorical(availabilities),
+                'rating': np.array(ratings, dtype=np.float32),
+                'review_count': self._to_number_column(np.array(review_counts, dtype=np.float64)),
+                'image_url': np.array(image_urls, dtype=object),
+                'processed_at': np.full(count, processed_at or now_epoch_ms(), dtype=np.int64)
+            }
+            
+            # 要求していない列は既定値ではなく欠損として扱う
+            if covered_fields is not None:
+                for field in NORMALIZED_COLUMNS:
+                    if field not in covered_fields:
+                        columns[field] = self._missing_column(columns[field], count)
+            
+            frame = pd.DataFrame(columns, columns=list(NORMALIZED_COLUMNS))
+            self.logger.info(f"商品データを列形式で正規化: {count}件")
+            return frame
+            
+        except Exception as e:
+            self.logger.error(f"列形式正規化エラー: {e}")
+            return pd.DataFrame(columns=list(NORMALIZED_COLUMNS))
+    
+    @staticmethod
+    def _to_number_column(values: np.ndarray):
+        """
+        数値列をint64配列に変換（小数を含む場合はfloat64）
+        
+        NaN（値のない商品）を含む場合は欠損を保持できる nullable な Int64 / Float64 とする
+        """
+        missing = np.isnan(values)
+        integral = bool(np.all(np.mod(values[~missing], 1) == 0))
+        if not missing.any():
+            return values.astype(np.int64) if integral else values
+        column = pd.array(values, dtype='Float64')
+        return column.astype('Int64') if integral else column
+    
+    @staticmethod
+    def _missing_column(column, count: int):
+        """列と同じ種類の欠損値の列を作成"""
+        if isinstance(column, pd.Categorical):
+            return pd.Categorical([None] * count)
+        if isinstance(column, pd.api.extensions.ExtensionArray):
+            return pd.array([None] * count, dtype=column.dtype)
+        if column.dtype.kind in 'iu':
+            return pd.array([None] * count, dtype='Int64')
+        if column.dtype.kind == 'f':
+            return np.full(count, np.nan, dtype=column.dtype)
+        return np.full(count, None, dtype=object)
+    
+    def normalize_parallel(self, responses: Iterable[Dict],
+                           resources: Optional[Union[str, List[str]]] = None,
+                           max_workers: Optional[int] = None, shard_size: Optional[int] = None,
+                           columnar: bool = False,
+                           min_parallel: Optional[int] = None,
+                           processed_at: Optional[Union[int, str, datetime]] = None) -> Union[List[NormalizedItem], pd.DataFrame]:
+        """
+        APIレスポンスをプロセスプールで並列に正規化
+        
+        レスポンスを shard_size 件ずつ読み込みながらシャードに分けて各プロセスで正規化し、
+        入力順に結合する。取得日時はレスポンスに processed_at（保存時の取得日時）があればその値、
+        なければ引数の processed_at（未指定の場合は全シャードで共通の現在時刻）を用いる。
+        正規化に失敗したシャードはエラーを記録して除外し、残りのシャードの結果を返す。
+        
+        レスポンスはプロセス間で受け渡すため、件数が min_parallel 未満の場合は
+        受け渡しの方が高くつくので同一プロセスで正規化する。
+        保存済みファイルのバックフィルでは、各プロセスがファイルを直接読み込む
+        normalize_files_parallel を使用する
+        
+        Args:
+            responses: SearchItems / GetItems のレスポンス（イテレーターも可）
+            resources: 取得時に指定したリソース（指定外のフィールドは欠損値）
+            max_workers: プロセス数（Noneの場合は data_processing.normalize_workers）
+            shard_size: 1シャードのレスポンス数（Noneの場合は data_processing.normalize_shard_size）
+            columnar: Trueの場合は normalize_batch と同じ列形式のDataFrameで返す
+            min_parallel: プロセスプールを使用する最小レスポンス数
+                （Noneの場合は data_processing.normalize_min_parallel）
+            processed_at: 取得日時（エポックミリ秒・ISO形式の文字列・datetime、Noneの場合は現在時刻）
+            
+        Returns:
+            正規化された商品データリスト（columnar=True の場合はDataFrame）
+        """
+        try:
+            if shard_size is None:
+                shard_size = config_manager.get('data_processing.normalize_shard_size', 100)
+            shard_size = max(int(shard_size), 1)
+            if min_parallel is None:
+                min_parallel = config_manager.get('data_processing.normalize_min_parallel', 1000)
+            
+            # 先頭の min_parallel 件のみ読み込み、少ない場合はプロセスプールを作成しない
+            responses = iter(responses)
+            head = list(itertools.islice(responses, max(int(min_parallel), 1)))
+            if len(head) < min_parallel:
+                max_workers = 1
+                shards = self._iter_shards(iter(head), shard_size)
+            else:
+                shards = self._iter_shards(itertools.chain(head, responses), shard_size)
+            results, failed = self._map_shards(
+                _normalize_response_shard, shards, resources, max_workers, columnar, processed_at
+            )
+            
+            merged = self._merge_shard_results(results, columnar)
+            self.logger.info(f"並列正規化: {len(results)}シャード / {len(merged)}件")
+            if failed:
+                self.logger.warning(
+                    "並列正規化で失敗したシャードを除外しました: "
+                    + ", ".join(f"{index + 1}番目（レスポンス {index * shard_size + 1}件目〜）" for index in failed)
+                )
+            return merged
+            
+        except Exception as e:
+            self.logger.error(f"並列正規化エラー: {e}")
+            return pd.DataFrame(columns=list(NORMALIZED_COLUMNS)) if columnar else []
+    
+    def normalize_files_parallel(self, filepaths: List[str],
+                                 resources: Optional[Union[str, List[str]]] = None,
+                                 max_workers: Optional[int] = None,
+                                 columnar: bool = False,
+                                 processed_at: Optional[Union[int, str, datetime]] = None) -> Union[List[NormalizedItem], pd.DataFrame]:
+        """
+        APIレスポンスを保存したファイルをプロセスプールで並列に正規化
+        
+        ファイルの読み込みも各プロセスで行い、プロセス間ではファイルパスと正規化結果のみを
+        受け渡すため、保存済みレスポンスのバックフィルにはこちらを使用する。
+        結果はファイルの指定順に結合する。取得日時は normalize_parallel と同じく、
+        保存したレスポンスの processed_at を優先する。
+        正規化に失敗したファイルはエラーを記録して除外し、残りのファイルの結果を返す
+        
+        Args:
+            filepaths: レスポンスを保存したファイル（JSON・JSON Lines、圧縮拡張子も可）
+            resources: 取得時に指定したリソース（指定外のフィールドは欠損値）
+            max_workers: プロセス数（Noneの場合は data_processing.normalize_workers、上限はファイル数）
+            columnar: Trueの場合は normalize_batch と同じ列形式のDataFrameで返す
+            processed_at: 取得日時（エポックミリ秒・ISO形式の文字列・datetime、Noneの場合は現在時刻）
+            
+        Returns:
+            正規化された商品データリスト（columnar=True の場合はDataFrame）
+        """
+        try:
+            filepaths = list(filepaths)
+            max_workers = min(self._resolve_workers(max_workers), max(len(filepaths), 1))
+            results, failed = self._map_shards(
+                _normalize_response_file, filepaths, resources, max_workers, columnar, processed_at
+            )
+            
+            merged = self._merge_shard_results(results, columnar)
+            self.logger.info(f"ファイル並列正規化: {len(filepaths)}ファイル / {len(merged)}件")
+            if failed:
+                self.logger.warning(
+                    f"ファイル並列正規化で失敗したファイルを除外しました: {[filepaths[index] for index in failed]}"
+                )
+            return merged
+            
+        except Exception as e:
+            self.logger.error(f"ファイル並列正規化エラー: {e}")
+            return pd.DataFrame(columns=list(NORMALIZED_COLUMNS)) if columnar else []
+    
+    @staticmethod
+    def _iter_shards(responses: Iterator[Dict], shard_size: int) -> Iterator[List[Dict]]:
+        """レスポンスを shard_size 件ずつ順に読み込む"""
+        while True:
+            shard = list(itertools.islice(responses, shard_size))
+            if not shard:
+                return
+            yield shard
+    
+    @staticmethod
+    def _resolve_workers(max_workers: Optional[int]) -> int:
+        """プロセス数を決定（Noneの場合は設定値、0の場合はCPUコア数）"""
+        if max_workers is None:
+            max_workers = config_manager.get('data_processing.normalize_workers', 0)
+        return int(max_workers or os.cpu_count() or 1)
+    
+    def _map_shards(self, func, shards: Iterable, resources: Optional[Union[str, List[str]]],
+                    max_workers: Optional[int], columnar: bool,
+                    processed_at: Optional[Union[int, str, datetime]] = None) -> Tuple[List, List[int]]:
+        """
+        シャードごとに正規化を実行し、入力順の結果を取得
+        
+        プロセスに渡したシャードの未完了分はプロセス数の2倍までとし、
+        シャードは完了に合わせて順に読み込む。失敗したシャードはエラーを記録して除外する
+        
+        Args:
+            func: シャードを正規化するモジュール関数（プロセス間で受け渡し可能なもの）
+            shards: シャード（イテレーターも可）
+            resources: 取得時に指定したリソース
+            max_workers: プロセス数（Noneの場合は設定から取得）
+            columnar: 列形式で正規化する場合True
+            processed_at: 既定の取得日時（Noneの場合は現在時刻）
+            
+        Returns:
+            成功したシャードの正規化結果と、失敗したシャードの位置（0始まり）
+        """
+        max_workers = self._resolve_workers(max_workers)
+        processed_at = now_epoch_ms() if processed_at is None else to_epoch_ms(processed_at)
+        results = []
+        failed = []
+        
+        def collect(index: int, get_result):
+            try:
+                results.append(get_result())
+            except Exception as e:
+                self.logger.error(f"シャードの正規化エラー（{index + 1}番目、除外）: {e}")
+                failed.append(index)
+        
+        # 1プロセスで足りる場合はプールを作成しない
+        if max_workers <= 1:
+            for index, shard in enumerate(shards):
+                collect(index, lambda: func(shard, resources, processed_at, columnar))
+            return results, failed
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for index, shard in enumerate(shards):
+                pending.append((index, executor.submit(func, shard, resources, processed_at, columnar)))
+                if len(pending) >= max_workers * 2:
+                    index, future = pending.popleft()
+                    collect(index, future.result)
+            for index, future in pending:
+                collect(index, future.result)
+        return results, failed
+    
+    @staticmethod
+    def _merge_shard_results(results: List, columnar: bool) -> Union[List[NormalizedItem], pd.DataFrame]:
+        """シャードごとの結果を順に結合"""
+        if columnar:
+            frames = [frame for frame in results if len(frame) > 0]
+            if not frames:
+                return pd.DataFrame(columns=list(NORMALIZED_COLUMNS))
+            # シャード間でカテゴリが異なるため、結合後にカテゴリ型へ戻す
+            merged = pd.concat(frames, ignore_index=True)
+            for column in ('brand', 'currency', 'availability'):
+                merged[column] = merged[column].astype('category')
+            return merged
+        return [item for items in results for item in items]
+    
+    def _normalize_raw_items(self, items: Iterable[Dict], resources: Optional[Union[str, List[str]]] = None,
+                             processed_at: Optional[int] = None) -> List[NormalizedItem]:
+        """
+        PA-APIの商品データを行形式で正規化
+        
+        Args:
+            items: 商品データ
+            resources: 取得時に指定したリソース（指定外のフィールドはNone）
+            processed_at: 取得日時のエポックミリ秒（Noneの場合は現在時刻）
+            
+        Returns:
+            正規化された商品データリスト
+        """
+        covered_fields = get_covered_fields(resources)
+        processed_at = processed_at or now_epoch_ms()
+        normalized_items = []
+        for item in items:
+            normalized_item = self._normalize_item(item, covered_fields, processed_at)
+            if normalized_item:
+                normalized_items.append(normalized_item)
+        return normalized_items
+    
+    def _normalize_item(self, item: Dict, covered_fields: Optional[FrozenSet[str]] = None,
+                        processed_at: Optional[int] = None) -> Optional[NormalizedItem]:
         """
         個別商品データを正規化
         
         Args:
             item: 商品データ
+            covered_fields: レスポンスに含まれるフィールド（Noneの場合は全フィールド）
+            processed_at: 取得日時のエポックミリ秒（Noneの場合は現在時刻、バッチ内では共通の値を渡す）
             
         Returns:
-            正規化された商品データ
+            正規化された商品データ（processed_at はint のエポックミリ秒、失敗時はNone）
         """
         try:
             # 基本情報
@@ -101,20 +500,26 @@ class AmazonDataProcessor:
             image_url = self._extract_image_url(item)
             
             # 正規化されたデータ
-            normalized_item = {
-                'asin': asin,
-                'title': title,
-                'brand': brand,
-                'current_price': price_info.get('current_price'),
-                'original_price': price_info.get('original_price'),
-                'discount_rate': price_info.get('discount_rate'),
-                'currency': price_info.get('currency', 'JPY'),
-                'availability': availability,
-                'rating': rating_info.get('rating'),
-                'review_count': rating_info.get('review_count'),
-                'image_url': image_url,
-                'processed_at': datetime.now().isoformat()
-            }
+            normalized_item = NormalizedItem(
+                asin=asin,
+                title=title,
+                brand=brand,
+                current_price=price_info.get('current_price'),
+                original_price=price_info.get('original_price'),
+                discount_rate=price_info.get('discount_rate'),
+                currency=price_info.get('currency', 'JPY'),
+                availability=availability,
+                rating=rating_info.get('rating'),
+                review_count=rating_info.get('review_count'),
+                image_url=image_url,
+                processed_at=processed_at or now_epoch_ms()
+            )
+            
+            # 要求していないフィールドは既定値ではなく欠損として扱う
+            if covered_fields is not None:
+                for field in NORMALIZED_COLUMNS:
+                    if field not in covered_fields:
+                        normalized_item[field] = None
             
             return normalized_item
             
@@ -201,29 +606,84 @@ class AmazonDataProcessor:
         """
         データをJSONファイルに保存
         
+        拡張子が .jsonl / .ndjson（.gz / .zst 付きを含む）の場合は
+        JSON Lines形式で上書き保存する（追記は save_to_jsonl を使用）
+        
         Args:
             data: 保存するデータ
             filepath: 保存先ファイルパス
         """
+        if self._is_jsonl_path(filepath):
+            self.save_to_jsonl(data, filepath, append=False)
+            return
+        
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2, default=self._to_json_value)
             
             self.logger.info(f"データを保存: {filepath}")
             
         except Exception as e:
             self.logger.error(f"データ保存エラー: {e}")
     
+    def save_to_jsonl(self, data: Iterable[Dict], filepath: str, append: bool = True,
+                      compression: Optional[str] = None) -> int:
+        """
+        データをJSON Lines形式（1行1レコード）で保存
+        
+        追記モードではファイル全体を読み直さずに末尾へ書き足すため、
+        取得結果を継続的に蓄積できる
+        
+        Args:
+            data: 保存するデータ（ジェネレーターも可）
+            filepath: 保存先ファイルパス
+            append: 既存ファイルに追記する場合True（Falseの場合は上書き）
+            compression: 圧縮形式（gzip / zstd、Noneの場合は拡張子から判定）
+            
+        Returns:
+            保存したレコード数
+        """
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            count = 0
+            with self._open_text(filepath, 'a' if append else 'w', compression) as f:
+                for record in data:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=self._to_json_value))
+                    f.write('\n')
+                    count += 1
+            
+            self.logger.info(f"データを保存: {filepath} ({count}件)")
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"データ保存エラー: {e}")
+            return 0
+    
+    @staticmethod
+    def _to_json_value(value: Any) -> Any:
+        """JSONに変換できない値を変換（NormalizedItem は辞書に変換）"""
+        if isinstance(value, NormalizedItem):
+            return value.to_dict()
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    
     def load_from_json(self, filepath: str) -> List[Dict]:
         """
         JSONファイルからデータを読み込み
         
         Args:
-            filepath: 読み込みファイルパス
+            filepath: 読み込みファイルパス（JSON Lines形式の拡張子の場合は全レコードを読み込み）
             
         Returns:
             読み込んだデータ
         """
+        if self._is_jsonl_path(filepath):
+            return list(self.iter_jsonl(filepath))
+        
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -234,6 +694,145 @@ class AmazonDataProcessor:
         except Exception as e:
             self.logger.error(f"データ読み込みエラー: {e}")
             return []
+    
+    def iter_jsonl(self, filepath: str, batch_size: Optional[int] = None,
+                   compression: Optional[str] = None) -> Iterator[Union[Dict, List[Dict]]]:
+        """
+        JSON Lines形式のファイルを1行ずつ読み込み
+        
+        ファイル全体をメモリに展開しないため、大きな履歴ファイルも
+        一定のメモリで分析に渡せる
+        
+        Args:
+            filepath: 読み込みファイルパス
+            batch_size: 指定した場合はレコードをこの件数のリストにまとめて返す
+            compression: 圧縮形式（gzip / zstd、Noneの場合は拡張子から判定）
+            
+        Yields:
+            レコード（batch_size 指定時はレコードのリスト）
+        """
+        batch = []
+        count = 0
+        try:
+            with self._open_text(filepath, 'r', compression) as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        # 書き込み途中で中断された行は読み飛ばす
+                        self.logger.warning(f"不正な行を読み飛ばし: {filepath}:{line_number} - {e}")
+                        continue
+                    
+                    count += 1
+                    if batch_size is None:
+                        yield record
+                        continue
+                    
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+            
+            if batch:
+                yield batch
+            self.logger.info(f"データを読み込み: {filepath} ({count}件)")
+            
+        except Exception as e:
+            self.logger.error(f"データ読み込みエラー: {e}")
+    
+    @staticmethod
+    def _is_jsonl_path(filepath: str) -> bool:
+        """JSON Lines形式で扱うファイルパスか判定"""
+        root, extension = os.path.splitext(filepath)
+        if extension in COMPRESSION_EXTENSIONS:
+            extension = os.path.splitext(root)[1]
+        return extension in JSONL_EXTENSIONS
+    
+    @staticmethod
+    def _open_text(filepath: str, mode: str, compression: Optional[str] = None) -> IO[str]:
+        """
+        圧縮形式に応じてテキストファイルを開く
+        
+        Args:
+            filepath: ファイルパス
+            mode: r / w / a
+            compression: gzip / zstd（Noneの場合は拡張子から判定）
+            
+        Returns:
+            UTF-8のテキストストリーム
+        """
+        if compression is None:
+            compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(filepath)[1])
+        
+        if compression is None:
+            return open(filepath, mode, encoding='utf-8')
+        if compression == 'gzip':
+            # 追記した場合はgzipメンバーが連結され、読み込み時にまとめて展開される
+            return gzip.open(filepath, mode + 't', encoding='utf-8')
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ImportError("zstd圧縮には zstandard パッケージが必要です")
+            raw = open(filepath, mode + 'b')
+            if mode == 'r':
+                # 追記で連結されたフレームも続けて展開
+                stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            else:
+                stream = zstandard.ZstdCompressor().stream_writer(raw)
+            return io.TextIOWrapper(stream, encoding='utf-8')
+        raise ValueError(f"未対応の圧縮形式: {compression}")
+
+
+def _extract_raw_items(responses: Iterable[Dict]) -> Iterator[Dict]:
+    """SearchItems / GetItems のレスポンスから商品データを順に取り出す"""
+    for response in responses:
+        if not isinstance(response, dict):
+            continue
+        section = response.get('SearchResult') or response.get('ItemsResult') or {}
+        yield from section.get('Items', [])
+
+
+def _response_processed_at(response: Dict, default: int) -> int:
+    """レスポンスの取得日時（保存時の processed_at があればその値）をエポックミリ秒で取得"""
+    if isinstance(response, dict) and response.get('processed_at') is not None:
+        processed_at = to_epoch_ms(response['processed_at'])
+        if processed_at is None:
+            raise ValueError(f"取得日時を解釈できません: {response['processed_at']!r}")
+        return processed_at
+    return default
+
+
+def _normalize_response_shard(responses: Iterable[Dict], resources: Optional[Union[str, List[str]]],
+                              processed_at: int, columnar: bool) -> Union[List[NormalizedItem], pd.DataFrame]:
+    """
+    レスポンスのシャードを正規化（プロセスプールのワーカーで実行）
+    
+    取得日時が同じ連続したレスポンスをまとめて正規化する（保存時の取得日時がなければシャード全体で1回）
+    """
+    results = []
+    groups = itertools.groupby(responses, key=lambda response: _response_processed_at(response, processed_at))
+    for timestamp, group in groups:
+        if columnar:
+            results.append(amazon_data_processor.normalize_batch(_extract_raw_items(group), resources, timestamp))
+        else:
+            results.append(amazon_data_processor._normalize_raw_items(_extract_raw_items(group), resources, timestamp))
+    
+    if len(results) == 1:
+        return results[0]
+    return AmazonDataProcessor._merge_shard_results(results, columnar)
+
+
+def _normalize_response_file(filepath: str, resources: Optional[Union[str, List[str]]],
+                             processed_at: int, columnar: bool) -> Union[List[NormalizedItem], pd.DataFrame]:
+    """レスポンスを保存したファイルを読み込んで正規化（プロセスプールのワーカーで実行）"""
+    if amazon_data_processor._is_jsonl_path(filepath):
+        responses = amazon_data_processor.iter_jsonl(filepath)
+    else:
+        responses = amazon_data_processor.load_from_json(filepath)
+        if isinstance(responses, dict):
+            responses = [responses]
+    return _normalize_response_shard(responses, resources, processed_at, columnar)
 
 
 # グローバルデータ処理インスタンス
@@ -7,8 +7,9 @@ import os
 import json
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from src.utils.logger import get_logger
+from src.utils.timestamps import format_timestamp
 
 
 class DataExporter:
@@ -18,22 +19,22 @@ class DataExporter:
         """初期化"""
         self.logger = get_logger("data_exporter")
     
-    def export_to_csv(self, data: List[Dict], filepath: str, encoding: str = 'utf-8-sig'):
+    def export_to_csv(self, data: Union[List[Dict], pd.DataFrame], filepath: str, encoding: str = 'utf-8-sig'):
         """
         データをCSVファイルにエクスポート
         
         Args:
-            data: エクスポートするデータ
+            data: エクスポートするデータ（辞書のリストまたはDataFrame）
             filepath: 出力ファイルパス
             encoding: エンコーディング
         """
         try:
-            if not data:
+            if len(data) == 0:
                 self.logger.warning("エクスポートするデータがありません")
                 return
             
             # DataFrameに変換
-            df = pd.DataFrame(data)
+            df = self._to_frame(data)
             
             # ディレクトリを作成
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -46,6 +47,13 @@ class DataExporter:
         except Exception as e:
             self.logger.error(f"CSVエクスポートエラー: {e}")
     
+    def _to_frame(self, data: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
+        """DataFrameに変換し、エポックミリ秒の取得日時をISO形式で出力"""
+        df = pd.DataFrame(data)
+        if 'processed_at' in df.columns:
+            df['processed_at'] = df['processed_at'].map(format_timestamp)
+        return df
+    
     def export_to_excel(self, data_dict: Dict[str, List[Dict]], filepath: str):
         """
         データをExcelファイルにエクスポート
@@ -66,7 +74,7 @@ class DataExporter:
             with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
                 for sheet_name, data in data_dict.items():
                     if data:
-                        df = pd.DataFrame(data)
+                        df = self._to_frame(data)
                         df.to_excel(writer, sheet_name=sheet_name, index=False)
                         self.logger.info(f"シート '{sheet_name}' に {len(data)}件 エクスポート")
             
@@ -0,0 +1,155 @@
+"""
+正規化商品レコードモジュール
+正規化済みの商品データを辞書より小さい固定フィールドのレコードで保持する
+"""
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+
+class StringTable:
+    """
+    値の種類が少ない文字列（ブランド・通貨・在庫状況）を共有するテーブル
+    
+    同じ内容の文字列は最初に登録したオブジェクトを返すため、
+    数百万件のレコードでも文字列本体は種類の数だけ保持される
+    """
+    
+    def __init__(self):
+        """初期化"""
+        self._strings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        共有する文字列を取得
+        
+        Args:
+            value: 文字列（Noneはそのまま返す）
+        
+        Returns:
+            テーブルに登録済みの同じ内容の文字列
+        """
+        if value is None:
+            return None
+        shared = self._strings.get(value)
+        if shared is None:
+            with self._lock:
+                shared = self._strings.setdefault(value, value)
+        return shared
+    
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+# プロセス内で共有する文字列テーブル
+string_table = StringTable()
+
+
+def to_yen(amount: Optional[Union[int, float]], currency: Optional[str] = 'JPY') -> Optional[Union[int, float]]:
+    """
+    価格を整数の円に変換（円以外の通貨は小数を保持）
+    
+    Args:
+        amount: 価格
+        currency: 通貨コード
+    
+    Returns:
+        円の場合は整数の価格
+    """
+    if amount is None or currency != 'JPY':
+        return amount
+    return int(round(amount))
+
+
+class NormalizedItem(Mapping):
+    """
+    正規化済みの商品データ
+    
+    __slots__ で固定フィールドを保持し、辞書と同じキーで参照できる
+    （item['asin']・item.get('brand')・dict(item) が従来どおり利用可能）
+    """
+    
+    __slots__ = (
+        'asin', 'title', 'brand', 'current_price', 'original_price', 'discount_rate', 'currency',
+        'availability', 'rating', 'review_count', 'image_url', 'processed_at'
+    )
+    
+    def __init__(self, asin: str = '', title: Optional[str] = None, brand: Optional[str] = None,
+                 current_price: Optional[Union[int, float]] = None,
+                 original_price: Optional[Union[int, float]] = None,
+                 discount_rate: Optional[float] = None, currency: Optional[str] = None,
+                 availability: Optional[str] = None, rating: Optional[float] = None,
+                 review_count: Optional[int] = None, image_url: Optional[str] = None,
+                 processed_at: Optional[int] = None):
+        """
+        初期化
+        
+        ブランド・通貨・在庫状況は共有の文字列テーブルに登録し、円の価格は整数で保持する
+        
+        Args:
+            asin: ASIN
+            title: 商品名
+            brand: ブランド
+            current_price: 現在価格
+            original_price: 元価格
+            discount_rate: 割引率（%）
+            currency: 通貨コード
+            availability: 在庫状況
+            rating: 評価
+            review_count: レビュー数
+            image_url: 画像URL
+            processed_at: 取得日時（エポックミリ秒）
+        """
+        self.asin = asin
+        self.title = title
+        self.brand = string_table.intern(brand)
+        self.current_price = to_yen(current_price, currency)
+        self.original_price = to_yen(original_price, currency)
+        self.discount_rate = discount_rate
+        self.currency = string_table.intern(currency)
+        self.availability = string_table.intern(availability)
+        self.rating = rating
+        self.review_count = review_count
+        self.image_url = image_url
+        self.processed_at = processed_at
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NormalizedItem":
+        """辞書から作成（未知のキーは無視）"""
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+    
+    def __len__(self) -> int:
+        return len(self.__slots__)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+    
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, value)
+        # 別プロセスから受け取った場合も文字列テーブルを共有
+        self.brand = string_table.intern(self.brand)
+        self.currency = string_table.intern(self.currency)
+        self.availability = string_table.intern(self.availability)
+    
+    def __repr__(self) -> str:
+        return f"NormalizedItem({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict:
+        """辞書に変換（JSON出力用）"""
+        return {field: getattr(self, field) for field in self.__slots__}
@@ -6,8 +6,9 @@
 import json
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from src.utils.logger import get_logger
+from src.utils.timestamps import to_datetime_series
 
 
 class PriceAnalyzer:
@@ -17,23 +18,23 @@ class PriceAnalyzer:
         """初期化"""
         self.logger = get_logger("price_analyzer")
     
-    def analyze_price_changes(self, price_history: List[Dict]) -> Dict:
+    def analyze_price_changes(self, price_history: Union[List[Dict], pd.DataFrame]) -> Dict:
         """
         価格変動を分析
         
         Args:
-            price_history: 価格履歴データ
+            price_history: 価格履歴データ（辞書のリストまたは列形式のDataFrame）
             
         Returns:
             価格変動分析結果
         """
         try:
-            if not price_history:
+            if len(price_history) == 0:
                 return {}
             
             # DataFrameに変換
             df = pd.DataFrame(price_history)
-            df['date'] = pd.to_datetime(df['processed_at'])
+            df['date'] = to_datetime_series(df['processed_at'])
             df = df.sort_values('date')
             
             analysis_result = {
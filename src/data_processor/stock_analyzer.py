@@ -5,8 +5,9 @@
 
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from src.utils.logger import get_logger
+from src.utils.timestamps import to_datetime_series
 
 
 class StockAnalyzer:
@@ -16,23 +17,23 @@ class StockAnalyzer:
         """初期化"""
         self.logger = get_logger("stock_analyzer")
     
-    def analyze_stock_status(self, stock_data: List[Dict]) -> Dict:
+    def analyze_stock_status(self, stock_data: Union[List[Dict], pd.DataFrame]) -> Dict:
         """
         在庫状況を分析
         
         Args:
-            stock_data: 在庫データ
+            stock_data: 在庫データ（辞書のリストまたは列形式のDataFrame）
             
         Returns:
             在庫分析結果
         """
         try:
-            if not stock_data:
+            if len(stock_data) == 0:
                 return {}
             
             # DataFrameに変換
             df = pd.DataFrame(stock_data)
-            df['date'] = pd.to_datetime(df['processed_at'])
+            df['date'] = to_datetime_series(df['processed_at'])
             df = df.sort_values('date')
             
             analysis_result = {
@@ -252,7 +253,7 @@ class StockAnalyzer:
             
             # 時系列データを分析
             df = pd.DataFrame(stock_history)
-            df['date'] = pd.to_datetime(df['processed_at'])
+            df['date'] = to_datetime_series(df['processed_at'])
             
             # 商品別の在庫状況変化を分析
             for asin in df['asin'].unique():
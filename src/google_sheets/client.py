@@ -4,9 +4,7 @@ Google Sheets API クライアント
 """
 
 import os
-import gspread
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import threading
 from typing import Dict, List, Optional, Any
 from src.utils.config import config_manager
 from src.utils.logger import get_logger
@@ -33,6 +31,11 @@ class GoogleSheetsClient:
                 self.logger.warning(f"認証ファイルが見つかりません: {credentials_file}")
                 return
             
+            # Google APIライブラリは読み込みが重いため、認証時まで遅延
+            import gspread
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+            
             # 認証情報を読み込み
             scopes = [
                 'https://www.googleapis.com/auth/spreadsheets',
@@ -257,5 +260,28 @@ class GoogleSheetsClient:
         return self.gc is not None and self.service is not None
 
 
-# グローバルGoogle Sheetsクライアントインスタンス
-google_sheets_client = GoogleSheetsClient() 
\ No newline at end of file
+# グローバルGoogle Sheetsクライアントインスタンス（初回利用時に生成）
+_google_sheets_client = None
+_google_sheets_client_lock = threading.Lock()
+
+
+def get_google_sheets_client() -> GoogleSheetsClient:
+    """
+    グローバルGoogle Sheetsクライアントを取得（初回呼び出し時に生成）
+    
+    Returns:
+        GoogleSheetsClientインスタンス
+    """
+    global _google_sheets_client
+    if _google_sheets_client is None:
+        with _google_sheets_client_lock:
+            if _google_sheets_client is None:
+                _google_sheets_client = GoogleSheetsClient()
+    return _google_sheets_client
+
+
+def __getattr__(name: str):
+    """従来の `google_sheets_client` 参照を遅延生成で維持"""
+    if name == 'google_sheets_client':
+        return get_google_sheets_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,8 +6,9 @@ AmazonデータをGoogle Sheetsに反映する機能を提供
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from src.google_sheets.client import google_sheets_client
+from src.google_sheets.client import GoogleSheetsClient, get_google_sheets_client
 from src.utils.logger import get_logger
+from src.utils.timestamps import format_timestamp
 
 
 class GoogleSheetsDataSync:
@@ -16,7 +17,11 @@ class GoogleSheetsDataSync:
     def __init__(self):
         """初期化"""
         self.logger = get_logger("google_sheets_sync")
-        self.client = google_sheets_client
+    
+    @property
+    def client(self) -> GoogleSheetsClient:
+        """Google Sheetsクライアント（初回アクセス時に認証）"""
+        return get_google_sheets_client()
     
     def setup_spreadsheet_structure(self, spreadsheet_title: str = "Amazon EC Tool") -> Optional[str]:
         """
@@ -165,7 +170,7 @@ class GoogleSheetsDataSync:
                     product.get('rating', 0),
                     product.get('review_count', 0),
                     product.get('image_url', ''),
-                    product.get('processed_at', '')
+                    format_timestamp(product.get('processed_at', ''))
                 ]
                 data_rows.append(row)
             
@@ -223,7 +228,7 @@ class GoogleSheetsDataSync:
                     record.get('price_change', 0),
                     record.get('change_percentage', 0),
                     record.get('discount_rate', 0),
-                    record.get('processed_at', '')
+                    format_timestamp(record.get('processed_at', ''))
                 ]
                 data_rows.append(row)
             
@@ -289,7 +294,7 @@ class GoogleSheetsDataSync:
                     stock.get('brand', ''),
                     stock.get('availability', ''),
                     stock_category,
-                    stock.get('processed_at', ''),
+                    format_timestamp(stock.get('processed_at', '')),
                     alert
                 ]
                 data_rows.append(row)
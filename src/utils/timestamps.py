@@ -0,0 +1,101 @@
+"""
+タイムスタンプユーティリティ
+取得日時をUNIXエポックのミリ秒（int）で扱い、ISO形式への変換は出力時のみ行う
+"""
+
+import numbers
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+import pandas as pd
+
+
+# 出力・解析に用いるタイムゾーン（日本標準時、夏時間なし）
+# ISO形式は実行環境のタイムゾーンによらずこの時刻・タイムゾーンなしで出力し、
+# タイムゾーンなしのISO形式文字列もこの時刻として解釈する
+JST = timezone(timedelta(hours=9), 'JST')
+
+
+def now_epoch_ms() -> int:
+    """現在時刻をエポックミリ秒で取得"""
+    return time.time_ns() // 1_000_000
+
+
+def is_epoch_ms(value: Any) -> bool:
+    """エポックミリ秒（数値）か判定"""
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def format_timestamp(value: Any) -> Any:
+    """
+    タイムスタンプをISO形式の文字列に変換（出力用）
+    
+    Args:
+        value: エポックミリ秒・ISO形式の文字列・datetime
+    
+    Returns:
+        日本時間のISO形式文字列（数値・datetime以外はそのまま返す）
+    """
+    if is_epoch_ms(value):
+        return datetime.fromtimestamp(value / 1000, JST).replace(tzinfo=None).isoformat()
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(JST).replace(tzinfo=None)
+        return value.isoformat()
+    return value
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    """
+    タイムスタンプをエポックミリ秒に変換
+    
+    Args:
+        value: エポックミリ秒・ISO形式の文字列・datetime（タイムゾーンなしは日本時間）
+    
+    Returns:
+        エポックミリ秒（変換できない場合はNone）
+    """
+    if is_epoch_ms(value):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=JST)
+        return int(value.timestamp() * 1000)
+    return None
+
+
+def to_datetime_series(values: pd.Series) -> pd.Series:
+    """
+    タイムスタンプ列を日本時間のdatetime列に変換
+    
+    エポックミリ秒は文字列の解析を行わずに一括変換し、
+    ISO形式の文字列（以前に保存したデータ）が混在する場合はその行のみ解析する
+    
+    Args:
+        values: エポックミリ秒またはISO形式文字列の列
+    
+    Returns:
+        タイムゾーンなしの日本時間の列
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return _from_epoch_ms(values)
+    
+    numeric = values.map(is_epoch_ms).astype(bool)
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    if numeric.any():
+        result[numeric] = _from_epoch_ms(values[numeric].astype('int64'))
+    if (~numeric).any():
+        result[~numeric] = pd.to_datetime(values[~numeric])
+    return result
+
+
+def _from_epoch_ms(values: pd.Series) -> pd.Series:
+    """エポックミリ秒の列を日本時間に変換"""
+    return (
+        pd.to_datetime(values, unit='ms', utc=True)
+        .dt.tz_convert(JST)
+        .dt.tz_localize(None)
+        .astype('datetime64[ns]')
+    )
@@ -6,13 +6,21 @@ Amazon APIの接続とデータ処理機能をテスト
 
 import sys
 import os
+import tempfile
 import json
+import asyncio
 from datetime import datetime
 
 # srcディレクトリをパスに追加
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from amazon_api.client import amazon_client
+from amazon_api.async_client import AsyncAmazonAPIClient
+from amazon_api.rate_limiter import TokenBucketRateLimiter
+from amazon_api.item_errors import is_complete_result
+from amazon_api.quota import RequestAccounting
+from amazon_api.resources import RESOURCE_PROFILES
+from amazon_api.response_cache import ResponseCache
 from data_processor.amazon_data_processor import amazon_data_processor
 from utils.logger import logger
 
@@ -105,7 +113,7 @@ def test_mock_search():
     
     if normalized_items:
         print(f"✓ モック検索結果処理: {len(normalized_items)}件")
-        print(f"処理結果: {json.dumps(normalized_items[0], ensure_ascii=False, indent=2)}")
+        print(f"処理結果: {json.dumps(normalized_items[0].to_dict(), ensure_ascii=False, indent=2)}")
     else:
         print("✗ モック検索結果処理: 失敗")
     
@@ -135,7 +143,7 @@ def test_data_save_load():
     ]
     
     # データ保存テスト
-    test_file = "data/processed/test_data.json"
+    test_file = os.path.join(tempfile.mkdtemp(), 'test_data.json')
     amazon_data_processor.save_to_json(test_data, test_file)
     
     # データ読み込みテスト
@@ -149,6 +157,320 @@ def test_data_save_load():
     print("✓ データ保存・読み込みテスト完了\n")
 
 
+def test_get_items_chunking():
+    """ASIN分割取得テスト（実際のAPI呼び出しなし）"""
+    print("=== ASIN分割取得テスト ===")
+    
+    class FakeResponse:
+        def __init__(self, item_ids):
+            self.status_code = 200
+            self.text = ''
+            self._item_ids = item_ids
+        
+        def json(self):
+            return {"ItemsResult": {"Items": [{"ASIN": asin} for asin in self._item_ids]}}
+    
+    sent_chunks = []
+    
+    def fake_send_request(operation, params):
+        item_ids = params['ItemIds'].split(',')
+        sent_chunks.append(item_ids)
+        return FakeResponse(item_ids)
+    
+    original_send_request = amazon_client._send_request
+    original_response_cache = amazon_client.response_cache
+    amazon_client._send_request = fake_send_request
+    amazon_client.response_cache = None
+    try:
+        asins = [f"B{i:09d}" for i in range(25)]
+        result = amazon_client.get_items(asins)
+    finally:
+        amazon_client._send_request = original_send_request
+        amazon_client.response_cache = original_response_cache
+    
+    items = result["ItemsResult"]["Items"]
+    assert [len(chunk) for chunk in sent_chunks] == [10, 10, 5]
+    assert [item["ASIN"] for item in items] == asins
+    assert "Errors" not in result
+    print(f"✓ {len(asins)}件を{len(sent_chunks)}リクエストで取得")
+    
+    print("✓ ASIN分割取得テスト完了\n")
+
+
+def test_get_items_partial_errors():
+    """ASIN単位の部分エラーの再取得テスト（実際のAPI呼び出しなし）"""
+    print("=== 部分エラー再取得テスト ===")
+    
+    invalid_asin = "B000000003"
+    flaky_asin = "B000000012"
+    missing_asin = "B000000021"
+    
+    class FakeResponse:
+        def __init__(self, body):
+            self.status_code = 200
+            self.text = ''
+            self._body = body
+        
+        def json(self):
+            return self._body
+    
+    sent_chunks = []
+    
+    def fake_send_request(operation, params):
+        item_ids = params['ItemIds'].split(',')
+        sent_chunks.append(item_ids)
+        returned = [
+            asin for asin in item_ids
+            if asin not in (invalid_asin, missing_asin) and not (asin == flaky_asin and len(sent_chunks) <= 3)
+        ]
+        body = {"ItemsResult": {"Items": [{"ASIN": asin} for asin in returned]}}
+        if invalid_asin in item_ids:
+            body["Errors"] = [{
+                "Code": "InvalidParameterValue",
+                "Message": f"The ItemId {invalid_asin} provided in the request is invalid."
+            }]
+        return FakeResponse(body)
+    
+    original_send_request = amazon_client._send_request
+    original_response_cache = amazon_client.response_cache
+    original_negative_cache = amazon_client.negative_cache
+    amazon_client._send_request = fake_send_request
+    amazon_client.response_cache = None
+    amazon_client.negative_cache = None
+    try:
+        asins = [f"B{i:09d}" for i in range(25)]
+        result = amazon_client.get_items(asins)
+    finally:
+        amazon_client._send_request = original_send_request
+        amazon_client.response_cache = original_response_cache
+        amazon_client.negative_cache = original_negative_cache
+    
+    # 2回目以降は未取得のASINのみを1リクエストにまとめて送信
+    assert [len(chunk) for chunk in sent_chunks] == [10, 10, 5, 2, 1]
+    assert sent_chunks[3] == [flaky_asin, missing_asin]
+    assert len(result["ItemsResult"]["Items"]) == 23
+    
+    errors = {error["ItemIds"][0]: error for error in result["Errors"]}
+    assert errors[invalid_asin]["Code"] == "InvalidParameterValue" and not errors[invalid_asin]["Retryable"]
+    assert errors[missing_asin]["Retryable"]
+    assert invalid_asin in amazon_client.get_invalid_asins()
+    print(f"✓ {len(sent_chunks)}リクエスト（再取得は未取得分のみ）、無効ASINを記録")
+    
+    print("✓ 部分エラー再取得テスト完了\n")
+
+
+def test_get_items_transient_not_cached():
+    """一時的に取得できなかったASINを含む応答をキャッシュしないテスト（実際のAPI呼び出しなし）"""
+    print("=== 部分エラーのキャッシュテスト ===")
+    
+    flaky_asin = "B000000002"
+    
+    class FakeResponse:
+        def __init__(self, body):
+            self.status_code = 200
+            self.text = ''
+            self._body = body
+        
+        def json(self):
+            return self._body
+    
+    sent_chunks = []
+    
+    def fake_send_request(operation, params):
+        item_ids = params['ItemIds'].split(',')
+        sent_chunks.append(item_ids)
+        # 初回のみ flaky_asin を返さない
+        returned = [asin for asin in item_ids if not (asin == flaky_asin and len(sent_chunks) == 1)]
+        return FakeResponse({"ItemsResult": {"Items": [{"ASIN": asin} for asin in returned]}})
+    
+    original_send_request = amazon_client._send_request
+    original_response_cache = amazon_client.response_cache
+    original_negative_cache = amazon_client.negative_cache
+    amazon_client._send_request = fake_send_request
+    amazon_client.response_cache = ResponseCache()
+    amazon_client.negative_cache = None
+    try:
+        asins = ["B000000001", flaky_asin]
+        first = amazon_client.get_items(asins)
+        assert sent_chunks == [asins, [flaky_asin]]
+        assert len(first["ItemsResult"]["Items"]) == 2
+        
+        # 不完全な応答はキャッシュされず、次回は2件まとめて再取得する
+        second = amazon_client.get_items(asins)
+        assert sent_chunks[2:] == [asins]
+        assert second["ItemsResult"]["Items"] == first["ItemsResult"]["Items"]
+        
+        # 完全な応答はキャッシュから返す
+        amazon_client.get_items(asins)
+        assert len(sent_chunks) == 3
+    finally:
+        amazon_client._send_request = original_send_request
+        amazon_client.response_cache = original_response_cache
+        amazon_client.negative_cache = original_negative_cache
+    
+    assert not is_complete_result(asins, {"Errors": [{"Code": "TooManyRequests", "Message": "throttled"}]})
+    assert is_complete_result(asins, {
+        "ItemsResult": {"Items": [{"ASIN": "B000000001"}]},
+        "Errors": [{"Code": "InvalidParameterValue", "Message": f"The ItemId {flaky_asin} provided in the request is invalid."}]
+    })
+    print(f"✓ {len(sent_chunks)}リクエスト（一時的な欠落を含む応答はキャッシュしない）")
+    
+    print("✓ 部分エラーのキャッシュテスト完了\n")
+
+
+def test_iter_search_items():
+    """検索結果のページング取得テスト（実際のAPI呼び出しなし）"""
+    print("=== 検索ページングテスト ===")
+    
+    class FakeResponse:
+        status_code = 200
+        text = ''
+        
+        def __init__(self, page):
+            self._page = page
+        
+        def json(self):
+            start = (self._page - 1) * 10
+            asins = [f"B{i:09d}" for i in range(start, min(start + 10, 25))]
+            return {"SearchResult": {"Items": [{"ASIN": asin} for asin in asins], "TotalResultCount": 25}}
+    
+    requested_pages = []
+    
+    def fake_send_request(operation, params):
+        page = params.get('ItemPage', 1)
+        requested_pages.append(page)
+        return FakeResponse(page)
+    
+    original_send_request = amazon_client._send_request
+    original_response_cache = amazon_client.response_cache
+    amazon_client._send_request = fake_send_request
+    amazon_client.response_cache = None
+    try:
+        # 途中で打ち切った場合は以降のページを取得しない
+        items = amazon_client.iter_search_items("iPhone")
+        first_items = [next(items) for _ in range(12)]
+        items.close()
+        assert requested_pages == [1, 2]
+        assert items.total_result_count == 25
+        assert first_items[-1]["ASIN"] == "B000000011"
+        
+        # 最後まで読むと総件数で停止する
+        requested_pages.clear()
+        all_items = list(amazon_client.iter_search_items("iPhone", max_pages=5))
+        assert requested_pages == [1, 2, 3]
+        assert len(all_items) == 25
+    finally:
+        amazon_client._send_request = original_send_request
+        amazon_client.response_cache = original_response_cache
+    
+    print(f"✓ {len(all_items)}件を{len(requested_pages)}ページで取得")
+    print("✓ 検索ページングテスト完了\n")
+
+
+def test_resource_profiles():
+    """リソースプロファイルのパラメータ生成テスト"""
+    print("=== リソースプロファイルテスト ===")
+    
+    params = amazon_client._build_get_items_params(["B000000001"], "price_only")
+    print(f"price_only: {params['Resources']}")
+    assert params['Resources'].split(',') == RESOURCE_PROFILES['price_only']
+    
+    # 呼び出し単位の指定がなければ設定の既定プロファイル
+    default_params = amazon_client._build_search_params("iPhone", "All", 10)
+    default_profile = amazon_client.config.get('resources', {}).get('default_profile')
+    assert default_params['Resources'].split(',') == RESOURCE_PROFILES[default_profile]
+    
+    # 個別のリソース指定も可能
+    params = amazon_client._build_similar_items_params("B000000001", 5, ["ItemInfo.Title"])
+    assert params['Resources'] == "ItemInfo.Title"
+    
+    print("✓ リソースプロファイルテスト完了\n")
+
+
+def test_async_get_items_concurrency():
+    """非同期並行取得テスト（実際のAPI呼び出しなし）"""
+    print("=== 非同期並行取得テスト ===")
+    
+    client = AsyncAmazonAPIClient(
+        rate_limiter=TokenBucketRateLimiter(tps=1000, burst=100, tpd=None),
+        max_concurrent_requests=3
+    )
+    state = {'in_flight': 0, 'max_in_flight': 0}
+    
+    async def fake_send_request(operation, params):
+        async with client._get_semaphore():
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            await asyncio.sleep(0.01)
+            state['in_flight'] -= 1
+        items = [{"ASIN": asin} for asin in params['ItemIds'].split(',')]
+        return 200, json.dumps({"ItemsResult": {"Items": items}}), {}
+    
+    client._send_request = fake_send_request
+    client.response_cache = None
+    asins = [f"B{i:09d}" for i in range(95)]
+    result = asyncio.run(client.get_items(asins))
+    
+    assert [item["ASIN"] for item in result["ItemsResult"]["Items"]] == asins
+    assert 1 < state['max_in_flight'] <= 3
+    print(f"✓ 最大同時実行数: {state['max_in_flight']}")
+    
+    print("✓ 非同期並行取得テスト完了\n")
+
+
+def test_async_event_loop_binding():
+    """非同期クライアントのイベントループ紐付け・SQLite処理のテスト"""
+    print("=== イベントループ紐付けテスト ===")
+    
+    accounting = RequestAccounting(os.path.join(tempfile.mkdtemp(), 'requests.db'))
+    client = AsyncAmazonAPIClient(
+        rate_limiter=TokenBucketRateLimiter(tps=1000, burst=100, tpd=None),
+        request_accounting=accounting
+    )
+    assert client._blocking_storage
+    
+    async def fake_send_request(operation, params):
+        items = [{"ASIN": asin} for asin in params['ItemIds'].split(',')]
+        return 200, json.dumps({"ItemsResult": {"Items": items}}), {}
+    
+    client._send_request = fake_send_request
+    client.response_cache = None
+    
+    async def fetch(asins):
+        with RequestAccounting.job('stock_update'):
+            return await client.get_items(asins)
+    
+    # asyncio.run を繰り返しても、終了したループのセッション・セマフォは使わない
+    for asins in (["B000000001"], ["B000000002"]):
+        result = asyncio.run(fetch(asins))
+        assert [item["ASIN"] for item in result["ItemsResult"]["Items"]] == asins
+    print("✓ ループの終了後は新しいループに紐付け直す")
+    
+    # SQLiteへの記録はスレッドプールで実行しても呼び出し元のジョブに計上
+    assert accounting.get_daily_usage()['by_job'] == {'stock_update': 2}
+    print("✓ スレッドプールでの記録もジョブを引き継ぐ")
+    
+    async def bind():
+        client._bind_loop()
+    
+    other_loop = asyncio.new_event_loop()
+    try:
+        other_loop.run_until_complete(bind())
+        try:
+            asyncio.run(bind())
+            assert False, "使用中のループと別のループから使用できてはいけない"
+        except RuntimeError as e:
+            print(f"✓ 使用中のループと別のループからの使用を拒否: {e}")
+        
+        other_loop.run_until_complete(client.close())
+        asyncio.run(bind())
+        print("✓ close() 後は別のループで使用可能")
+    finally:
+        other_loop.close()
+    
+    print("✓ イベントループ紐付けテスト完了\n")
+
+
 def test_config_validation():
     """設定検証テスト"""
     print("=== 設定検証テスト ===")
@@ -188,6 +510,13 @@ def main():
     test_config_validation()
     test_amazon_api_connection()
     test_mock_search()
+    test_get_items_chunking()
+    test_get_items_partial_errors()
+    test_get_items_transient_not_cached()
+    test_iter_search_items()
+    test_resource_profiles()
+    test_async_get_items_concurrency()
+    test_async_event_loop_binding()
     test_data_save_load()
     
     print("=" * 50)
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import subprocess
 
 # srcディレクトリをパスに追加
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -110,6 +111,28 @@ def test_files():
     print()
 
 
+def test_lazy_imports():
+    """インポート時に重いライブラリ・クライアントを読み込まないことを確認"""
+    print("=== 遅延インポート確認 ===")
+    
+    code = (
+        "import sys\n"
+        "from src.utils.config import config_manager\n"
+        "config_manager.config.get('logging', {}).pop('file', None)\n"
+        "import src.data_processor.price_analyzer, src.data_processor.stock_analyzer\n"
+        "import src.amazon_api.client, src.amazon_api.mock_client\n"
+        "import src.google_sheets.client, src.google_sheets.data_sync\n"
+        "heavy = [name for name in ('boto3', 'gspread', 'googleapiclient') if name in sys.modules]\n"
+        "assert not heavy, heavy\n"
+        "assert src.amazon_api.client._amazon_client is None\n"
+        "assert src.google_sheets.client._google_sheets_client is None\n"
+        "assert src.amazon_api.mock_client.mock_amazon_client is src.amazon_api.mock_client.get_mock_amazon_client()\n"
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    
+    print("✓ 遅延インポート確認完了\n")
+
+
 def main():
     """メイン関数"""
     print("Amazon EC Tool - 基本機能テスト")
@@ -118,6 +141,7 @@ def main():
     # 各テストを実行
     test_directory_structure()
     test_files()
+    test_lazy_imports()
     test_config()
     test_logger()
     
@@ -6,8 +6,10 @@
 
 import sys
 import os
+import tempfile
 import json
 from datetime import datetime, timedelta
+import pandas as pd
 
 # srcディレクトリをパスに追加
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -15,7 +17,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from data_processor.price_analyzer import price_analyzer
 from data_processor.stock_analyzer import stock_analyzer
 from data_processor.data_exporter import data_exporter
+from data_processor.amazon_data_processor import amazon_data_processor
 from utils.logger import logger
+from utils.timestamps import format_timestamp, to_datetime_series, to_epoch_ms
 
 
 def generate_test_price_data():
@@ -162,6 +166,7 @@ def test_data_export():
     # テストデータを生成
     price_data = generate_test_price_data()
     stock_data = generate_test_stock_data()
+    output_dir = tempfile.mkdtemp()
     
     # 価格分析を実行
     price_analysis = price_analyzer.analyze_price_changes(price_data)
@@ -170,11 +175,11 @@ def test_data_export():
     stock_analysis = stock_analyzer.analyze_stock_status(stock_data)
     
     # CSVエクスポートテスト
-    csv_file = "data/processed/test_price_data.csv"
+    csv_file = os.path.join(output_dir, 'test_price_data.csv')
     data_exporter.export_to_csv(price_data, csv_file)
     
     # Excelエクスポートテスト
-    excel_file = "data/processed/test_analysis.xlsx"
+    excel_file = os.path.join(output_dir, 'test_analysis.xlsx')
     data_exporter.export_price_analysis(price_data, price_analysis, excel_file)
     data_exporter.export_stock_analysis(stock_data, stock_analysis, excel_file)
     
@@ -263,6 +268,91 @@ def test_stock_predictions():
     print()
 
 
+def test_epoch_timestamps():
+    """エポックミリ秒タイムスタンプのテスト"""
+    print("=== エポックミリ秒タイムスタンプテスト ===")
+    
+    iso_data = generate_test_price_data()
+    epoch_data = [{**record, 'processed_at': to_epoch_ms(record['processed_at'])} for record in iso_data]
+    assert all(isinstance(record['processed_at'], int) for record in epoch_data)
+    
+    # ISO文字列の履歴と同じ分析結果になる
+    iso_result = price_analyzer.analyze_price_changes(iso_data)
+    epoch_result = price_analyzer.analyze_price_changes(epoch_data)
+    assert epoch_result['date_range']['start'][:23] == iso_result['date_range']['start'][:23]
+    assert epoch_result['price_statistics'] == iso_result['price_statistics']
+    print(f"✓ エポックミリ秒の価格分析: {epoch_result['date_range']['start']}")
+    
+    # 以前に保存したISO文字列との混在
+    mixed_result = price_analyzer.analyze_price_changes(iso_data[:6] + epoch_data[6:])
+    assert mixed_result['date_range']['end'][:23] == epoch_result['date_range']['end'][:23]
+    print("✓ ISO文字列とエポックミリ秒の混在データを分析")
+    
+    # 出力時のみISO形式に変換
+    timestamp = to_epoch_ms('2026-01-02T03:04:05.678000')
+    assert format_timestamp(timestamp) == '2026-01-02T03:04:05.678000'
+    assert format_timestamp('2026-01-02T03:04:05') == '2026-01-02T03:04:05'
+    
+    # 実行環境のタイムゾーンによらず日本時間で変換
+    assert to_epoch_ms('2026-01-01T09:00:00') == 1767225600000
+    assert format_timestamp(1767225600000) == '2026-01-01T09:00:00'
+    assert to_datetime_series(pd.Series([1767225600000]))[0] == pd.Timestamp('2026-01-01 09:00:00')
+    
+    filepath = os.path.join(tempfile.mkdtemp(), 'epoch.csv')
+    data_exporter.export_to_csv(epoch_data[:3], filepath)
+    with open(filepath, encoding='utf-8-sig') as f:
+        assert iso_data[0]['processed_at'][:19] in f.read()
+    print("✓ CSV出力時にISO形式へ変換")
+    
+    print()
+
+
+def test_jsonl_persistence():
+    """JSON Lines形式の保存・読み込みテスト"""
+    print("=== JSON Lines保存テスト ===")
+    
+    directory = tempfile.mkdtemp()
+    test_data = generate_test_price_data()
+    
+    compressions = ['history.jsonl', 'history.jsonl.gz']
+    try:
+        import zstandard  # noqa: F401
+        compressions.append('history.ndjson.zst')
+    except ImportError:
+        print("  zstandard 未インストールのためzstd圧縮はスキップ")
+    
+    for filename in compressions:
+        filepath = os.path.join(directory, filename)
+        
+        # 追記を繰り返しても全レコードを順に読める
+        assert amazon_data_processor.save_to_jsonl(test_data[:10], filepath) == 10
+        assert amazon_data_processor.save_to_jsonl(iter(test_data[10:]), filepath) == len(test_data) - 10
+        assert list(amazon_data_processor.iter_jsonl(filepath)) == test_data
+        assert amazon_data_processor.load_from_json(filepath) == test_data
+        
+        batches = list(amazon_data_processor.iter_jsonl(filepath, batch_size=8))
+        assert [len(batch) for batch in batches] == [8, 8, 5]
+        print(f"✓ {filename}: 追記・逐次読み込み・{len(batches)}バッチ")
+    
+    # 拡張子で save_to_json もJSON Lines形式になる（.json と同じく上書き）
+    filepath = os.path.join(directory, 'saved.jsonl')
+    amazon_data_processor.save_to_json(test_data[:3], filepath)
+    amazon_data_processor.save_to_json(test_data[:5], filepath)
+    assert amazon_data_processor.load_from_json(filepath) == test_data[:5]
+    
+    # 書き込み途中で中断された末尾行は読み飛ばす
+    with open(filepath, 'a', encoding='utf-8') as f:
+        f.write('{"asin": "B0TRUNCAT')
+    assert len(list(amazon_data_processor.iter_jsonl(filepath))) == 5
+    
+    # バッチ単位で分析に渡す
+    for batch in amazon_data_processor.iter_jsonl(os.path.join(directory, 'history.jsonl'), batch_size=7):
+        assert price_analyzer.analyze_price_changes(batch)['total_records'] == 7
+    print("✓ 拡張子による自動判定・中断行の読み飛ばし・バッチ分析")
+    
+    print()
+
+
 def main():
     """メイン関数"""
     print("データ処理機能テスト")
@@ -274,6 +364,8 @@ def main():
     test_data_export()
     test_price_alerts()
     test_stock_predictions()
+    test_epoch_timestamps()
+    test_jsonl_persistence()
     
     print("=" * 50)
     print("✓ データ処理機能テスト完了！")
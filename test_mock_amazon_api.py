@@ -4,16 +4,26 @@
 審査期間中の開発用にモックデータでテスト
 """
 
+import asyncio
 import sys
 import os
+import tempfile
 import json
+import time
 from datetime import datetime
+import pandas as pd
 
 # srcディレクトリをパスに追加
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from amazon_api.mock_client import mock_amazon_client
+from amazon_api.mock_behavior import FaultInjector, LatencyModel
+from amazon_api.mock_client import AsyncMockAmazonAPIClient, MockAmazonAPIClient, mock_amazon_client
+from amazon_api.item_errors import is_retryable_error
+from amazon_api.keyword_index import KeywordIndex, tokenize_query
+from amazon_api.synthetic_catalog import SyntheticCatalog
+import data_processor.amazon_data_processor as processor_module
 from data_processor.amazon_data_processor import amazon_data_processor
+from data_processor.normalized_item import NormalizedItem
 from utils.logger import logger
 
 
@@ -151,7 +161,7 @@ def test_data_processing():
             print(f"  評価: {item['rating']} ({item['review_count']}件)")
         
         # データ保存テスト
-        test_file = "data/processed/mock_test_data.json"
+        test_file = os.path.join(tempfile.mkdtemp(), 'mock_test_data.json')
         amazon_data_processor.save_to_json(normalized_items, test_file)
         print(f"\nデータ保存: {test_file}")
         
@@ -165,6 +175,312 @@ def test_data_processing():
     print("✓ データ処理テスト完了\n")
 
 
+def test_resource_profiles():
+    """リソースプロファイルによる縮小レスポンスの処理テスト"""
+    print("=== リソースプロファイルテスト ===")
+    
+    # 在庫監視用プロファイルでは在庫以外のフィールドは欠損として扱う
+    result = mock_amazon_client.get_items(["B08N5WRWNW"], resources="availability")
+    item = result["ItemsResult"]["Items"][0]
+    assert "ItemInfo" not in item and "Offers" in item
+    
+    normalized = amazon_data_processor.normalize_items_result(result, resources="availability")[0]
+    print(f"在庫監視用: {normalized}")
+    assert normalized['asin'] == "B08N5WRWNW"
+    assert normalized['availability'] not in (None, 'Unknown')
+    assert normalized['title'] is None and normalized['current_price'] is None
+    
+    # カタログ用プロファイルでは価格・在庫を含まない
+    result = mock_amazon_client.search_items("iPhone", item_count=1, resources="catalog")
+    normalized = amazon_data_processor.normalize_search_result(result, resources="catalog")[0]
+    assert normalized['title'] and normalized['availability'] is None
+    
+    print("✓ リソースプロファイルテスト完了\n")
+
+
+def test_synthetic_catalog():
+    """合成カタログテスト"""
+    print("=== 合成カタログテスト ===")
+    
+    # シードが同じなら同じ商品を生成し、件数に関わらず遅延生成する
+    catalog = SyntheticCatalog(5_000_000, seed=1)
+    last_asin = catalog.asin_at(4_999_999)
+    assert catalog.index_of(last_asin) == 4_999_999
+    assert catalog.get_item(4_999_999) == SyntheticCatalog(5_000_000, seed=1).get_item_by_asin(last_asin)
+    assert catalog.get_item(0) != SyntheticCatalog(5_000_000, seed=2).get_item(0)
+    print(f"末尾の商品: {catalog.get_item(4_999_999)['ItemInfo']['Title']['DisplayValue']}")
+    
+    # 合成商品を含むモッククライアント
+    client = MockAmazonAPIClient(catalog_size=2000, seed=1)
+    result = client.search_items("Anker", item_count=10, item_page=2)
+    assert len(result["SearchResult"]["Items"]) == 10
+    assert result["SearchResult"]["TotalResultCount"] > 20
+    
+    asins = [item["ASIN"] for item in result["SearchResult"]["Items"][:3]] + ["B08N5WRWNW"]
+    items_result = client.get_items(asins)
+    assert [item["ASIN"] for item in items_result["ItemsResult"]["Items"]] == asins
+    
+    normalized = amazon_data_processor.normalize_items_result(items_result)
+    for item in normalized:
+        assert item['current_price'] <= item['original_price']
+        assert item['brand'] and item['availability']
+    
+    print("✓ 合成カタログテスト完了\n")
+
+
+def test_columnar_normalization():
+    """列形式正規化テスト"""
+    print("=== 列形式正規化テスト ===")
+    
+    client = MockAmazonAPIClient(catalog_size=2000, seed=1)
+    result = client.search_items("Anker", item_count=10)
+    asins = [item["ASIN"] for item in result["SearchResult"]["Items"]]
+    items_result = client.get_items(asins)
+    
+    # 辞書ごとの正規化と同じ値を、型付きの列で返す
+    frame = amazon_data_processor.normalize_items_result_frame(items_result)
+    rows = amazon_data_processor.normalize_items_result(items_result)
+    assert list(frame['asin']) == [row['asin'] for row in rows]
+    for column in ('title', 'brand', 'current_price', 'original_price', 'discount_rate', 'availability', 'review_count'):
+        assert list(frame[column]) == [row[column] for row in rows], column
+    assert frame['current_price'].dtype == 'int64' and frame['rating'].dtype == 'float32'
+    assert frame['brand'].dtype == 'category' and frame['availability'].dtype == 'category'
+    print(f"✓ 型付き列で正規化: {dict(frame.dtypes.astype(str))}")
+    
+    # 要求していない列は欠損値
+    frame = amazon_data_processor.normalize_batch(
+        client.get_items(asins, resources="availability")["ItemsResult"]["Items"], resources="availability"
+    )
+    assert frame['current_price'].isna().all() and frame['title'].isna().all()
+    assert frame['availability'].notna().all()
+    print("✓ リソース指定外の列は欠損値")
+    
+    # 評価・価格のない商品を含むバッチも欠損値として正規化する
+    items = items_result["ItemsResult"]["Items"][:2] + [
+        {"ASIN": "B000NOREVW", "Offers": {"CurrentPrice": {"Amount": None, "Currency": "JPY"}},
+         "CustomerReviews": {"Rating": None, "ReviewCount": None}},
+        {"ASIN": "B000SLIM01"}
+    ]
+    frame = amazon_data_processor.normalize_batch(items)
+    assert len(frame) == 4
+    assert frame['review_count'].dtype == 'Int64' and frame['current_price'].dtype == 'Int64'
+    assert frame['review_count'].isna().tolist() == [False, False, True, False]
+    assert pd.isna(frame['current_price'][2]) and pd.isna(frame['rating'][2]) and frame['discount_rate'][2] == 0
+    assert list(frame['review_count'][:2]) == [item['review_count'] for item in rows[:2]]
+    print("✓ 評価・価格のない商品は欠損値")
+    
+    assert len(amazon_data_processor.normalize_batch([])) == 0
+    print("✓ 列形式正規化テスト完了\n")
+
+
+def test_normalized_item():
+    """正規化レコードテスト"""
+    print("=== 正規化レコードテスト ===")
+    
+    import pickle
+    
+    client = MockAmazonAPIClient(catalog_size=2000, seed=1)
+    result = client.search_items("Anker", item_count=10)
+    items = amazon_data_processor.normalize_search_result(result)
+    first, second = items[0], items[1]
+    
+    # 辞書と同じキーで参照できる
+    assert first['asin'] == first.get('asin') and first.get('unknown') is None
+    assert list(first.keys()) == list(NormalizedItem.__slots__)
+    assert dict(first) == first.to_dict() and 'brand' in first
+    assert isinstance(first['current_price'], int) and isinstance(first['original_price'], int)
+    print(f"✓ 辞書互換で参照（価格は整数の円）: {first['current_price']}円")
+    
+    # ブランド・通貨・在庫状況・処理日時は同じ文字列オブジェクトを共有
+    assert first['currency'] is second['currency']
+    assert first['processed_at'] is second['processed_at']
+    copied = pickle.loads(pickle.dumps(first))
+    assert copied == first and copied['availability'] is first['availability']
+    assert not hasattr(first, '__dict__')
+    print("✓ 文字列テーブルを共有（別プロセスから受け取った場合も同様）")
+    
+    # JSON保存・DataFrame変換
+    filepath = os.path.join(tempfile.mkdtemp(), 'normalized.json')
+    amazon_data_processor.save_to_json(items, filepath)
+    assert amazon_data_processor.load_from_json(filepath) == [item.to_dict() for item in items]
+    assert list(pd.DataFrame(items).columns) == list(NormalizedItem.__slots__)
+    print("✓ JSON保存・DataFrame変換")
+    
+    print("✓ 正規化レコードテスト完了\n")
+
+
+def test_parallel_normalization():
+    """並列正規化テスト"""
+    print("=== 並列正規化テスト ===")
+    
+    client = MockAmazonAPIClient(catalog_size=2000, seed=1)
+    responses = [client.search_items(keyword, item_count=10) for keyword in ("Anker", "Sony", "iPhone", "Apple")]
+    asins = [item["ASIN"] for response in responses for item in response["SearchResult"]["Items"]]
+    responses.append(client.get_items(asins[:10]))
+    
+    # 逐次処理と同じ内容を入力順に結合（取得日時は全シャード共通）
+    sequential = [
+        {**item.to_dict(), 'processed_at': None}
+        for item in amazon_data_processor.normalize_parallel(responses, max_workers=1)
+    ]
+    parallel = amazon_data_processor.normalize_parallel(iter(responses), max_workers=2, shard_size=2, min_parallel=0)
+    assert [{**item.to_dict(), 'processed_at': None} for item in parallel] == sequential
+    assert len({item['processed_at'] for item in parallel}) == 1
+    print(f"✓ 2プロセス・3シャードで正規化し入力順に結合: {len(parallel)}件")
+    
+    # 最小レスポンス数に満たない場合はプロセスプールを作成しない
+    original_executor = processor_module.ProcessPoolExecutor
+    processor_module.ProcessPoolExecutor = None
+    try:
+        small = amazon_data_processor.normalize_parallel(responses, max_workers=2, shard_size=2, min_parallel=10)
+    finally:
+        processor_module.ProcessPoolExecutor = original_executor
+    assert [{**item.to_dict(), 'processed_at': None} for item in small] == sequential
+    print("✓ 少量の入力は同一プロセスで正規化")
+    
+    frame = amazon_data_processor.normalize_parallel(
+        responses, max_workers=2, shard_size=2, columnar=True, min_parallel=0
+    )
+    assert list(frame['asin']) == [item['asin'] for item in parallel]
+    assert frame['brand'].dtype == 'category' and frame['current_price'].dtype == 'int64'
+    print("✓ 列形式で結合")
+    
+    # 保存済みファイルをプロセスごとに読み込み
+    directory = tempfile.mkdtemp()
+    filepaths = [os.path.join(directory, 'responses.jsonl.gz'), os.path.join(directory, 'items.json')]
+    amazon_data_processor.save_to_jsonl(responses[:4], filepaths[0])
+    with open(filepaths[1], 'w', encoding='utf-8') as f:
+        json.dump(responses[4], f)
+    
+    from_files = amazon_data_processor.normalize_files_parallel(filepaths, max_workers=2)
+    assert [item['asin'] for item in from_files] == [item['asin'] for item in parallel]
+    print("✓ ファイル単位で並列に読み込み・正規化")
+    
+    # バックフィルでは取得日時を指定でき、保存したレスポンスの processed_at を優先する
+    backfilled = amazon_data_processor.normalize_parallel(responses, max_workers=1, processed_at=1700000000000)
+    assert {item['processed_at'] for item in backfilled} == {1700000000000}
+    saved = [{**response, 'processed_at': '2023-08-01T09:00:00'} for response in responses[:2]] + responses[2:]
+    backfilled = amazon_data_processor.normalize_parallel(
+        saved, max_workers=2, shard_size=3, columnar=True, min_parallel=0, processed_at=1700000000000
+    )
+    saved_count = len(responses[0]['SearchResult']['Items']) + len(responses[1]['SearchResult']['Items'])
+    assert list(backfilled['processed_at']) == [1690848000000] * saved_count + [1700000000000] * (len(parallel) - saved_count)
+    print("✓ 指定した取得日時・保存時の取得日時で正規化")
+    
+    # 失敗したシャード・ファイルのみ除外し、残りの結果を返す
+    broken = [responses[0], {**responses[1], 'processed_at': 'not-a-date'}] + responses[2:]
+    partial = amazon_data_processor.normalize_parallel(broken, max_workers=2, shard_size=1, min_parallel=0)
+    expected_asins = [item['asin'] for item in parallel if item['asin'] not in
+                      {raw['ASIN'] for raw in responses[1]['SearchResult']['Items']}]
+    assert [item['asin'] for item in partial] == expected_asins
+    
+    broken_file = os.path.join(directory, 'broken.json')
+    with open(broken_file, 'w', encoding='utf-8') as f:
+        json.dump({**responses[4], 'processed_at': 'not-a-date'}, f)
+    partial = amazon_data_processor.normalize_files_parallel([filepaths[0], broken_file], max_workers=2)
+    assert len(partial) == len(parallel) - len(responses[4]['ItemsResult']['Items'])
+    print("✓ 失敗したシャード・ファイルのみ除外")
+    
+    print("✓ 並列正規化テスト完了\n")
+
+
+def test_keyword_index():
+    """転置インデックス検索テスト"""
+    print("=== 転置インデックス検索テスト ===")
+    
+    assert tokenize_query("ワイヤレス  イヤホン ワイヤレス") == ["ワイヤレス", "イヤホン"]
+    
+    index = KeywordIndex()
+    index.add(0, ["Sony ワイヤレスヘッドホン WH-1000XM4", "Sony"])
+    index.add(1, ["Anker ワイヤレスイヤホン", "Anker"])
+    index.add(2, ["Anker USB-C 急速充電器", "Anker"])
+    index.add(3, ["Google Pixel 8 Smartphone スマートフォン", "Google"])
+    
+    assert index.search("anker") == [1, 2]
+    assert index.search("ワイヤレス") == [0, 1]
+    assert index.search("ＡＮＫＥＲ") == [1, 2]
+    assert index.search("存在しない") == []
+    print("✓ 語単位・NFKC正規化で照合")
+    
+    # 部分文字列で照合し、いずれかのキーワードを含めば一致（従来の検索と同じ）
+    assert index.search("phone") == [3]
+    assert index.search("フォン") == [3]
+    assert index.search("1000xm") == [0]
+    assert index.search("Anker ワイヤレス") == [0, 1, 2]
+    print("✓ キーワードの部分文字列一致・いずれかのキーワードで一致")
+    
+    # インデックスは初回検索時に作成し、総件数は全件走査の部分文字列検索と一致する
+    client = MockAmazonAPIClient(catalog_size=5000, seed=3)
+    assert client._keyword_index is None
+    first_page = client.search_items("sony ブラック", item_count=10)["SearchResult"]
+    second_page = client.search_items("sony ブラック", item_count=10, item_page=2)["SearchResult"]
+    assert client._keyword_index is not None
+    
+    documents = [
+        (item["ItemInfo"]["Title"]["DisplayValue"], item["ItemInfo"]["ByLineInfo"]["Brand"]["DisplayValue"])
+        for item in client.mock_data["search_results"]
+    ]
+    documents.extend(client.catalog.title_at(index) for index in range(len(client.catalog)))
+    expected = len([
+        texts for texts in documents
+        if any(keyword in text.lower() for keyword in ("sony", "ブラック") for text in texts)
+    ])
+    assert first_page["TotalResultCount"] == second_page["TotalResultCount"] == expected > 10
+    for item in first_page["Items"] + second_page["Items"]:
+        title = item["ItemInfo"]["Title"]["DisplayValue"]
+        assert "Sony" in title or "ブラック" in title
+    print(f"「sony ブラック」: {first_page['TotalResultCount']}件（全件走査と一致）")
+    
+    print("✓ 転置インデックス検索テスト完了\n")
+
+
+def test_latency_and_faults():
+    """遅延分布・障害注入テスト"""
+    print("=== 遅延分布・障害注入テスト ===")
+    
+    # パーセンタイル指定の分布は指定値の範囲に収まり、中央値付近に集まる
+    latency = LatencyModel('percentile', percentiles={50: 0.08, 90: 0.2, 99: 0.8}, seed=1)
+    samples = sorted(latency.sample() for _ in range(2000))
+    assert 0.08 <= samples[0] and samples[-1] <= 0.8
+    assert 0.07 < samples[1000] < 0.1
+    
+    lognormal = LatencyModel('lognormal', median=0.1, sigma=0.5, max_seconds=1.0, seed=1)
+    samples = sorted(lognormal.sample() for _ in range(2000))
+    assert 0.09 < samples[1000] < 0.11 and samples[-1] <= 1.0
+    
+    # 注入した障害はリトライせず、実クライアントと同じ形式のエラーとして返す
+    client = MockAmazonAPIClient(latency=LatencyModel('fixed', seconds=0), fault_injector=FaultInjector(throttle_rate=1.0))
+    result = client.get_items(["B08N5WRWNW"])
+    assert 'ItemsResult' not in result
+    assert result['Errors'][0]['Code'] == 'HTTP429' and is_retryable_error(result['Errors'][0])
+    assert client.search_items("iPhone") == {}
+    assert client.get_fault_stats()['throttled'] == 2
+    
+    # 部分エラーは該当ASINを除外して Errors に格納
+    client = MockAmazonAPIClient(catalog_size=100, latency=LatencyModel('fixed', seconds=0),
+                                 fault_injector=FaultInjector(partial_error_rate=0.5, seed=1))
+    asins = [client.catalog.asin_at(i) for i in range(10)]
+    result = client.get_items(asins)
+    returned = len(result["ItemsResult"]["Items"])
+    assert 0 < returned < 10 and returned + len(result["Errors"]) == 10
+    print(f"部分エラー: {len(result['Errors'])}件 / 10件")
+    
+    # 非同期モックは待機中にイベントループを止めない
+    async_client = AsyncMockAmazonAPIClient(latency=LatencyModel('fixed', seconds=0.05))
+    
+    async def fetch_concurrently():
+        return await asyncio.gather(*(async_client.get_items(["B08N5WRWNW"]) for _ in range(20)))
+    
+    start_time = time.time()
+    results = asyncio.run(fetch_concurrently())
+    elapsed_time = time.time() - start_time
+    assert all(result["ItemsResult"]["Items"] for result in results)
+    assert elapsed_time < 0.5
+    print(f"非同期20件: {elapsed_time:.2f}秒")
+    
+    print("✓ 遅延分布・障害注入テスト完了\n")
+
+
 def test_rate_limiting():
     """レート制限テスト"""
     print("=== レート制限テスト ===")
@@ -199,6 +515,13 @@ def main():
     test_mock_item_details()
     test_mock_similar_items()
     test_data_processing()
+    test_resource_profiles()
+    test_synthetic_catalog()
+    test_columnar_normalization()
+    test_normalized_item()
+    test_parallel_normalization()
+    test_keyword_index()
+    test_latency_and_faults()
     test_rate_limiting()
     
     print("=" * 50)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+マルチマーケットプレイステストスクリプト
+マーケットプレイス別設定・並列送信・(マーケットプレイス, ASIN) での統合・キャッシュ共有をテスト
+"""
+
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.credentials import Credentials
+from amazon_api.client import AmazonAPIClient
+from amazon_api.mock_client import MockAmazonAPIClient
+from amazon_api.multi_marketplace import MultiMarketplaceClient
+from amazon_api.negative_cache import NegativeCache
+from amazon_api.quota import RequestAccounting
+from amazon_api.resources import RESOURCE_PROFILES
+from amazon_api.response_cache import ResponseCache
+from amazon_api.signer import SigV4Signer
+from amazon_api.stub_server import PAAPIStubServer
+
+
+def test_marketplace_config():
+    """マーケットプレイス別設定の上書きテスト"""
+    print("=== マーケットプレイス別設定テスト ===")
+    
+    client = AmazonAPIClient(marketplace_config={
+        'marketplace': 'www.amazon.com',
+        'host': 'webservices.amazon.com',
+        'associate_tag': 'us-tag-20',
+        'rate_limit': {'tps': 2}
+    })
+    params = client._build_common_params()
+    assert params['Marketplace'] == 'www.amazon.com'
+    assert params['PartnerTag'] == 'us-tag-20'
+    assert client.base_url == 'https://webservices.amazon.com/paapi5'
+    assert client.rate_limiter.tps == 2 and client.rate_limiter.burst == 1
+    print("✓ マーケットプレイス・ホスト・レート制限を上書き")
+    
+    jp_client = AmazonAPIClient(marketplace_config={
+        'marketplace': 'www.amazon.co.jp',
+        'host': 'webservices.amazon.co.jp'
+    })
+    assert jp_client.config['region'] == 'us-west-2'
+    assert AmazonAPIClient(marketplace_config={'region': 'us-east-1'}).config['region'] == 'us-east-1'
+    print("✓ region は未指定の場合 amazon 直下の値を引き継ぐ")
+    
+    default_client = AmazonAPIClient()
+    assert default_client._build_common_params()['Marketplace'] == 'www.amazon.co.jp'
+    assert default_client.base_url == 'https://webservices.amazon.co.jp/paapi5'
+    print("✓ 上書きなしの場合は従来どおり")
+    
+    print("✓ マーケットプレイス別設定テスト完了\n")
+
+
+def test_fan_out():
+    """並列送信と結果統合テスト"""
+    print("=== 並列送信テスト ===")
+    
+    servers = {
+        'jp': PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=200, seed=1)).start(),
+        'us': PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=200, seed=2)).start()
+    }
+    response_cache = ResponseCache()
+    negative_cache = NegativeCache()
+    clients = {}
+    for name, server in servers.items():
+        client = AmazonAPIClient(response_cache=response_cache, negative_cache=negative_cache, marketplace_config={
+            'marketplace': f"www.amazon.{'co.jp' if name == 'jp' else 'com'}",
+            'base_url': server.base_url,
+            'rate_limit': {'tps': 100, 'burst': 10, 'tpd': None}
+        })
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        clients[name] = client
+    
+    multi_client = MultiMarketplaceClient(clients)
+    try:
+        asins = [f"BZ{index:08d}" for index in range(1, 13)] + ['B0INVALID0']
+        result = multi_client.get_items(asins, resources='price_only')
+        
+        assert len(result['Items']) == 24
+        assert result['TotalResultCount'] == {'jp': 12, 'us': 12}
+        jp_item = result['Items'][('jp', 'BZ00000001')]
+        us_item = result['Items'][('us', 'BZ00000001')]
+        assert jp_item['Offers'] != us_item['Offers']
+        print(f"✓ (マーケットプレイス, ASIN) で統合: {len(result['Items'])}件")
+        
+        for server in servers.values():
+            assert server.get_stats()['requests'] == 2
+        print("✓ 各マーケットプレイスに2リクエスト（13件を10件単位に分割）")
+        
+        # 先頭10件は1回目の1リクエスト目と同じ内容
+        multi_client.get_items(asins[:10], resources='price_only', marketplaces=['us'])
+        assert servers['us'].get_stats()['requests'] == 2
+        assert response_cache.get_stats()['memory_hits'] >= 1
+        print("✓ 共有キャッシュから応答")
+        
+        searched = multi_client.search_items("Sony", item_count=3)
+        assert {name for name, _ in searched['Items']} == {'jp', 'us'}
+        print("✓ 検索も全マーケットプレイスに送信")
+        
+        assert set(multi_client.get_rate_limit_status()) == {'jp', 'us'}
+    finally:
+        multi_client.close()
+        for server in servers.values():
+            server.stop()
+    
+    print("✓ 並列送信テスト完了\n")
+
+
+def test_fan_out_job_context():
+    """並列送信でのジョブ引き継ぎテスト"""
+    print("=== ジョブ引き継ぎテスト ===")
+    
+    servers = {
+        'jp': PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=1)).start(),
+        'us': PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=2)).start()
+    }
+    accounting = RequestAccounting()
+    sent_resources = {}
+    clients = {}
+    for name, server in servers.items():
+        client = AmazonAPIClient(response_cache=ResponseCache(), request_accounting=accounting, marketplace_config={
+            'marketplace': f"www.amazon.{'co.jp' if name == 'jp' else 'com'}",
+            'base_url': server.base_url,
+            'rate_limit': {'tps': 100, 'burst': 10, 'tpd': None}
+        })
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        
+        def recording_send_request(operation, params, name=name, send_request=client._send_request):
+            sent_resources.setdefault(name, []).append(params.get('Resources', '').split(','))
+            return send_request(operation, params)
+        
+        client._send_request = recording_send_request
+        clients[name] = client
+    
+    multi_client = MultiMarketplaceClient(clients)
+    try:
+        # リソース未指定のため、ワーカースレッドでもジョブのプロファイルで要求する
+        with RequestAccounting.job('stock_update'):
+            result = multi_client.get_items(["BZ00000001", "BZ00000002"])
+        assert len(result['Items']) == 4
+        assert sent_resources == {name: [RESOURCE_PROFILES['availability']] for name in servers}
+        print(f"✓ 全マーケットプレイスで stock_update のプロファイルを送信: {sent_resources['jp'][0]}")
+        
+        for client in clients.values():
+            assert client.get_quota_usage()['by_job'] == {'stock_update': 1}
+        print("✓ ジョブ別の記録も呼び出し元のジョブに計上")
+    finally:
+        multi_client.close()
+        for server in servers.values():
+            server.stop()
+    
+    print("✓ ジョブ引き継ぎテスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("マルチマーケットプレイステストを開始します\n")
+    
+    try:
+        test_marketplace_config()
+        test_fan_out()
+        test_fan_out_job_context()
+        
+        print("🎉 すべてのテストが完了しました！")
+    
+    except Exception as e:
+        print(f"❌ テスト実行中にエラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+ネガティブキャッシュテストスクリプト
+無効ASINの指数的な再確認間隔・バッチからの除外・除外レポートをテスト
+"""
+
+import sys
+import os
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.credentials import Credentials
+from amazon_api.client import AmazonAPIClient
+from amazon_api.mock_client import MockAmazonAPIClient
+from amazon_api.negative_cache import NegativeCache
+from amazon_api.rate_limiter import TokenBucketRateLimiter
+from amazon_api.response_cache import ResponseCache
+from amazon_api.signer import SigV4Signer
+from amazon_api.stub_server import PAAPIStubServer
+
+
+def test_recheck_intervals():
+    """再確認間隔テスト"""
+    print("=== 再確認間隔テスト ===")
+    
+    db_path = os.path.join(tempfile.mkdtemp(), 'negative.db')
+    cache = NegativeCache(base_interval=100, max_interval=500, multiplier=2, db_path=db_path)
+    error = {'Code': 'ItemNotAccessible', 'Message': 'The ItemId B000000001 is not accessible.'}
+    
+    assert [cache.get_interval(n) for n in range(1, 6)] == [100, 200, 400, 500, 500]
+    
+    assert cache.record_failure('B000000001', error, now=1000) == 1100
+    assert cache.partition(['B000000001', 'B000000002'], now=1050) == (['B000000002'], ['B000000001'])
+    assert cache.partition(['B000000001'], now=1100) == (['B000000001'], [])
+    assert cache.record_failure('B000000001', error, now=1100) == 1300
+    print("✓ 連続判定ごとに再確認間隔が倍増（上限あり）")
+    
+    # 別プロセス・再起動後も保持
+    reopened = NegativeCache(base_interval=100, max_interval=500, multiplier=2, db_path=db_path)
+    report = reopened.get_report(now=1200)
+    assert report[0]['asin'] == 'B000000001' and report[0]['failures'] == 2 and report[0]['suppressed']
+    assert reopened.partition(['B000000001'], marketplace='www.amazon.com', now=1200) == (['B000000001'], [])
+    print("✓ SQLiteに永続化（マーケットプレイス別）")
+    
+    reopened.record_success(['B000000001'])
+    assert NegativeCache(db_path=db_path).get_stats()['entries'] == 0
+    print("✓ 再取得できたASINは記録から削除")
+    
+    print("✓ 再確認間隔テスト完了\n")
+
+
+def test_client_suppression():
+    """クライアントでの除外テスト"""
+    print("=== クライアント除外テスト ===")
+    
+    negative_cache = NegativeCache()
+    with PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=1)) as server:
+        client = AmazonAPIClient(
+            rate_limiter=TokenBucketRateLimiter(tps=100, burst=10, tpd=None),
+            response_cache=ResponseCache(),
+            negative_cache=negative_cache
+        )
+        client.base_url = server.base_url
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        
+        valid_asins = [f"BZ{index:08d}" for index in range(9)]
+        invalid_asins = ['B0DELISTED', 'B0INVALID0']
+        
+        result = client.get_items(valid_asins + invalid_asins, resources='price_only')
+        assert len(result['ItemsResult']['Items']) == 9
+        assert {error['ItemIds'][0] for error in result['Errors']} == set(invalid_asins)
+        assert server.get_stats()['requests'] == 2
+        print("✓ 1回目: 11件を2リクエストで取得し、無効ASINを記録")
+        
+        # 無効ASINを除外した9件は1リクエストに収まる
+        result = client.get_items(valid_asins + invalid_asins, resources='availability')
+        assert len(result['ItemsResult']['Items']) == 9
+        assert 'Errors' not in result
+        assert result['SuppressedItemIds'] == invalid_asins
+        assert server.get_stats()['requests'] == 3
+        print("✓ 2回目: 無効ASINを除外して1リクエストで取得")
+    
+    report = client.get_suppressed_report()
+    assert {entry['asin'] for entry in report} == set(invalid_asins)
+    assert all(entry['suppressed'] and entry['code'] == 'InvalidParameterValue' for entry in report)
+    assert negative_cache.get_stats() == {'entries': 2, 'suppressed': 2}
+    print(f"✓ 除外レポート: {len(report)}件")
+    
+    print("✓ クライアント除外テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("ネガティブキャッシュテストを開始します\n")
+    
+    try:
+        test_recheck_intervals()
+        test_client_suppression()
+        
+        print("🎉 すべてのテストが完了しました！")
+    
+    except Exception as e:
+        print(f"❌ テスト実行中にエラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
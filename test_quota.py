@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+クォータ管理テストスクリプト
+リクエスト数の記録（オペレーション・ジョブ・日付別）と更新計画の見積もりをテスト
+"""
+
+import sys
+import os
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.credentials import Credentials
+from amazon_api.client import AmazonAPIClient
+from amazon_api.mock_client import MockAmazonAPIClient
+from amazon_api.quota import QuotaPlanner, RequestAccounting
+from amazon_api.rate_limiter import TokenBucketRateLimiter
+from amazon_api.resources import RESOURCE_PROFILES
+from amazon_api.response_cache import ResponseCache
+from amazon_api.signer import SigV4Signer
+from amazon_api.stub_server import PAAPIStubServer
+
+
+def test_request_accounting():
+    """リクエスト記録テスト"""
+    print("=== リクエスト記録テスト ===")
+    
+    db_path = os.path.join(tempfile.mkdtemp(), 'requests.db')
+    accounting = RequestAccounting(db_path)
+    
+    with accounting.job('price_update'):
+        accounting.record('getitems', 200, 'www.amazon.co.jp')
+        accounting.record('getitems', 429, 'www.amazon.co.jp')
+        accounting.record('getitems', cache_hit=True, marketplace='www.amazon.co.jp')
+    accounting.record('searchitems', 500, 'www.amazon.com')
+    accounting.record('getitems', 200, 'www.amazon.co.jp', timestamp=0)
+    
+    # 加算はメモリに溜め、flush() でまとめて書き込む
+    assert RequestAccounting(db_path).get_daily_usage()['requests'] == 0
+    accounting.flush()
+    
+    usage = RequestAccounting(db_path).get_daily_usage()
+    assert usage['requests'] == 3
+    assert usage['throttled'] == 1 and usage['errors'] == 1 and usage['cache_hits'] == 1
+    assert usage['by_operation'] == {'getitems': 2, 'searchitems': 1}
+    assert usage['by_job'] == {'price_update': 2, '-': 1}
+    print(f"✓ 日次集計（再オープン後も保持）: {usage['by_job']}")
+    
+    assert accounting.get_daily_usage(marketplace='www.amazon.com')['requests'] == 1
+    assert accounting.get_daily_usage('1970-01-01')['requests'] == 1
+    assert len(accounting.get_history()) == 2
+    print("✓ マーケットプレイス別・日付別に集計")
+    
+    print("✓ リクエスト記録テスト完了\n")
+
+
+def test_client_accounting():
+    """クライアント経由の記録テスト"""
+    print("=== クライアント記録テスト ===")
+    
+    accounting = RequestAccounting()
+    with PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=1)) as server:
+        client = AmazonAPIClient(
+            rate_limiter=TokenBucketRateLimiter(tps=100, burst=10, tpd=None),
+            response_cache=ResponseCache(),
+            request_accounting=accounting
+        )
+        client.base_url = server.base_url
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        
+        asins = [f"BZ{index:08d}" for index in range(25)]
+        with RequestAccounting.job('stock_update'):
+            client.get_items(asins, resources='availability')
+            client.get_items(asins, resources='availability')
+        client.search_items("Sony", item_count=5)
+    
+    usage = client.get_quota_usage()
+    assert usage['by_job'] == {'stock_update': 3, '-': 1}
+    assert usage['by_operation'] == {'getitems': 3, 'searchitems': 1}
+    assert usage['cache_hits'] == 3
+    print(f"✓ HTTP送信のみ計上、キャッシュ応答は別集計: {usage['by_operation']}")
+    
+    # 当日の消費量は永続化した記録から取得（新しいプロセスのレートリミッターは未消費）
+    db_path = os.path.join(tempfile.mkdtemp(), 'requests.db')
+    previous_process = RequestAccounting(db_path)
+    for _ in range(8640):
+        previous_process.record('getitems', 200, client.marketplace)
+    previous_process.close()
+    
+    client = AmazonAPIClient(
+        rate_limiter=TokenBucketRateLimiter(tps=1, burst=1, tpd=8640),
+        request_accounting=RequestAccounting(db_path)
+    )
+    assert client.rate_limiter.get_status()['daily_used'] == 0
+    assert not client.plan_refresh(10, 'price_update')['fits_remaining_today']
+    print("✓ 更新計画はリクエスト記録の当日消費量で判定")
+    
+    print("✓ クライアント記録テスト完了\n")
+
+
+def test_job_resource_profile():
+    """ジョブ別リソースプロファイルの送信テスト"""
+    print("=== ジョブ別リソーステスト ===")
+    
+    sent_resources = []
+    with PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=1)) as server:
+        client = AmazonAPIClient(
+            rate_limiter=TokenBucketRateLimiter(tps=100, burst=10, tpd=None),
+            response_cache=ResponseCache(),
+            request_accounting=RequestAccounting()
+        )
+        client.base_url = server.base_url
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        
+        original_send_request = client._send_request
+        
+        def recording_send_request(operation, params):
+            sent_resources.append(params.get('Resources', '').split(','))
+            return original_send_request(operation, params)
+        
+        client._send_request = recording_send_request
+        
+        # リソース未指定でも amazon.resources.jobs のプロファイルで要求する
+        with RequestAccounting.job('stock_update'):
+            items = client.get_items(["BZ00000001", "BZ00000002"])
+        assert sent_resources == [RESOURCE_PROFILES['availability']]
+        assert items and all('ItemInfo' not in item for item in items)
+        print(f"✓ stock_update: {sent_resources[0]}")
+        
+        # ジョブ外では既定プロファイル
+        client.get_items(["BZ00000003"])
+        default_profile = client.config.get('resources', {}).get('default_profile')
+        assert sent_resources[1] == RESOURCE_PROFILES[default_profile]
+        print(f"✓ ジョブ未指定: {default_profile}")
+    
+    print("✓ ジョブ別リソーステスト完了\n")
+
+
+def test_plan_refresh():
+    """更新計画の見積もりテスト"""
+    print("=== 更新計画テスト ===")
+    
+    planner = QuotaPlanner(tps=1, burst=1, tpd=8640, intervals={'price_update': 86400, 'stock_update': 3600})
+    
+    plan = planner.plan_refresh(10000, 'price_update')
+    assert plan['requests'] == 1000 and plan['duration_seconds'] == 999
+    assert plan['daily_requests'] == 1000 and plan['fits']
+    print(f"✓ 価格更新 10000件: {plan['requests']}リクエスト / {plan['duration_seconds']}秒")
+    
+    plan = planner.plan_refresh(10000, 'stock_update')
+    assert plan['fits_interval'] and not plan['fits_daily_limit'] and not plan['fits']
+    assert plan['daily_requests'] == 24000
+    assert plan['max_watchlist_size'] == 3600
+    print(f"✓ 在庫更新 10000件は日次上限超過（上限 {plan['max_watchlist_size']}件）")
+    
+    assert not planner.plan_refresh(10000, 'price_update', used_today=8000)['fits_remaining_today']
+    assert planner.plan_refresh(10000, 'price_update', chunk_size=5)['requests'] == 2000
+    
+    schedule = planner.plan_schedule({'price_update': 10000, 'stock_update': 3000})
+    assert schedule['daily_requests'] == 1000 + 7200
+    assert schedule['fits']
+    schedule = planner.plan_schedule({'price_update': 10000, 'stock_update': 3600})
+    assert not schedule['fits_daily_limit']
+    print("✓ ジョブ合算で日次上限を判定")
+    
+    planner = QuotaPlanner.from_config(
+        {'rate_limit': {'tps': 2, 'burst': 5, 'tpd': None}},
+        {'stock_update_interval': 3600, 'analysis_interval': 604800}
+    )
+    assert planner.intervals == {'stock_update': 3600, 'analysis': 604800}
+    plan = planner.plan_refresh(100000, 'stock_update')
+    assert plan['duration_seconds'] == 4997.5 and not plan['fits_interval']
+    print("✓ 設定から作成（TPD無制限時は実行間隔のみで判定）")
+    
+    print("✓ 更新計画テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("クォータ管理テストを開始します\n")
+    
+    try:
+        test_request_accounting()
+        test_client_accounting()
+        test_job_resource_profile()
+        test_plan_refresh()
+        
+        print("🎉 すべてのテストが完了しました！")
+    
+    except Exception as e:
+        print(f"❌ テスト実行中にエラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
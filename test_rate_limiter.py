@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+レートリミッターテストスクリプト
+トークンバケットのTPS・バースト・TPD制御とプロセス間共有をテスト
+"""
+
+import sys
+import os
+import sqlite3
+import time
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_api.rate_limiter import TokenBucketRateLimiter, RateLimitExceeded
+
+
+def test_burst_and_refill():
+    """バースト・補充テスト"""
+    print("=== バースト・補充テスト ===")
+    
+    limiter = TokenBucketRateLimiter(tps=20, burst=3, tpd=None)
+    
+    # バースト分は待機なしで取得できる
+    for _ in range(3):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    
+    # 次のトークンまでの待ち時間は1/TPS以内
+    wait_time = limiter.get_wait_time()
+    print(f"待ち時間: {wait_time:.3f}秒")
+    assert 0 < wait_time <= 0.05
+    
+    start_time = time.time()
+    limiter.acquire()
+    elapsed_time = time.time() - start_time
+    print(f"実際の待機: {elapsed_time:.3f}秒")
+    assert elapsed_time < 0.2
+    
+    print("✓ バースト・補充テスト完了\n")
+
+
+def test_daily_limit():
+    """日次上限テスト"""
+    print("=== 日次上限テスト ===")
+    
+    limiter = TokenBucketRateLimiter(tps=1000, burst=10, tpd=2)
+    
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    
+    status = limiter.get_status()
+    print(f"状態: {status}")
+    assert status['daily_used'] == 2
+    assert status['daily_remaining'] == 0
+    assert status['wait_time'] > 0
+    
+    try:
+        limiter.acquire(timeout=0.1)
+        raise AssertionError("日次上限到達時にタイムアウトしませんでした")
+    except RateLimitExceeded as e:
+        print(f"✓ 日次上限で停止: {e}")
+    
+    print("✓ 日次上限テスト完了\n")
+
+
+def test_shared_bucket():
+    """SQLite共有バケットテスト"""
+    print("=== SQLite共有バケットテスト ===")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_path = os.path.join(temp_dir, 'rate_limit.db')
+        
+        # 同じファイルを参照するリミッターはトークンを共有する
+        worker_a = TokenBucketRateLimiter(tps=0.01, burst=2, tpd=None, state_path=state_path)
+        worker_b = TokenBucketRateLimiter(tps=0.01, burst=2, tpd=None, state_path=state_path)
+        
+        assert worker_a.try_acquire()
+        assert worker_b.try_acquire()
+        assert not worker_a.try_acquire()
+        assert not worker_b.try_acquire()
+        print(f"共有トークン残量: {worker_a.get_token_level():.3f}")
+        
+        # 待ち時間・状態の参照は書き込みロックを取らない（他プロセスの取得中も待たされない）
+        other_process = sqlite3.connect(state_path, isolation_level=None)
+        other_process.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.monotonic()
+            assert worker_a.get_wait_time() > 0
+            assert worker_a.get_status()['tokens'] < 1
+            assert time.monotonic() - started < 1
+        finally:
+            other_process.execute("ROLLBACK")
+            other_process.close()
+        print("✓ 待ち時間の参照は読み取りのみ")
+    
+    print("✓ SQLite共有バケットテスト完了\n")
+
+
+def test_invalid_request_and_async():
+    """取得不能な要求・非同期取得テスト"""
+    print("=== 取得不能な要求・非同期取得テスト ===")
+    
+    import asyncio
+    
+    limiter = TokenBucketRateLimiter(tps=100, burst=2, tpd=None)
+    for acquire in (lambda: limiter.acquire(3), lambda: asyncio.run(limiter.acquire_async(3))):
+        try:
+            acquire()
+            raise AssertionError("バケット容量を超える要求が拒否されませんでした")
+        except ValueError as e:
+            print(f"✓ バケット容量を超える要求を拒否: {e}")
+    
+    for create in (lambda: TokenBucketRateLimiter(tps=0), lambda: TokenBucketRateLimiter.from_config({'tps': 0})):
+        try:
+            create()
+            raise AssertionError("tps=0 が拒否されませんでした")
+        except ValueError as e:
+            print(f"✓ tps=0 を拒否: {e}")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        limiter = TokenBucketRateLimiter(
+            tps=100, burst=1, tpd=None, state_path=os.path.join(temp_dir, 'rate_limit.db')
+        )
+        
+        async def run():
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            
+            task = asyncio.ensure_future(ticker())
+            waited = [await limiter.acquire_async() for _ in range(3)]
+            task.cancel()
+            return waited, ticks
+        
+        waited, ticks = asyncio.run(run())
+        assert waited[0] == 0.0 and ticks > 0
+        print("✓ SQLite共有バケットの非同期取得中も他のコルーチンが動作")
+    
+    print("✓ 取得不能な要求・非同期取得テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("レートリミッターテスト")
+    print("=" * 50)
+    
+    # 各テストを実行
+    test_burst_and_refill()
+    test_daily_limit()
+    test_shared_bucket()
+    test_invalid_request_and_async()
+    
+    print("=" * 50)
+    print("✓ レートリミッターテスト完了！")
+
+
+if __name__ == "__main__":
+    main()
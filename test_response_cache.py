@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+レスポンスキャッシュテストスクリプト
+メモリ層・SQLite層・TTL・クライアント連携をテスト
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_api.client import AmazonAPIClient
+from amazon_api.response_cache import ResponseCache
+
+
+def test_memory_and_disk_tiers():
+    """メモリ層・SQLite層テスト"""
+    print("=== メモリ層・SQLite層テスト ===")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'cache.db')
+        params = {'ItemIds': 'B000000002,B000000001', 'Marketplace': 'www.amazon.co.jp'}
+        response = {"ItemsResult": {"Items": [{"ASIN": "B000000001"}]}}
+        
+        cache = ResponseCache(ttls={'getitems': 60}, db_path=db_path)
+        assert cache.get('getitems', params) is None
+        cache.set('getitems', params, response)
+        
+        # ItemIdsの順序に依存しない
+        reordered = {'Marketplace': 'www.amazon.co.jp', 'ItemIds': 'B000000001,B000000002'}
+        assert cache.get('getitems', reordered) == response
+        
+        # 再起動後もSQLite層から取得できる
+        restarted = ResponseCache(ttls={'getitems': 60}, db_path=db_path)
+        assert restarted.get('getitems', params) == response
+        assert restarted.get('getitems', params) == response
+        
+        stats = restarted.get_stats()
+        print(f"統計: {stats}")
+        assert stats['disk_hits'] == 1
+        assert stats['memory_hits'] == 1
+    
+    print("✓ メモリ層・SQLite層テスト完了\n")
+
+
+def test_ttl_expiry():
+    """TTL失効テスト"""
+    print("=== TTL失効テスト ===")
+    
+    cache = ResponseCache(ttls={'searchitems': 1, 'getsimilaritems': 0}, memory_max_entries=2)
+    cache.set('searchitems', {'Keywords': 'iPhone'}, {"SearchResult": {"Items": []}})
+    cache.set('getsimilaritems', {'ItemId': 'B000000001'}, {"SimilarItemsResult": {"Items": []}})
+    
+    assert cache.get('searchitems', {'Keywords': 'iPhone'}) is not None
+    assert cache.get('getsimilaritems', {'ItemId': 'B000000001'}) is None
+    
+    time.sleep(1.1)
+    assert cache.get('searchitems', {'Keywords': 'iPhone'}) is None
+    
+    print("✓ TTL失効テスト完了\n")
+
+
+def test_client_cache_hit_skips_request():
+    """クライアントのキャッシュヒットテスト（実際のAPI呼び出しなし）"""
+    print("=== クライアントキャッシュヒットテスト ===")
+    
+    class FakeResponse:
+        status_code = 200
+        text = ''
+        
+        def json(self):
+            return {"SearchResult": {"Items": [{"ASIN": "B000000001"}]}}
+    
+    sent_requests = []
+    
+    def fake_send_request(operation, params):
+        sent_requests.append(operation)
+        return FakeResponse()
+    
+    client = AmazonAPIClient(response_cache=ResponseCache(ttls={'searchitems': 60}))
+    client._send_request = fake_send_request
+    
+    first = client.search_items("iPhone")
+    second = client.search_items("iPhone")
+    
+    assert first == second
+    assert sent_requests == ['searchitems']
+    print(f"キャッシュ統計: {client.get_cache_stats()}")
+    
+    print("✓ クライアントキャッシュヒットテスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("レスポンスキャッシュテスト")
+    print("=" * 50)
+    
+    # 各テストを実行
+    test_memory_and_disk_tiers()
+    test_ttl_expiry()
+    test_client_cache_hit_skips_request()
+    
+    print("=" * 50)
+    print("✓ レスポンスキャッシュテスト完了！")
+
+
+if __name__ == "__main__":
+    main()
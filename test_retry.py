@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+リトライ制御テストスクリプト
+バックオフ計算・Retry-After・サーキットブレーカー・クライアントのリトライをテスト
+"""
+
+import sys
+import os
+import time
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_api.client import AmazonAPIClient
+from amazon_api.retry import (
+    APIRequestError, CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+)
+
+
+class FakeResponse:
+    """テスト用レスポンス"""
+    
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.text = str(body)
+        self.headers = headers or {}
+        self._body = body
+    
+    def json(self):
+        return self._body
+
+
+def test_backoff_and_retry_after():
+    """バックオフ計算テスト"""
+    print("=== バックオフ計算テスト ===")
+    
+    policy = RetryPolicy(retry_attempts=3, retry_delay=1, max_delay=4, jitter=False)
+    delays = [policy.get_delay(attempt) for attempt in range(1, 5)]
+    print(f"待機秒数: {delays}")
+    assert delays == [1, 2, 4, 4]
+    
+    # Retry-Afterはバックオフより優先して尊重する
+    assert policy.get_delay(1, retry_after=10) == 10
+    
+    # 上限を超えるRetry-Afterには従わず、リトライしない
+    assert RetryPolicy(max_retry_after=60).get_delay(1, retry_after=3600) is None
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('invalid') is None
+    
+    assert policy.is_retryable(APIRequestError(429))
+    assert policy.is_retryable(APIRequestError(503))
+    assert not policy.is_retryable(APIRequestError(400))
+    
+    print("✓ バックオフ計算テスト完了\n")
+
+
+def test_circuit_breaker():
+    """サーキットブレーカーテスト"""
+    print("=== サーキットブレーカーテスト ===")
+    
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_wait_time() > 0
+    
+    try:
+        breaker.check(max_wait=0.01)
+        raise AssertionError("オープン中に例外が送出されませんでした")
+    except CircuitOpenError as e:
+        print(f"✓ オープン中は停止: {e}")
+    
+    time.sleep(0.25)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    
+    print("✓ サーキットブレーカーテスト完了\n")
+
+
+def test_client_retries_throttling():
+    """クライアントのリトライテスト（実際のAPI呼び出しなし）"""
+    print("=== クライアントリトライテスト ===")
+    
+    client = AmazonAPIClient(circuit_breaker=CircuitBreaker(failure_threshold=10))
+    client.response_cache = None
+    client.retry_policy = RetryPolicy(retry_attempts=2, retry_delay=0.01, jitter=False)
+    
+    # 一時的なスロットリングはリトライして成功する
+    responses = [
+        FakeResponse(429, 'TooManyRequests', {'Retry-After': '0'}),
+        FakeResponse(503, 'ServiceUnavailable'),
+        FakeResponse(200, {"SimilarItemsResult": {"Items": [{"ASIN": "B000000001"}]}})
+    ]
+    client._send_request = lambda operation, params: responses.pop(0)
+    result = client.get_similar_items("B000000001")
+    assert result["SimilarItemsResult"]["Items"][0]["ASIN"] == "B000000001"
+    assert not responses
+    
+    # 恒久的なエラーはリトライしない
+    sent_requests = []
+    
+    def fake_send_request(operation, params):
+        sent_requests.append(operation)
+        return FakeResponse(400, 'InvalidParameterValue')
+    
+    client._send_request = fake_send_request
+    assert client.get_similar_items("INVALID") == {}
+    assert len(sent_requests) == 1
+    print("✓ 恒久的なエラーは1回で終了")
+    
+    print("✓ クライアントリトライテスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("リトライ制御テスト")
+    print("=" * 50)
+    
+    # 各テストを実行
+    test_backoff_and_retry_after()
+    test_circuit_breaker()
+    test_client_retries_throttling()
+    
+    print("=" * 50)
+    print("✓ リトライ制御テスト完了！")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+SigV4署名テストスクリプト
+botocoreとの署名一致・署名キーのキャッシュ・認証情報の再利用をテスト
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from amazon_api.signer import SigV4Signer
+
+
+def test_matches_botocore():
+    """botocoreとの署名一致テスト"""
+    print("=== botocore署名一致テスト ===")
+    
+    url = "https://webservices.amazon.co.jp/paapi5/searchitems"
+    params = {
+        'Keywords': 'ワイヤレス イヤホン',
+        'ItemCount': 10,
+        'Marketplace': 'www.amazon.co.jp',
+        'PartnerTag': 'test-22'
+    }
+    
+    for token in (None, 'session-token'):
+        credentials = Credentials('AKIDEXAMPLE', 'secret', token)
+        
+        request = AWSRequest(method='GET', url=url, params=params)
+        SigV4Auth(credentials, 'execute-api', 'us-east-1').add_auth(request)
+        now = datetime.strptime(request.headers['X-Amz-Date'], '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+        
+        signer = SigV4Signer(lambda: credentials, region='us-east-1', service='execute-api')
+        signed_url, headers = signer.sign('GET', url, params, now=now)
+        
+        assert headers['Authorization'] == request.headers['Authorization']
+        assert signed_url.startswith(url + '?ItemCount=10&Keywords=')
+        print(f"✓ 署名一致 (token={'あり' if token else 'なし'})")
+    
+    print("✓ botocore署名一致テスト完了\n")
+
+
+def test_credentials_and_key_cached():
+    """認証情報・署名キーのキャッシュテスト"""
+    print("=== キャッシュテスト ===")
+    
+    resolved = []
+    
+    def credentials_provider():
+        resolved.append(True)
+        return Credentials('AKIDEXAMPLE', 'secret')
+    
+    signer = SigV4Signer(credentials_provider)
+    first_day = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    signer.sign('GET', 'https://example.com/paapi5/getitems', {'ItemIds': 'B000000001'}, now=first_day)
+    key = signer._signing_key_cache[('secret', '20240101')]
+    signer.sign('GET', 'https://example.com/paapi5/getitems', {'ItemIds': 'B000000002'}, now=first_day)
+    
+    assert len(resolved) == 1
+    assert signer._signing_key_cache[('secret', '20240101')] is key
+    
+    # 日付が変わると署名キーを再生成する
+    signer.sign('GET', 'https://example.com/paapi5/getitems', None, now=datetime(2024, 1, 2, tzinfo=timezone.utc))
+    assert list(signer._signing_key_cache) == [('secret', '20240102')]
+    
+    print("✓ キャッシュテスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("SigV4署名テスト")
+    print("=" * 50)
+    
+    # 各テストを実行
+    test_matches_botocore()
+    test_credentials_and_key_cached()
+    
+    print("=" * 50)
+    print("✓ SigV4署名テスト完了！")
+
+
+if __name__ == "__main__":
+    main()
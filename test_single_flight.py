@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+リクエスト集約テストスクリプト
+同一ASINの同時要求の共有・単発要求のバッチ統合をテスト
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from amazon_api.quota import RequestAccounting
+from amazon_api.single_flight import CoalescingItemFetcher
+
+
+class FakeClient:
+    """get_items の呼び出しを記録するテスト用クライアント"""
+    
+    GET_ITEMS_MAX_IDS = 10
+    
+    def __init__(self, invalid_asins=()):
+        self.calls = []
+        self.invalid_asins = set(invalid_asins)
+        self._lock = threading.Lock()
+    
+    def get_items(self, asins, resources=None):
+        with self._lock:
+            self.calls.append(list(asins))
+        time.sleep(0.05)
+        result = {"ItemsResult": {"Items": [{"ASIN": asin} for asin in asins if asin not in self.invalid_asins]}}
+        errors = [
+            {"Code": "InvalidParameterValue", "Message": f"The ItemId {asin} provided in the request is invalid."}
+            for asin in asins if asin in self.invalid_asins
+        ]
+        if errors:
+            result["Errors"] = errors
+        return result
+
+
+def test_concurrent_duplicates_share_request():
+    """同一ASINの同時要求の共有テスト"""
+    print("=== 同時要求共有テスト ===")
+    
+    client = FakeClient()
+    fetcher = CoalescingItemFetcher(client, batch_window=0.05)
+    asins = ["B000000001", "B000000002", "B000000003"]
+    
+    # 価格・在庫・競合ジョブが同じASINを同時に要求
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda _: fetcher.get_items(asins), range(3)))
+    fetcher.close()
+    
+    for result in results:
+        assert [item["ASIN"] for item in result["ItemsResult"]["Items"]] == asins
+    assert client.calls == [asins]
+    print(f"統計: {fetcher.get_stats()}")
+    assert fetcher.get_stats()['coalesced'] == 6
+    
+    print("✓ 同時要求共有テスト完了\n")
+
+
+def test_single_requests_batched():
+    """単発要求のバッチ統合テスト"""
+    print("=== バッチ統合テスト ===")
+    
+    client = FakeClient(invalid_asins={"B000000013"})
+    fetcher = CoalescingItemFetcher(client, batch_window=0.1)
+    asins = [f"B{i:09d}" for i in range(15)]
+    
+    with ThreadPoolExecutor(max_workers=15) as executor:
+        results = list(executor.map(lambda asin: fetcher.get_items([asin]), asins))
+    fetcher.close()
+    
+    print(f"送信バッチ: {[len(call) for call in client.calls]}")
+    assert sorted(len(call) for call in client.calls) == [5, 10]
+    assert results[1]["ItemsResult"]["Items"] == [{"ASIN": "B000000001"}]
+    
+    # 無効なASINのエラーは該当する要求にのみ返す
+    assert results[13]["ItemsResult"]["Items"] == []
+    assert results[13]["Errors"][0]["Code"] == "InvalidParameterValue"
+    assert "Errors" not in results[12]
+    
+    print("✓ バッチ統合テスト完了\n")
+
+
+class JobRecordingClient(FakeClient):
+    """送信時のジョブを記録し、古いキャッシュ・ネガティブキャッシュの結果を返すテスト用クライアント"""
+    
+    def __init__(self, stale_asins=(), suppressed_asins=()):
+        super().__init__()
+        self.request_accounting = RequestAccounting()
+        self.jobs = []
+        self.stale_asins = list(stale_asins)
+        self.suppressed_asins = set(suppressed_asins)
+    
+    def get_items(self, asins, resources=None):
+        self.jobs.append(self.request_accounting.current_job())
+        result = super().get_items([asin for asin in asins if asin not in self.suppressed_asins], resources)
+        stale_asins = [asin for asin in asins if asin in self.stale_asins]
+        if stale_asins:
+            result["Stale"] = {"AgeSeconds": 120.0, "StoredAt": 1700000000.0, "ItemIds": stale_asins}
+        suppressed = [asin for asin in asins if asin in self.suppressed_asins]
+        if suppressed:
+            result["SuppressedItemIds"] = suppressed
+        return result
+
+
+def test_job_context_and_result_metadata():
+    """ジョブ別の集約と結果の付加情報テスト"""
+    print("=== ジョブ別集約テスト ===")
+    
+    client = JobRecordingClient(stale_asins={"B000000002"}, suppressed_asins={"B000000003"})
+    fetcher = CoalescingItemFetcher(client, batch_window=0.1)
+    asins = ["B000000001", "B000000002", "B000000003"]
+    
+    def fetch(job):
+        with RequestAccounting.job(job):
+            return fetcher.get_items(asins)
+    
+    # ジョブが異なる同時要求は集約せず、それぞれのジョブで送信する
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(fetch, ["price_update", "stock_update"]))
+    fetcher.close()
+    
+    assert sorted(client.jobs) == ["price_update", "stock_update"]
+    assert fetcher.get_stats()['coalesced'] == 0
+    print(f"✓ ジョブごとに送信: {client.jobs}")
+    
+    for result in results:
+        assert [item["ASIN"] for item in result["ItemsResult"]["Items"]] == ["B000000001", "B000000002"]
+        assert result["SuppressedItemIds"] == ["B000000003"]
+        assert "Errors" not in result
+        assert result["Stale"] == {"AgeSeconds": 120.0, "StoredAt": 1700000000.0, "ItemIds": ["B000000002"]}
+    print("✓ SuppressedItemIds・Stale を各要求の結果に引き継ぐ")
+    
+    print("✓ ジョブ別集約テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("リクエスト集約テスト")
+    print("=" * 50)
+    
+    # 各テストを実行
+    test_concurrent_duplicates_share_request()
+    test_single_requests_batched()
+    test_job_context_and_result_metadata()
+    
+    print("=" * 50)
+    print("✓ リクエスト集約テスト完了！")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+stale-while-revalidate テストスクリプト
+スロットリング中の古いキャッシュ応答（経過時間付き）とバックグラウンド再取得をテスト
+"""
+
+import sys
+import os
+import time
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.credentials import Credentials
+from amazon_api.client import AmazonAPIClient
+from amazon_api.mock_client import MockAmazonAPIClient
+from amazon_api.rate_limiter import TokenBucketRateLimiter
+from amazon_api.response_cache import ResponseCache
+from amazon_api.retry import APIRequestError
+from amazon_api.revalidation import BackgroundRevalidator
+from amazon_api.signer import SigV4Signer
+from amazon_api.stub_server import PAAPIStubServer
+
+
+def test_revalidator_backoff():
+    """再取得の重複排除・再試行テスト"""
+    print("=== 再取得キューテスト ===")
+    
+    calls = []
+    
+    def fetch(operation, params):
+        calls.append(params['n'])
+        # クォータ回復まで2回失敗
+        if len(calls) <= 2:
+            raise APIRequestError(429, 'throttled')
+        return {}
+    
+    revalidator = BackgroundRevalidator(fetch, retry_delay=0.05, max_retry_delay=0.1)
+    assert revalidator.submit('key1', 'getitems', {'n': 1})
+    assert not revalidator.submit('key1', 'getitems', {'n': 1})
+    assert revalidator.wait_idle(timeout=5)
+    
+    stats = revalidator.get_stats()
+    assert calls == [1, 1, 1]
+    assert stats == {'queued': 1, 'refreshed': 1, 'failed': 2, 'abandoned': 0, 'dropped': 0, 'pending': 0}
+    print(f"✓ 同一キーは1件にまとめ、失敗時は待機を延ばして再試行: {stats}")
+    
+    # 恒久的なエラーは再試行せずに破棄
+    def reject(operation, params):
+        calls.append(params['n'])
+        raise APIRequestError(400, 'InvalidParameterValue')
+    
+    calls.clear()
+    rejecting = BackgroundRevalidator(reject, retry_delay=0.05, max_retry_delay=0.1)
+    assert rejecting.submit('key3', 'getitems', {'n': 3})
+    assert rejecting.wait_idle(timeout=5)
+    assert calls == [3]
+    assert rejecting.get_stats()['abandoned'] == 1 and rejecting.get_stats()['failed'] == 0
+    rejecting.close()
+    print("✓ 恒久的なエラーは再試行しない")
+    
+    revalidator.close()
+    assert not revalidator.submit('key2', 'getitems', {'n': 2})
+    print("✓ 停止後は登録しない")
+    
+    print("✓ 再取得キューテスト完了\n")
+
+
+def test_client_serves_stale():
+    """スロットリング中の古いキャッシュ応答テスト"""
+    print("=== 古いキャッシュ応答テスト ===")
+    
+    rate_limiter = TokenBucketRateLimiter(tps=1, burst=1, tpd=None)
+    cache = ResponseCache(ttls={'getitems': 1}, stale_ttl=3600)
+    with PAAPIStubServer(mock_client=MockAmazonAPIClient(catalog_size=100, seed=1)) as server:
+        client = AmazonAPIClient(rate_limiter=rate_limiter, response_cache=cache)
+        client.base_url = server.base_url
+        client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+        client.negative_cache = None
+        client.swr_config = {'enabled': True, 'wait_threshold': 0.5, 'retry_delay': 0.1}
+        
+        asins = [f"BZ{index:08d}" for index in range(5)]
+        result = client.get_items(asins, resources='price_only')
+        assert len(result['ItemsResult']['Items']) == 5 and 'Stale' not in result
+        
+        # キャッシュ期限切れ・トークン枯渇の状態にする
+        time.sleep(1.1)
+        assert rate_limiter.try_acquire()
+        
+        started = time.monotonic()
+        result = client.get_items(asins, resources='price_only')
+        assert time.monotonic() - started < 0.5
+        assert len(result['ItemsResult']['Items']) == 5
+        assert result['Stale']['ItemIds'] == asins
+        assert result['Stale']['AgeSeconds'] >= 1
+        assert server.get_stats()['requests'] == 1
+        print(f"✓ トークン待ちをせず古いキャッシュで応答（経過 {result['Stale']['AgeSeconds']}秒）")
+        
+        # トークン回復後にバックグラウンドで再取得
+        assert client.revalidator.wait_idle(timeout=10)
+        assert server.get_stats()['requests'] == 2
+        assert client.get_revalidation_stats()['refreshed'] == 1
+        
+        result = client.get_items(asins, resources='price_only')
+        assert 'Stale' not in result
+        assert server.get_stats()['requests'] == 2
+        print("✓ 再取得した最新データをキャッシュから返す")
+        
+        client.close()
+    
+    print("✓ 古いキャッシュ応答テスト完了\n")
+
+
+def test_stale_only_for_transient_errors():
+    """一時的な失敗のみ古いキャッシュで応答するテスト"""
+    print("=== 失敗時の古いキャッシュ応答テスト ===")
+    
+    cache = ResponseCache(ttls={'searchitems': 1}, stale_ttl=3600)
+    client = AmazonAPIClient(rate_limiter=TokenBucketRateLimiter(tps=100, burst=10, tpd=None), response_cache=cache)
+    client.swr_config = {'enabled': True, 'retry_delay': 60}
+    params = {'Keywords': 'Sony'}
+    cache.set('searchitems', params, {'SearchResult': {'Items': [{'ASIN': 'B000000001'}]}})
+    time.sleep(1.1)
+    
+    def failing_fetch(status):
+        def fetch_json(operation, params, store=True):
+            raise APIRequestError(status, 'error')
+        return fetch_json
+    
+    client._fetch_json = failing_fetch(503)
+    result = client._request_json('searchitems', params)
+    assert result['SearchResult']['Items'] == [{'ASIN': 'B000000001'}] and 'Stale' in result
+    print("✓ 503は古いキャッシュで応答")
+    
+    for status in (400, 401, 403):
+        client._fetch_json = failing_fetch(status)
+        try:
+            client._request_json('searchitems', params)
+            assert False, f"{status}は呼び出し元に返す"
+        except APIRequestError as e:
+            assert e.status_code == status
+    print("✓ 400/401/403は古いキャッシュで隠さない")
+    
+    client.close()
+    print("✓ 失敗時の古いキャッシュ応答テスト完了\n")
+
+
+def test_disabled_without_stale_ttl():
+    """無効時の動作テスト"""
+    print("=== 無効時テスト ===")
+    
+    cache = ResponseCache(ttls={'getitems': 1})
+    cache._memory[cache.make_key('getitems', {'ItemIds': 'B000000001'})] = (0, 1, {'ItemsResult': {}})
+    assert cache.get_stale('getitems', {'ItemIds': 'B000000001'}) is None
+    print("✓ stale_ttl未設定の場合は期限切れのデータを返さない")
+    
+    print("✓ 無効時テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("stale-while-revalidate テストを開始します\n")
+    
+    try:
+        test_revalidator_backoff()
+        test_client_serves_stale()
+        test_stale_only_for_transient_errors()
+        test_disabled_without_stale_ttl()
+        
+        print("🎉 すべてのテストが完了しました！")
+    
+    except Exception as e:
+        print(f"❌ テスト実行中にエラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+PA-APIスタブサーバーテストスクリプト
+実クライアントからの署名付きリクエスト・レート制限・記録と再生をテスト
+"""
+
+import sys
+import os
+import tempfile
+
+import requests
+
+# srcディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from botocore.credentials import Credentials
+from amazon_api.client import AmazonAPIClient
+from amazon_api.mock_client import MockAmazonAPIClient
+from amazon_api.rate_limiter import TokenBucketRateLimiter
+from amazon_api.response_cache import ResponseCache
+from amazon_api.signer import SigV4Signer
+from amazon_api.stub_server import PAAPIStubServer, make_recording_key
+
+
+def create_client(server: PAAPIStubServer) -> AmazonAPIClient:
+    """スタブサーバーに向けた実クライアントを作成"""
+    client = AmazonAPIClient(rate_limiter=TokenBucketRateLimiter(tps=1000, burst=100, tpd=None))
+    client.base_url = server.base_url
+    client.response_cache = None
+    client.signer = SigV4Signer(lambda: Credentials('AKIDEXAMPLE', 'secret'))
+    return client
+
+
+def test_synthetic_mode():
+    """合成カタログ応答テスト"""
+    print("=== syntheticモードテスト ===")
+    
+    mock_client = MockAmazonAPIClient(catalog_size=1000, seed=7)
+    with PAAPIStubServer(mock_client=mock_client) as server:
+        client = create_client(server)
+        
+        result = client.search_items("Sony", item_count=5)
+        items = result['SearchResult']['Items']
+        assert len(items) == 5
+        assert all('Sony' in item['ItemInfo']['Title']['DisplayValue'] for item in items)
+        print(f"✓ SearchItems: {result['SearchResult']['TotalResultCount']}件中{len(items)}件")
+        
+        # 合成カタログの商品のみ詳細を持つ
+        asins = [item['ASIN'] for item in items if item['ASIN'].startswith('BZ')]
+        result = client.get_items(asins)
+        assert [item['ASIN'] for item in result['ItemsResult']['Items']] == asins
+        print("✓ GetItems")
+        
+        stats = server.get_stats()
+        assert stats['requests'] == 2 and stats['statuses'] == {200: 2}
+        assert [record['operation'] for record in server.get_request_log()] == ['searchitems', 'getitems']
+        print(f"✓ リクエスト記録: p50={stats['p50_ms']}ms")
+    
+    print("✓ syntheticモードテスト完了\n")
+
+
+def test_signature_and_rate_limit():
+    """署名必須・レート制限テスト"""
+    print("=== 署名・レート制限テスト ===")
+    
+    mock_client = MockAmazonAPIClient(catalog_size=100, seed=1)
+    rate_limiter = TokenBucketRateLimiter(tps=0.001, burst=2, tpd=None)
+    with PAAPIStubServer(mock_client=mock_client, rate_limiter=rate_limiter) as server:
+        url = f"{server.base_url}/searchitems"
+        
+        response = requests.get(url, params={'Keywords': 'Sony'})
+        assert response.status_code == 401
+        print("✓ 署名なしのリクエストは401")
+        
+        headers = {'Authorization': 'AWS4-HMAC-SHA256 Credential=test'}
+        statuses = [requests.get(url, params={'Keywords': 'Sony'}, headers=headers).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+        assert response.headers['Content-Type'].startswith('application/json')
+        print(f"✓ バースト超過で429: {statuses}")
+    
+    print("✓ 署名・レート制限テスト完了\n")
+
+
+def test_record_and_replay():
+    """記録と再生テスト"""
+    print("=== 記録・再生テスト ===")
+    
+    recordings_path = os.path.join(tempfile.mkdtemp(), 'recordings.jsonl')
+    mock_client = MockAmazonAPIClient(catalog_size=500, seed=3)
+    
+    # 合成サーバーを上流とみなして記録
+    with PAAPIStubServer(mock_client=mock_client) as upstream:
+        upstream_client = create_client(upstream)
+        upstream_client.response_cache = ResponseCache()
+        with PAAPIStubServer(mode='record', recordings_path=recordings_path,
+                             upstream_client=upstream_client) as recorder:
+            client = create_client(recorder)
+            recorded = client.search_items("Anker", item_count=3)
+            recorded_asins = [item['ASIN'] for item in recorded['SearchResult']['Items']]
+            recorded_items = client.get_items(recorded_asins)
+    
+    with open(recordings_path, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+    print("✓ 2件の応答を記録")
+    
+    # 記録は上流クライアントのキャッシュを参照・登録しない
+    cache_stats = upstream_client.response_cache.get_stats()
+    assert cache_stats['memory_entries'] == 0 and cache_stats['hits'] + cache_stats['misses'] == 0
+    print("✓ 上流キャッシュを経由せずに記録")
+    
+    with PAAPIStubServer(mode='replay', recordings_path=recordings_path) as replayer:
+        client = create_client(replayer)
+        assert client.search_items("Anker", item_count=3) == recorded
+        # ASINの順序が異なっても同じ記録に一致（商品は要求順に並ぶ）
+        replayed_items = client.get_items(list(reversed(recorded_asins)))['ItemsResult']['Items']
+        assert replayed_items == list(reversed(recorded_items['ItemsResult']['Items']))
+        assert client.search_items("Logicool", item_count=3) == {}
+        assert replayer.get_stats()['statuses'] == {200: 2, 404: 1}
+    print("✓ 記録済み応答を再生（未記録は404）")
+    
+    key = make_recording_key('getitems', {'ItemIds': 'B,A', 'PartnerTag': 'x-22'})
+    assert key == make_recording_key('getitems', {'ItemIds': 'A,B', 'PartnerTag': 'y-22'})
+    assert key == ResponseCache.make_key('getitems', {'ItemIds': 'A,B'})
+    print("✓ 照合キーはパートナータグとASIN順序に依存しない")
+    
+    print("✓ 記録・再生テスト完了\n")
+
+
+def main():
+    """メイン関数"""
+    print("PA-APIスタブサーバーテストを開始します\n")
+    
+    try:
+        test_synthetic_mode()
+        test_signature_and_rate_limit()
+        test_record_and_replay()
+        
+        print("🎉 すべてのテストが完了しました！")
+    
+    except Exception as e:
+        print(f"❌ テスト実行中にエラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()